@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+# bench_analyzers.py
+# Compares the shell/JS analyzers in lib/script_analyzers.py with the previous regex passes
+# Created: 2026-10-19
+#
+# Usage:
+#   ./bench_analyzers.py                    - Benchmark on generated 5000-function files
+#   ./bench_analyzers.py --functions 20000  - Use larger generated files
+#   ./bench_analyzers.py --file path.sh     - Benchmark a real script
+
+import os
+import sys
+import re
+import time
+import random
+import argparse
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(os.path.dirname(BENCH_DIR), "lib"))
+
+from script_analyzers import analyze_shell, analyze_javascript
+
+def legacy_shell(content):
+    """Previous _analyze_shell_script regex passes"""
+    functions = re.compile(r'(?:function\s+)?([a-zA-Z_][a-zA-Z0-9_]*)\s*\(\)').findall(content)
+    sources = re.compile(r'source\s+["\'](.*?)["\']').findall(content)
+    return functions, sources
+
+def legacy_js(content):
+    """Previous _analyze_js_script regex passes"""
+    functions = re.compile(r'function\s+([a-zA-Z_][a-zA-Z0-9_]*)').findall(content)
+    arrow_functions = re.compile(
+        r'const\s+([a-zA-Z_][a-zA-Z0-9_]*)\s*=\s*(?:\([^)]*\)|[a-zA-Z_][a-zA-Z0-9_]*)\s*=>'
+    ).findall(content)
+    imports = []
+    for match in re.compile(r'(?:import\s+.*?from\s+["\']([^"\']+)["\'])|(?:require\s*\(["\']([^"\']+)["\']\))').finditer(content):
+        module = match.group(1) or match.group(2)
+        if module:
+            imports.append(module)
+    return functions + arrow_functions, imports
+
+def generate_shell(count, rng):
+    """Generate a large shell script"""
+    parts = ["#!/usr/bin/env bash", 'source "$SCRIPT_DIR/lib/shell_common.sh"', ""]
+    for i in range(count):
+        parts.append(
+            f"# Helper {i}: processes input values\n"
+            f"helper_{i}() {{\n"
+            f"  local value=\"$1\"\n"
+            f"  local result=$(echo \"$value\" | tr '[:upper:]' '[:lower:]')\n"
+            f"  if [ -n \"$result\" ]; then\n"
+            f"    echo \"processed {i}: ${{result}} $(( value * {rng.randrange(100)} ))\"\n"
+            f"  fi\n"
+            f"}}\n"
+        )
+    return "\n".join(parts)
+
+def generate_js(count, rng):
+    """Generate a large JavaScript module"""
+    parts = ["const fs = require('fs');", "import path from 'path';", ""]
+    for i in range(count):
+        if i % 3 == 0:
+            parts.append(
+                f"// Helper {i}\n"
+                f"export function helper{i}(value, options = {{}}) {{\n"
+                f"  const result = value * {rng.randrange(100)};\n"
+                f"  return options.label ? `${{options.label}}: ${{result}}` : result;\n"
+                f"}}\n"
+            )
+        elif i % 3 == 1:
+            parts.append(
+                f"const arrow{i} = (value) => {{\n"
+                f"  const items = [value, 'item {i}'];\n"
+                f"  return items.map((item) => String(item)).join(', ');\n"
+                f"}};\n"
+            )
+        else:
+            parts.append(
+                f"class Model{i} {{\n"
+                f"  constructor(data) {{ this.data = data; }}\n"
+                f"  async load(id) {{ return fetch(`/api/{i}/${{id}}`); }}\n"
+                f"}}\n"
+            )
+    return "\n".join(parts)
+
+def best_time(func, content, repeat):
+    """Get the best wall time over repeat runs"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(content)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def report(label, content, legacy, analyzer, repeat):
+    """Print timings for one input"""
+    legacy_s = best_time(legacy, content, repeat)
+    analyzer_s = best_time(analyzer, content, repeat)
+    legacy_functions = len(legacy(content)[0])
+    functions = len(analyzer(content)['functions'])
+    print(f"{label} ({len(content) / 1024:.0f} KiB)")
+    print(f"  previous: {legacy_s * 1000:8.2f} ms  {legacy_functions:6d} functions")
+    print(f"  analyzer: {analyzer_s * 1000:8.2f} ms  {functions:6d} functions  ({legacy_s / analyzer_s:.2f}x)")
+
+def main():
+    parser = argparse.ArgumentParser(description="Script Analyzer Benchmark")
+    parser.add_argument('--functions', type=int, default=5000, help='Functions per generated file')
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per analyzer (best time is kept)')
+    parser.add_argument('--file', type=str, help='Benchmark an existing .sh or .js file instead')
+    args = parser.parse_args()
+
+    if args.file:
+        with open(args.file) as f:
+            content = f.read()
+        if args.file.endswith('.js'):
+            report(args.file, content, legacy_js, analyze_javascript, args.repeat)
+        else:
+            report(args.file, content, legacy_shell, analyze_shell, args.repeat)
+        return 0
+
+    rng = random.Random(0)
+    report("shell", generate_shell(args.functions, rng), legacy_shell, analyze_shell, args.repeat)
+    report("javascript", generate_js(args.functions, rng), legacy_js, analyze_javascript, args.repeat)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
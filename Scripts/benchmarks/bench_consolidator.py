@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+# bench_consolidator.py
+# Benchmark suite for consolidate_scripts.py using synthetic script corpora
+# Created: 2026-10-19
+#
+# Usage:
+#   ./bench_consolidator.py run                          - Benchmark default sizes
+#   ./bench_consolidator.py run --sizes 100,50000        - Benchmark given sizes
+#   ./bench_consolidator.py run --save-baseline          - Store results as baselines
+#   ./bench_consolidator.py run --compare                - Fail on regressions vs baselines
+#   ./bench_consolidator.py generate --size 5000 --out DIR - Generate a corpus only
+
+import os
+import sys
+import json
+import random
+import shutil
+import argparse
+import tempfile
+import subprocess
+from datetime import datetime
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+SCRIPTS_DIR = os.path.dirname(BENCH_DIR)
+VAULT_PATH = os.path.abspath(os.path.join(SCRIPTS_DIR, ".."))
+CONFIG_FILE = os.path.join(VAULT_PATH, "System/Configuration/script_consolidation_config.json")
+BASELINE_PATH = os.path.join(BENCH_DIR, "baselines", "consolidator.json")
+
+DEFAULT_SIZES = [100, 1000, 10000]
+DEFAULT_DUP_RATE = 0.3
+FAMILY_SIZE = 8  # Scripts drawing from the same pool of duplicated functions
+FUNCTIONS_PER_SCRIPT = 6
+
+# Phase names recorded by ScriptConsolidator and the methods they time
+PHASES = {
+    'analyze': 'analyze_scripts',
+    'identify': 'identify_duplicate_functions',
+    'similarity': 'analyze_script_content_similarity',
+    'plan': 'generate_consolidation_plan',
+}
+
+# Function templates per script type: (extension, db type, header, function template)
+SCRIPT_KINDS = [
+    ('py', 'py', "#!/usr/bin/env python3\nimport os\nimport sys\n",
+     "def {name}(value):\n    \"\"\"{name} helper\"\"\"\n    result = value * {n}\n    return result\n"),
+    ('sh', 'sh', "#!/usr/bin/env bash\nsource \"$SCRIPT_DIR/lib/shell_common.sh\"\n",
+     "{name}() {{\n  local value=\"$1\"\n  echo \"$((value * {n}))\"\n}}\n"),
+    ('js', 'js', "const fs = require('fs');\n",
+     "function {name}(value) {{\n  const result = value * {n};\n  return result;\n}}\n"),
+]
+
+def generate_corpus(root, size, dup_rate=DEFAULT_DUP_RATE, seed=0):
+    """Generate a synthetic vault with size scripts and a matching script database
+
+    Scripts are grouped into families; each function slot is drawn from the
+    family's shared pool with probability dup_rate, otherwise it is unique.
+    """
+    rng = random.Random(seed)
+    config_dir = os.path.join(root, "System/Configuration")
+    os.makedirs(config_dir, exist_ok=True)
+    os.makedirs(os.path.join(root, "Dashboards/System"), exist_ok=True)
+    if os.path.exists(CONFIG_FILE):
+        shutil.copy(CONFIG_FILE, config_dir)
+
+    rows = ["Path,Type,Description,Last Run,Last Modified,Frequency,Dependencies,Status,Priority,Notes"]
+    for i in range(size):
+        ext, db_type, header, template = SCRIPT_KINDS[i % len(SCRIPT_KINDS)]
+        family = i // FAMILY_SIZE
+        rel_dir = f"Scripts/generated/{ext}/{i // 1000:03d}"
+        rel_path = f"{rel_dir}/script_{i:05d}.{ext}"
+        os.makedirs(os.path.join(root, rel_dir), exist_ok=True)
+
+        names = set()
+        for slot in range(FUNCTIONS_PER_SCRIPT):
+            if rng.random() < dup_rate:
+                names.add(f"family{family}_{ext}_helper{rng.randrange(FUNCTIONS_PER_SCRIPT)}")
+            else:
+                names.add(f"script{i}_func{slot}")
+
+        body = [header]
+        for name in sorted(names):
+            body.append(template.format(name=name, n=rng.randrange(1, 100)))
+        with open(os.path.join(root, rel_path), 'w') as f:
+            f.write("\n".join(body))
+
+        rows.append(f"{rel_path},{db_type},Synthetic benchmark script,,,Daily,,Active,Low,Generated")
+
+    with open(os.path.join(config_dir, "script_database.csv"), 'w') as f:
+        f.write("\n".join(rows) + "\n")
+
+    return root
+
+def run_phases(report_path):
+    """Run the timed consolidator phases against VAULT_PATH (worker process)"""
+    sys.path.insert(0, SCRIPTS_DIR)
+    import consolidate_scripts
+    from instrumentation import Instrumentation
+
+    metrics = Instrumentation("bench_consolidator")
+    with consolidate_scripts.ScriptConsolidator(metrics=metrics) as consolidator:
+        consolidator.analyze_scripts()
+        consolidator.identify_duplicate_functions()
+        consolidator.analyze_script_content_similarity()
+        consolidator.generate_consolidation_plan()
+
+    report = metrics.get_report()
+    report['candidate_groups'] = len(consolidator.candidate_groups)
+    with open(report_path, 'w') as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+    return 0
+
+def bench_size(size, dup_rate, repeat, seed, keep=False):
+    """Benchmark one corpus size, keeping the best wall time per phase"""
+    root = tempfile.mkdtemp(prefix=f"bench_consolidator_{size}_")
+    try:
+        generate_corpus(root, size, dup_rate, seed)
+        env = dict(os.environ, VAULT_PATH=root)
+        report_path = os.path.join(root, "timing.json")
+        best = {}
+        counters = {}
+        for _ in range(repeat):
+            subprocess.run(
+                [sys.executable, os.path.abspath(__file__), '_worker', '--report', report_path],
+                env=env, check=True, stdout=subprocess.DEVNULL
+            )
+            with open(report_path) as f:
+                report = json.load(f)
+            for phase in PHASES:
+                wall = report['phases'].get(phase, {}).get('wall_s', 0.0)
+                best[phase] = min(best.get(phase, wall), wall)
+            counters = report['counters']
+            counters['candidate_groups'] = report['candidate_groups']
+        return {'phases': best, 'counters': counters}
+    finally:
+        if keep:
+            print(f"Corpus kept at {root}")
+        else:
+            shutil.rmtree(root, ignore_errors=True)
+
+def load_baselines(path=BASELINE_PATH):
+    """Load stored baselines"""
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+def save_baselines(results, path=BASELINE_PATH):
+    """Merge results into the stored baselines"""
+    baselines = load_baselines(path)
+    baselines.update(results)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(baselines, f, indent=2, sort_keys=True)
+    print(f"Baselines saved to {path}")
+
+def compare_to_baselines(results, baselines, tolerance, min_seconds):
+    """Get regressions where a phase is slower than its baseline beyond tolerance"""
+    regressions = []
+    for key, result in results.items():
+        if key not in baselines:
+            print(f"No baseline for {key}")
+            continue
+        for phase, wall in result['phases'].items():
+            base = baselines[key]['phases'].get(phase)
+            if base is None:
+                continue
+            if wall > base * (1 + tolerance) and wall - base > min_seconds:
+                regressions.append(f"{key} {PHASES[phase]}: {wall:.3f}s vs baseline {base:.3f}s")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Consolidator Benchmark Suite")
+    subparsers = parser.add_subparsers(dest='command')
+
+    gen_parser = subparsers.add_parser('generate', help='Generate a synthetic corpus')
+    gen_parser.add_argument('--size', type=int, default=1000, help='Number of scripts')
+    gen_parser.add_argument('--dup-rate', type=float, default=DEFAULT_DUP_RATE, help='Fraction of duplicated functions')
+    gen_parser.add_argument('--seed', type=int, default=0, help='Random seed')
+    gen_parser.add_argument('--out', required=True, help='Output vault directory')
+
+    run_parser = subparsers.add_parser('run', help='Run benchmarks')
+    run_parser.add_argument('--sizes', type=str, default=','.join(map(str, DEFAULT_SIZES)),
+                            help='Comma-separated corpus sizes (e.g. 100,1000,50000)')
+    run_parser.add_argument('--dup-rate', type=float, default=DEFAULT_DUP_RATE, help='Fraction of duplicated functions')
+    run_parser.add_argument('--seed', type=int, default=0, help='Random seed')
+    run_parser.add_argument('--repeat', type=int, default=3, help='Runs per size (best time is kept)')
+    run_parser.add_argument('--save-baseline', action='store_true', help='Store results as the new baselines')
+    run_parser.add_argument('--compare', action='store_true', help='Fail if results regress against baselines')
+    run_parser.add_argument('--tolerance', type=float, default=0.25, help='Allowed slowdown ratio before failing')
+    run_parser.add_argument('--min-seconds', type=float, default=0.05, help='Ignore slowdowns smaller than this')
+    run_parser.add_argument('--keep', action='store_true', help='Keep generated corpora')
+
+    worker_parser = subparsers.add_parser('_worker')
+    worker_parser.add_argument('--report', required=True)
+
+    args = parser.parse_args()
+
+    if args.command == '_worker':
+        return run_phases(args.report)
+
+    if args.command == 'generate':
+        generate_corpus(args.out, args.size, args.dup_rate, args.seed)
+        print(f"Generated {args.size} scripts in {args.out}")
+        return 0
+
+    if args.command != 'run':
+        parser.print_help()
+        return 1
+
+    results = {}
+    for size in [int(x.strip()) for x in args.sizes.split(',')]:
+        key = f"{size}@{args.dup_rate}"
+        print(f"Benchmarking {size} scripts (dup rate {args.dup_rate})...")
+        result = bench_size(size, args.dup_rate, args.repeat, args.seed, args.keep)
+        result['recorded_at'] = datetime.now().isoformat()
+        results[key] = result
+        for phase, wall in result['phases'].items():
+            print(f"  {PHASES[phase]:<36} {wall:8.3f}s")
+        print(f"  candidate groups: {result['counters'].get('candidate_groups', 0)}")
+
+    if args.compare:
+        regressions = compare_to_baselines(results, load_baselines(), args.tolerance, args.min_seconds)
+        if regressions:
+            print("Regressions detected:")
+            for regression in regressions:
+                print(f"  {regression}")
+            return 1
+        print("No regressions against baselines")
+
+    if args.save_baseline:
+        save_baselines(results)
+
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
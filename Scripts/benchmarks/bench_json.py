@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# bench_json.py
+# Compares the JSON backends behind load_data/save_data on multi-MB payloads
+# Created: 2026-10-19
+#
+# Usage:
+#   ./bench_json.py                 - Benchmark a generated ~10 MB payload
+#   ./bench_json.py --size-mb 50    - Use a larger payload
+#   ./bench_json.py --repeat 10     - Take the best of more runs
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import tempfile
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(os.path.dirname(BENCH_DIR), "lib"))
+
+import example_script1_script2 as shared
+from example_script1_script2 import BACKENDS, encode_json, decode_json, load_data, save_data
+
+def generate_payload(size_mb, rng):
+    """Build records shaped like test_data.json until the compact JSON is about size_mb"""
+    records = []
+    size = 0
+    while size < size_mb * 1024 * 1024:
+        record = {
+            'id': f"sample{len(records)}",
+            'name': f"Sample Data {len(records)}",
+            'date': "2026-10-19",
+            'description': "Generated record for the JSON backend benchmark",
+            'items': [{'id': i, 'name': f"Item {i}", 'value': round(rng.uniform(0, 1000), 2)}
+                      for i in range(rng.randint(3, 12))],
+        }
+        records.append(record)
+        size += len(json.dumps(record, separators=(',', ':')))
+    return records
+
+def best_of(repeat, func):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def legacy_load(path):
+    """Previous load_data: text-mode json.load"""
+    with open(path, 'r') as f:
+        return json.load(f)
+
+def legacy_save(path, data):
+    """Previous save_data: json.dump with indent=2"""
+    with open(path, 'w') as f:
+        json.dump(data, f, indent=2)
+
+def main():
+    parser = argparse.ArgumentParser(description="JSON Backend Benchmark")
+    parser.add_argument('--size-mb', type=float, default=10, help='Approximate compact payload size')
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per measurement (best is reported)')
+    args = parser.parse_args()
+
+    data = generate_payload(args.size_mb, random.Random(42))
+    compact = encode_json(data, backend='stdlib')
+    print(f"Payload: {len(data)} records, {len(compact) / 1e6:.1f} MB compact")
+    print(f"Backends: {', '.join(BACKENDS)}")
+
+    with tempfile.TemporaryDirectory(prefix="bench_json_") as temp_dir:
+        path = os.path.join(temp_dir, "data.json")
+        legacy_save(path, data)
+        print(f"\n{'previous load/save (stdlib, indent=2)':40} "
+              f"load {best_of(args.repeat, lambda: legacy_load(path)):7.3f}s  "
+              f"save {best_of(args.repeat, lambda: legacy_save(path, data)):7.3f}s  "
+              f"{os.path.getsize(path) / 1e6:6.1f} MB")
+
+        print(f"\n{'backend':10} {'encode':>9} {'pretty':>9} {'decode':>9} {'load':>9} {'load mmap':>10} {'save':>9}")
+        for name in BACKENDS:
+            shared.JSON_BACKEND = name
+            encoded = encode_json(data)
+            assert decode_json(encoded) == data
+            save_data(path, data)
+            row = [
+                best_of(args.repeat, lambda: encode_json(data)),
+                best_of(args.repeat, lambda: encode_json(data, pretty=True)),
+                best_of(args.repeat, lambda: decode_json(encoded)),
+                best_of(args.repeat, lambda: load_data(path, use_mmap=False)),
+                best_of(args.repeat, lambda: load_data(path, use_mmap=True)),
+                best_of(args.repeat, lambda: save_data(path, data)),
+            ]
+            print(f"{name:10} " + ' '.join(f"{t:8.3f}s" for t in row[:4]) + f" {row[4]:9.3f}s {row[5]:8.3f}s")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
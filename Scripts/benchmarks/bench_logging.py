@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# bench_logging.py
+# Measures VaultLogger overhead per 100k records in direct and queued modes
+# Created: 2026-10-19
+#
+# Usage:
+#   ./bench_logging.py                  - Benchmark 100k records per mode
+#   ./bench_logging.py --records 500000 - Use more records
+#   ./bench_logging.py --console        - Also emit records at console level
+
+import os
+import sys
+import time
+import logging
+import argparse
+import tempfile
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(os.path.dirname(BENCH_DIR), "lib"))
+
+import logger as vault_logger
+from logger import VaultLogger, ColoredFormatter
+
+class PerRecordColoredFormatter(ColoredFormatter):
+    """Previous ColoredFormatter behaviour: a new Formatter for every record"""
+
+    def format(self, record):
+        log_fmt = self.FORMATS.get(record.levelno)
+        formatter = logging.Formatter(log_fmt, self.datefmt, self.style)
+        return formatter.format(record)
+
+def make_logger(name, log_file, queued, per_record_formatter):
+    """Create a VaultLogger whose console output goes to /dev/null"""
+    stdout = sys.stdout
+    sys.stdout = open(os.devnull, 'w')
+    try:
+        log = VaultLogger(name, log_file=log_file, queued=queued)
+    finally:
+        sys.stdout = stdout
+
+    if per_record_formatter:
+        handlers = list(log.logger.handlers)
+        listener = vault_logger._listeners.get(name)
+        if listener is not None:
+            handlers.extend(listener.handlers)
+        for handler in handlers:
+            if isinstance(handler.formatter, ColoredFormatter):
+                handler.setFormatter(PerRecordColoredFormatter(handler.formatter._fmt))
+    return log
+
+def run_mode(label, records, log_dir, queued, per_record_formatter, console):
+    """Log records through one VaultLogger configuration and print timings"""
+    name = f"bench_{label.replace(' ', '_')}"
+    log = make_logger(name, os.path.join(log_dir, f"{name}.log"), queued, per_record_formatter)
+
+    emit = log.info if console else log.debug
+    start = time.perf_counter()
+    for i in range(records):
+        emit("Processed file %d of %d", i, records)
+    emitted = time.perf_counter() - start
+    log.flush()
+    drained = time.perf_counter() - start
+
+    scale = 100000 / records
+    print(f"{label:<24} caller {emitted * scale:6.3f}s/100k ({emitted / records * 1e6:5.2f} us/record)"
+          f"   incl. drain {drained * scale:6.3f}s/100k")
+
+def main():
+    parser = argparse.ArgumentParser(description="VaultLogger Benchmark")
+    parser.add_argument('--records', type=int, default=100000, help='Records per mode')
+    parser.add_argument('--console', action='store_true', help='Log at INFO so the console handler formats too')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="bench_logging_") as log_dir:
+        run_mode('direct per-record fmt', args.records, log_dir, False, True, args.console)
+        run_mode('direct', args.records, log_dir, False, False, args.console)
+        run_mode('queued', args.records, log_dir, True, False, args.console)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+# bench_schema_validation.py
+# Compares scalar and columnar (NumPy) batch validation of data records
+# Created: 2026-10-19
+#
+# Usage:
+#   ./bench_schema_validation.py                  - Validate 20000 generated records
+#   ./bench_schema_validation.py --records 100000 - Use a larger batch
+#   ./bench_schema_validation.py --repeat 10      - Take the best of more runs
+
+import os
+import sys
+import time
+import random
+import argparse
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.dirname(BENCH_DIR))
+sys.path.append(os.path.join(os.path.dirname(BENCH_DIR), "lib"))
+
+import schema_validation
+from example_script2 import DATA_SCHEMA
+
+def generate_records(count, rng):
+    """Build records shaped like test_data.json, a few with out-of-range values"""
+    return [{
+        'id': f"sample{index}",
+        'name': f"Sample Data {index}",
+        'date': "2026-10-19",
+        'items': [{'id': i, 'name': f"Item {i}", 'value': round(rng.uniform(-1, 1000), 2)}
+                  for i in range(rng.randint(3, 12))],
+    } for index in range(count)]
+
+def best_of(repeat, func):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description="Schema Validation Benchmark")
+    parser.add_argument('--records', type=int, default=20000, help='Records per batch')
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per measurement (best is reported)')
+    args = parser.parse_args()
+
+    records = generate_records(args.records, random.Random(42))
+    schema = schema_validation.compile_schema(DATA_SCHEMA)
+    print(f"Batch: {len(records)} records, {sum(len(r['items']) for r in records)} items")
+    print(f"Columns: {', '.join(schema.columns) or 'none'}")
+
+    scalar = schema.validate_batch(records, columnar=False)
+    print(f"\n{'scalar':10} {best_of(args.repeat, lambda: schema.validate_batch(records, columnar=False)):8.3f}s  "
+          f"{len(scalar)} violations")
+    if schema_validation.numpy is None:
+        print(f"{'columnar':10} skipped, NumPy is not installed")
+        return 0
+    columnar = schema.validate_batch(records, columnar=True)
+    assert sorted(columnar) == sorted(scalar)
+    print(f"{'columnar':10} {best_of(args.repeat, lambda: schema.validate_batch(records, columnar=True)):8.3f}s  "
+          f"{len(columnar)} violations")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+# bench_tags.py
+# Compares the Python tag audit engine with the previous per-file forking tags.sh audit
+# Created: 2026-10-19
+#
+# Usage:
+#   ./bench_tags.py                - Benchmark on a generated 500-note vault
+#   ./bench_tags.py --notes 5000   - Use a larger generated vault (legacy run is slow)
+#   ./bench_tags.py --skip-legacy  - Only time the Python engine
+
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+import subprocess
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+LIB_DIR = os.path.join(os.path.dirname(BENCH_DIR), "lib")
+sys.path.append(LIB_DIR)
+
+from tag_engine import TagEngine, PRIMARY_TAGS, SECONDARY_TAGS
+
+# Previous audit_tags/extract_tags from maintenance/tags.sh (log calls removed)
+LEGACY_AUDIT = r'''
+declare -a PRIMARY_TAGS=(
+  "interview" "research" "strategy" "compliance"
+  "active" "draft" "archived" "template" "placeholder"
+  "in-progress" "completed" "pending-review"
+)
+declare -a SECONDARY_TAGS=(
+  "player" "agent" "industry-professional"
+  "competitor" "market-analysis" "industry"
+  "football" "basketball" "baseball"
+  "advisor" "athlete" "coach"
+)
+extract_tags() {
+  local file="$1"
+  local tags=""
+  if [ ! -f "$file" ]; then
+    return 1
+  fi
+  if grep -q "^---" "$file"; then
+    local frontmatter_start=$(grep -n "^---" "$file" | head -1 | cut -d: -f1)
+    local frontmatter_end=$(grep -n "^---" "$file" | head -2 | tail -1 | cut -d: -f1)
+    if [ -n "$frontmatter_end" ] && [ "$frontmatter_start" != "$frontmatter_end" ]; then
+      local tag_line=$(sed -n "${frontmatter_start},${frontmatter_end}p" "$file" | grep "^tags:")
+      if [ -n "$tag_line" ]; then
+        tags=$(echo "$tag_line" | sed -E 's/^tags:\s*(\[|\[\"|\[\[)//g' | sed -E 's/(\]|\"\]|\]\])$//g')
+        tags=$(echo "$tags" | tr -d '[],\"' | tr -s ' ')
+      fi
+    fi
+  fi
+  echo "$tags"
+}
+echo "file_path,tag,standardized,issue_type" > "$TAG_ISSUES_FILE"
+while IFS= read -r file; do
+  raw_tags=$(extract_tags "$file")
+  if [ -z "$raw_tags" ]; then
+    echo "$file,,missing,File has no tags" >> "$TAG_ISSUES_FILE"
+  else
+    for tag in $raw_tags; do
+      standardized_tag=$(echo "$tag" | tr '[:upper:]' '[:lower:]' | tr ' ' '-' | tr '_' '-')
+      if [ "$tag" != "$standardized_tag" ]; then
+        echo "$file,$tag,$standardized_tag,formatting" >> "$TAG_ISSUES_FILE"
+      fi
+      is_standard=0
+      for std_tag in "${PRIMARY_TAGS[@]}"; do
+        if [ "$standardized_tag" = "$std_tag" ]; then is_standard=1; break; fi
+      done
+      if [ "$is_standard" -eq 0 ]; then
+        for std_tag in "${SECONDARY_TAGS[@]}"; do
+          if [ "$standardized_tag" = "$std_tag" ]; then is_standard=1; break; fi
+        done
+      fi
+      if [ "$is_standard" -eq 0 ]; then
+        echo "$file,$tag,$standardized_tag,non-standard" >> "$TAG_ISSUES_FILE"
+      fi
+    done
+  fi
+done < <(find "$VAULT_ROOT" -name "*.md" -type f -not -path "*/\.*")
+'''
+
+def generate_vault(root, notes, rng):
+    """Write notes with inline tag lists, some malformed, some untagged"""
+    known = sorted(PRIMARY_TAGS | SECONDARY_TAGS)
+    extra = ["Market_Analysis", "Draft", "misc", "todo", "Player", "quarterly_review"]
+    for i in range(notes):
+        folder = os.path.join(root, f"area_{i % 12}", f"topic_{i % 7}")
+        os.makedirs(folder, exist_ok=True)
+        tags = rng.sample(known, rng.randint(1, 4)) + rng.sample(extra, rng.randint(0, 2))
+        lines = ["---", f"title: Note {i}", "date_created: 2026-10-01"]
+        if i % 15:
+            lines.append("tags: [" + ", ".join(tags) + "]")
+        lines.append("---")
+        body = "\n".join(f"Paragraph {j} of note {i} with [[link_{j}]] text." for j in range(20))
+        with open(os.path.join(folder, f"note_{i}.md"), 'w') as f:
+            f.write("\n".join(lines) + "\n\n" + body + "\n")
+
+def count_rows(path):
+    with open(path) as f:
+        return sum(1 for _ in f) - 1
+
+def main():
+    parser = argparse.ArgumentParser(description="Tag Audit Benchmark")
+    parser.add_argument('--notes', type=int, default=500, help='Notes in the generated vault')
+    parser.add_argument('--skip-legacy', action='store_true', help='Do not run the legacy shell audit')
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    with tempfile.TemporaryDirectory(prefix="bench_tags_") as temp_dir:
+        vault = os.path.join(temp_dir, "vault")
+        generate_vault(vault, args.notes, rng)
+        print(f"Generated {args.notes} notes")
+
+        issues = os.path.join(temp_dir, "engine_issues.csv")
+        start = time.perf_counter()
+        stats = TagEngine(vault).audit(issues)
+        engine_time = time.perf_counter() - start
+        print(f"engine (in-process)  {engine_time:8.3f}s  {stats['tag_issues']} issues")
+
+        start = time.perf_counter()
+        subprocess.run([sys.executable, os.path.join(LIB_DIR, "tag_engine.py"), "audit",
+                        "--root", vault, "--issues-file", issues],
+                       check=True, stdout=subprocess.DEVNULL)
+        cli_time = time.perf_counter() - start
+        print(f"engine (tags.sh CLI) {cli_time:8.3f}s  {count_rows(issues)} issues")
+
+        if not args.skip_legacy:
+            legacy_issues = os.path.join(temp_dir, "legacy_issues.csv")
+            env = dict(os.environ, VAULT_ROOT=vault, TAG_ISSUES_FILE=legacy_issues)
+            start = time.perf_counter()
+            subprocess.run(["bash", "-c", LEGACY_AUDIT], env=env, check=True)
+            legacy_time = time.perf_counter() - start
+            print(f"legacy shell audit   {legacy_time:8.3f}s  {count_rows(legacy_issues)} issues")
+            print(f"speedup: {legacy_time / engine_time:.0f}x in-process, {legacy_time / cli_time:.0f}x via CLI")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -9,6 +9,8 @@ import re
 import json
 import shutil
 import hashlib
+import functools
+from datetime import datetime
 from pathlib import Path
 import argparse
 from typing import Dict, List, Set, Tuple, Optional
@@ -19,9 +21,13 @@ sys.path.append(str(SCRIPT_DIR / "lib"))
 
 try:
     from logger import VaultLogger
-    from config_manager import ConfigManager
+    from layered_config import ConfigSchema, Field, LayeredConfig, ConfigError, parse_overrides
     from file_utils import VaultFile, find_files
     from error_handler import ErrorHandler, safe_execution
+    from consolidation_store import get_consolidation_store, STORE_BACKENDS
+    from instrumentation import Instrumentation
+    from script_analyzers import analyze_shell, analyze_javascript
+    from job_journal import JobJournal
 except ImportError:
     print("Error: Required library modules not found. Please ensure the lib directory is properly set up.")
     sys.exit(1)
@@ -29,24 +35,125 @@ except ImportError:
 # Initialize
 logger = VaultLogger("consolidate_scripts")
 error_handler = ErrorHandler("consolidate_scripts")
-config = ConfigManager("script_consolidation_config.json", "script_consolidation")
 VAULT_PATH = os.environ.get("VAULT_PATH", os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 # Script Database
 SCRIPT_DB_PATH = os.path.join(VAULT_PATH, "System/Configuration/script_database.csv")
 
+# Job journal of the scripts each executed plan left behind
+JOB_NAME = "script_consolidation"
+
+# Entry points and helpers nearly every script defines; sharing them says nothing
+COMMON_FUNCTIONS = ('main', '__init__', 'usage', 'show_help', 'log', 'log_info', 'log_success',
+                    'log_warning', 'log_error')
+
+# Configuration layers: defaults < config file < VAULT_SCRIPT_CONSOLIDATION_* env < --set
+CONFIG_SCHEMA = ConfigSchema({
+    'vault_path': Field(str, '.'),
+    'analysis.min_similarity_threshold': Field(float, 0.0, min=0.0, max=1.0),
+    'analysis.consolidation_threshold': Field(float, 0.2, min=0.0, max=1.0),
+    'analysis.high_benefit_threshold': Field(float, 0.3, min=0.0, max=1.0),
+    'analysis.min_shared_functions': Field(int, 2, min=1),
+    'analysis.ignore_functions': Field(list, list(COMMON_FUNCTIONS), item_type=str),
+    'execution.default_dry_run': Field(bool, True),
+    'execution.backup_before_consolidation': Field(bool, True),
+    'execution.update_references': Field(bool, True),
+    'execution.test_after_consolidation': Field(bool, True),
+    'reporting.include_code_snippets': Field(bool, True),
+    'reporting.dashboard_path': Field(str, "Dashboards/System/script_consolidation_report.md"),
+    'reporting.detailed_logs': Field(bool, True),
+    'storage.backend': Field(str, 'json', choices=STORE_BACKENDS),
+    'storage.sqlite_path': Field(str),
+    'exclude_patterns': Field(list, [], item_type=str),
+    'script_types': Field(list, [], item_type=dict),
+}, name='ConsolidationSettings')
+
+def load_settings(overrides=None):
+    """Get a validated, frozen snapshot of the consolidation configuration"""
+    layers = LayeredConfig(
+        CONFIG_SCHEMA, "script_consolidation_config.json", "script_consolidation",
+        env_prefix="VAULT_SCRIPT_CONSOLIDATION", overrides=overrides
+    )
+    return layers.snapshot()
+
+def timed_phase(name):
+    """Decorator that times a ScriptConsolidator method as a named phase"""
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            with self.metrics.phase(name):
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorator
+
+class DisjointSet:
+    """Union-find over hashable items with path compression"""
+    
+    def __init__(self):
+        self.parent = {}
+        self.rank = {}
+    
+    def find(self, item):
+        """Find the representative of an item's set"""
+        parent = self.parent.setdefault(item, item)
+        if parent != item:
+            parent = self.parent[item] = self.find(parent)
+        return parent
+    
+    def union(self, item1, item2):
+        """Merge the sets containing two items"""
+        root1, root2 = self.find(item1), self.find(item2)
+        if root1 == root2:
+            return root1
+        if self.rank.get(root1, 0) < self.rank.get(root2, 0):
+            root1, root2 = root2, root1
+        self.parent[root2] = root1
+        if self.rank.get(root1, 0) == self.rank.get(root2, 0):
+            self.rank[root1] = self.rank.get(root1, 0) + 1
+        return root1
+    
+    def groups(self):
+        """Get the members of each set, keyed by representative"""
+        members = {}
+        for item in sorted(self.parent):
+            members.setdefault(self.find(item), []).append(item)
+        return members
+
 class ScriptConsolidator:
     """Identifies and consolidates duplicate script functionality"""
     
-    def __init__(self, vault_path: str = VAULT_PATH):
+    def __init__(self, vault_path: str = VAULT_PATH, store_backend: Optional[str] = None,
+                 metrics: Optional[Instrumentation] = None, settings=None):
         self.vault_path = vault_path
+        self.settings = settings or load_settings()
+        self.metrics = metrics or Instrumentation("consolidate_scripts")
         self.scripts = {}  # Dict to store script info
         self.duplicates = {}  # Dict to store identified duplicates
         self.function_map = {}  # Map of functions across scripts
         self.candidate_groups = []  # Groups of scripts that may be consolidated
         self.consolidated_scripts = {}  # Track consolidated scripts
+        self.store = self._open_store(store_backend)
         self.load_script_database()
     
+    def _open_store(self, backend=None):
+        """Open the plan/results store configured for this run"""
+        backend = backend or self.settings.storage.backend
+        db_path = self.settings.storage.sqlite_path
+        if db_path and not os.path.isabs(db_path):
+            db_path = os.path.join(self.vault_path, db_path)
+        return get_consolidation_store(backend, db_path)
+    
+    def close(self):
+        """Close the plan/results store"""
+        self.store.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+    
     def load_script_database(self):
         """Load script database from CSV"""
         try:
@@ -66,6 +173,7 @@ class ScriptConsolidator:
         except Exception as e:
             error_handler.handle_error(f"Error loading script database: {str(e)}")
             
+    @timed_phase('analyze')
     def analyze_scripts(self):
         """Analyze scripts to identify function definitions and imports"""
         logger.info("Analyzing scripts for functions and imports...")
@@ -77,6 +185,8 @@ class ScriptConsolidator:
             try:
                 script_file = VaultFile(script_path)
                 content = script_file.read()
+                self.metrics.count('files_read')
+                self.metrics.count('bytes_read', len(content or ''))
                 
                 if 'py' in script_type:
                     self._analyze_python_script(script_path, content)
@@ -105,6 +215,8 @@ class ScriptConsolidator:
             if module:
                 imports.append(module)
         
+        self.metrics.count('regex_matches', len(functions) + len(classes) + len(imports))
+        
         # Store info
         self.scripts[script_path]['functions'] = functions
         self.scripts[script_path]['classes'] = classes
@@ -118,17 +230,21 @@ class ScriptConsolidator:
     
     def _analyze_shell_script(self, script_path: str, content: str):
         """Analyze Shell script for functions and imports"""
-        # Extract function definitions
-        function_pattern = re.compile(r'(?:function\s+)?([a-zA-Z_][a-zA-Z0-9_]*)\s*\(\)')
-        functions = function_pattern.findall(content)
-        
-        # Extract source/imports
-        source_pattern = re.compile(r'source\s+["\'](.*?)["\']')
-        sources = source_pattern.findall(content)
+        self._store_analysis(script_path, analyze_shell(content))
+    
+    def _analyze_js_script(self, script_path: str, content: str):
+        """Analyze JavaScript script for functions and imports"""
+        self._store_analysis(script_path, analyze_javascript(content))
+    
+    def _store_analysis(self, script_path: str, analysis: Dict):
+        """Store analyzer results and update the function map"""
+        functions = analysis['functions']
+        self.metrics.count('definitions_found', len(functions) + len(analysis['imports']))
         
         # Store info
         self.scripts[script_path]['functions'] = functions
-        self.scripts[script_path]['imports'] = sources
+        self.scripts[script_path]['imports'] = analysis['imports']
+        self.scripts[script_path]['fingerprints'] = analysis['fingerprints']
         
         # Update function map
         for func in functions:
@@ -136,104 +252,95 @@ class ScriptConsolidator:
                 self.function_map[func] = []
             self.function_map[func].append(script_path)
     
-    def _analyze_js_script(self, script_path: str, content: str):
-        """Analyze JavaScript script for functions and imports"""
-        # Extract function definitions
-        function_pattern = re.compile(r'function\s+([a-zA-Z_][a-zA-Z0-9_]*)')
-        functions = function_pattern.findall(content)
+    @timed_phase('identify')
+    def identify_duplicate_functions(self):
+        """Identify clusters of scripts that share functions
         
-        # Extract arrow functions with names
-        arrow_pattern = re.compile(r'const\s+([a-zA-Z_][a-zA-Z0-9_]*)\s*=\s*(?:\([^)]*\)|[a-zA-Z_][a-zA-Z0-9_]*)\s*=>')
-        arrow_functions = arrow_pattern.findall(content)
+        Builds a script graph with one weighted edge (Jaccard similarity of
+        function sets) per pair of scripts sharing a function, then merges
+        scripts joined by edges above the configured thresholds. Functions
+        in analysis.ignore_functions (main, usage, ...) do not create edges,
+        so they cannot chain unrelated scripts into one cluster.
+        """
+        logger.info("Identifying duplicate functions across scripts...")
         
-        # Extract imports
-        import_pattern = re.compile(r'(?:import\s+.*?from\s+["\']([^"\']+)["\'])|(?:require\s*\(["\']([^"\']+)["\']\))')
-        imports = []
-        for match in import_pattern.finditer(content):
-            module = match.group(1) or match.group(2)
-            if module:
-                imports.append(module)
+        min_similarity = self.settings.analysis.min_similarity_threshold
+        min_shared = self.settings.analysis.min_shared_functions
+        ignored = set(self.settings.analysis.ignore_functions)
         
-        # Store info
-        self.scripts[script_path]['functions'] = functions + arrow_functions
-        self.scripts[script_path]['imports'] = imports
+        script_functions = {
+            script: set(data.get('functions', []))
+            for script, data in self.scripts.items()
+        }
         
-        # Update function map
-        for func in functions + arrow_functions:
-            if func not in self.function_map:
-                self.function_map[func] = []
-            self.function_map[func].append(script_path)
-    
-    def identify_duplicate_functions(self):
-        """Identify functions that appear in multiple scripts"""
-        logger.info("Identifying duplicate functions across scripts...")
+        # Collect the functions shared by each pair of scripts
+        shared_by_pair = {}
+        for func, scripts in self.function_map.items():
+            if func in ignored:
+                continue
+            members = sorted(set(scripts))
+            for i, script1 in enumerate(members):
+                for script2 in members[i+1:]:
+                    shared_by_pair.setdefault((script1, script2), []).append(func)
         
-        duplicated_functions = {func: scripts for func, scripts in self.function_map.items() if len(scripts) > 1}
-        
-        # Group scripts by shared functions
-        script_groups = {}
-        for func, scripts in duplicated_functions.items():
-            scripts_tuple = tuple(sorted(scripts))
-            if scripts_tuple not in script_groups:
-                script_groups[scripts_tuple] = []
-            script_groups[scripts_tuple].append(func)
-        
-        # Convert to list of candidate groups for consolidation
-        for scripts, functions in script_groups.items():
-            if len(functions) >= 2:  # If they share at least 2 functions
-                self.candidate_groups.append({
-                    'scripts': list(scripts),
-                    'shared_functions': functions,
-                    'script_types': self._get_script_types(scripts),
-                    'similarity': self._calculate_similarity(scripts)
-                })
+        # Weight edges and merge strongly connected scripts
+        clusters = DisjointSet()
+        edge_weights = {}
+        for (script1, script2), functions in shared_by_pair.items():
+            intersection = len(functions)
+            union = len(script_functions[script1]) + len(script_functions[script2]) - intersection
+            weight = intersection / union if union > 0 else 0
+            edge_weights[(script1, script2)] = weight
+            self.metrics.count('pairs_compared')
+            
+            if intersection >= min_shared and weight >= min_similarity:
+                clusters.union(script1, script2)
+        
+        # Aggregate edge weights and shared functions per cluster
+        cluster_stats = {}
+        for (script1, script2), weight in edge_weights.items():
+            root = clusters.find(script1)
+            if root != clusters.find(script2):
+                continue
+            stats = cluster_stats.setdefault(root, {'total': 0.0, 'functions': set()})
+            stats['total'] += weight
+            stats['functions'].update(shared_by_pair[(script1, script2)])
+        
+        groups = []
+        for root, scripts in clusters.groups().items():
+            if len(scripts) < 2:
+                continue
+            
+            # Average Jaccard similarity over all pairs (pairs without an edge score 0)
+            pair_count = len(scripts) * (len(scripts) - 1) // 2
+            stats = cluster_stats[root]
+            groups.append({
+                'group_key': self._group_key(scripts),
+                'scripts': scripts,
+                'shared_functions': sorted(stats['functions']),
+                'script_types': self._get_script_types(scripts),
+                'similarity': stats['total'] / pair_count
+            })
         
-        # Sort by similarity score (descending)
-        self.candidate_groups.sort(key=lambda x: x['similarity'], reverse=True)
+        # Sort by similarity score (descending), ties broken by membership for stable IDs
+        groups.sort(key=lambda x: x['scripts'])
+        groups.sort(key=lambda x: x['similarity'], reverse=True)
+        self.candidate_groups.extend(groups)
         
         logger.info(f"Identified {len(self.candidate_groups)} candidate groups for consolidation")
         return self.candidate_groups
     
+    @staticmethod
+    def _group_key(scripts):
+        """Get a stable identifier for a group of scripts"""
+        digest = hashlib.sha1('\n'.join(sorted(scripts)).encode('utf-8'))
+        return digest.hexdigest()[:12]
+    
     def _get_script_types(self, scripts):
         """Get script types for a list of scripts"""
         return {script: self.scripts[script].get('Type', '') for script in scripts}
     
-    def _calculate_similarity(self, scripts):
-        """Calculate similarity score between scripts"""
-        if len(scripts) < 2:
-            return 0
-        
-        # Get all functions from all scripts
-        all_functions = set()
-        script_functions = {}
-        
-        for script in scripts:
-            functions = set(self.scripts[script].get('functions', []))
-            script_functions[script] = functions
-            all_functions.update(functions)
-        
-        # Calculate Jaccard similarity for each pair
-        total_similarity = 0
-        pair_count = 0
-        
-        for i, script1 in enumerate(scripts):
-            for script2 in scripts[i+1:]:
-                fns1 = script_functions[script1]
-                fns2 = script_functions[script2]
-                
-                if not fns1 or not fns2:
-                    continue
-                
-                intersection = len(fns1.intersection(fns2))
-                union = len(fns1.union(fns2))
-                
-                if union > 0:
-                    similarity = intersection / union
-                    total_similarity += similarity
-                    pair_count += 1
-        
-        return total_similarity / pair_count if pair_count > 0 else 0
-    
+    @timed_phase('similarity')
     def analyze_script_content_similarity(self):
         """Analyze content similarity between scripts"""
         logger.info("Analyzing content similarity between candidate scripts...")
@@ -247,6 +354,8 @@ class ScriptConsolidator:
                     script_file = VaultFile(script)
                     content = script_file.read()
                     script_content[script] = content
+                    self.metrics.count('files_read')
+                    self.metrics.count('bytes_read', len(content or ''))
                 except Exception as e:
                     logger.warning(f"Could not read {script}: {str(e)}")
             
@@ -260,6 +369,7 @@ class ScriptConsolidator:
                             script_content[script2]
                         )
                         content_similarities[f"{script1}|{script2}"] = similarity
+                        self.metrics.count('pairs_compared')
             
             # Add to group data
             group['content_similarities'] = content_similarities
@@ -290,14 +400,23 @@ class ScriptConsolidator:
         
         return intersection / union if union > 0 else 0
     
+    @timed_phase('plan')
     def generate_consolidation_plan(self):
         """Generate a consolidation plan for script groups"""
         logger.info("Generating consolidation plan...")
         
         plans = []
-        for i, group in enumerate(self.candidate_groups):
+        used_ids = set()
+        for group in self.candidate_groups:
             if group['combined_score'] < 0.3:  # Skip if similarity is too low
                 continue
+            
+            # IDs come from the group's scripts, not its rank, so --group-ids
+            # and stored results keep naming the same group across re-plans
+            group_id = group['group_key'][:8]
+            if group_id in used_ids:
+                group_id = group['group_key']
+            used_ids.add(group_id)
                 
             # Identify primary script type
             script_types = list(group['script_types'].values())
@@ -305,7 +424,8 @@ class ScriptConsolidator:
             
             # Create plan
             plan = {
-                'group_id': i,
+                'group_id': group_id,
+                'group_key': group['group_key'],
                 'scripts': group['scripts'],
                 'shared_functions': group['shared_functions'],
                 'primary_type': primary_type,
@@ -317,9 +437,7 @@ class ScriptConsolidator:
             plans.append(plan)
         
         # Save consolidation plan
-        plan_path = os.path.join(VAULT_PATH, "System/Configuration/script_consolidation_plan.json")
-        with open(plan_path, 'w') as f:
-            json.dump(plans, f, indent=2)
+        self.store.save_plans(plans)
         
         logger.info(f"Generated consolidation plan with {len(plans)} groups")
         return plans
@@ -365,25 +483,31 @@ class ScriptConsolidator:
         
         return suggested_name
     
-    def execute_consolidation(self, plan_ids=None, dry_run=True):
-        """Execute the consolidation plan"""
+    @timed_phase('execute')
+    def execute_consolidation(self, plan_ids=None, dry_run=True, journal=None):
+        """Execute the consolidation plan
+        
+        With a job_journal.JobJournal, a group whose scripts are all unchanged
+        since an earlier run consolidated them is skipped, and the scripts of
+        each group consolidated now are recorded. Dry runs ignore it.
+        """
         logger.info(f"Executing consolidation plan (dry_run={dry_run})...")
         
-        # Load consolidation plan
-        plan_path = os.path.join(VAULT_PATH, "System/Configuration/script_consolidation_plan.json")
+        # Load consolidation plan (only the requested groups if IDs are provided)
         try:
-            with open(plan_path, 'r') as f:
-                plans = json.load(f)
+            plans = self.store.load_plans(plan_ids or None)
         except Exception as e:
             error_handler.handle_error(f"Error loading consolidation plan: {str(e)}")
             return False
         
-        # Filter plans if specific IDs are provided
-        if plan_ids:
-            plans = [p for p in plans if p['group_id'] in plan_ids]
+        if dry_run:
+            journal = None
         
         results = []
         for plan in plans:
+            if journal is not None and all(journal.is_current(script) for script in plan['scripts']):
+                logger.info(f"Skipping group {plan['group_id']}: scripts unchanged since they were consolidated")
+                continue
             try:
                 if plan['action'] == 'consolidate':
                     result = self._consolidate_scripts(plan, dry_run)
@@ -397,6 +521,12 @@ class ScriptConsolidator:
                     'consolidated_path': result.get('consolidated_path', ''),
                     'modified_scripts': result.get('modified_scripts', [])
                 })
+                if journal is not None:
+                    for script in plan['scripts']:
+                        if result['success']:
+                            journal.mark_done(script)
+                        else:
+                            journal.forget(script)
             except Exception as e:
                 error_msg = f"Error consolidating group {plan['group_id']}: {str(e)}"
                 logger.error(error_msg)
@@ -407,9 +537,7 @@ class ScriptConsolidator:
                 })
         
         # Save results
-        results_path = os.path.join(VAULT_PATH, "System/Configuration/script_consolidation_results.json")
-        with open(results_path, 'w') as f:
-            json.dump(results, f, indent=2)
+        self.store.append_results(results)
         
         return results
     
@@ -678,9 +806,9 @@ class ScriptConsolidator:
                         
                         # Find appropriate script_type configuration
                         script_type_config = None
-                        for config in self.config.get('script_types', []):
-                            if config.get('extension') == script_type:
-                                script_type_config = config
+                        for type_config in self.settings.script_types:
+                            if type_config.get('extension') == script_type:
+                                script_type_config = type_config
                                 break
                         
                         # Set default import pattern if no config found
@@ -745,22 +873,15 @@ class ScriptConsolidator:
                 'message': error_msg
             }
     
-    def generate_report(self):
+    @timed_phase('report')
+    def generate_report(self, plan_ids=None):
         """Generate a report of the consolidation process"""
         logger.info("Generating consolidation report...")
         
-        # Load plan and results
-        plan_path = os.path.join(VAULT_PATH, "System/Configuration/script_consolidation_plan.json")
-        results_path = os.path.join(VAULT_PATH, "System/Configuration/script_consolidation_results.json")
-        
+        # Load plan and results (only the requested groups if IDs are provided)
         try:
-            with open(plan_path, 'r') as f:
-                plans = json.load(f)
-            
-            results = []
-            if os.path.exists(results_path):
-                with open(results_path, 'r') as f:
-                    results = json.load(f)
+            plans = self.store.load_plans(plan_ids or None)
+            results = self.store.load_results(plan_ids or None)
         except Exception as e:
             error_handler.handle_error(f"Error loading plan or results: {str(e)}")
             return False
@@ -786,9 +907,10 @@ class ScriptConsolidator:
         ]
         
         # Add details for each group
+        results_by_group = {r['group_id']: r for r in results}
         for plan in plans:
             group_id = plan['group_id']
-            result = next((r for r in results if r['group_id'] == group_id), None)
+            result = results_by_group.get(group_id)
             
             report.append(f"### Group {group_id}: {plan['consolidated_name']}")
             report.append("")
@@ -813,7 +935,7 @@ class ScriptConsolidator:
             report.append("")
         
         # Write report
-        report_path = os.path.join(VAULT_PATH, "Dashboards/System/script_consolidation_report.md")
+        report_path = os.path.join(VAULT_PATH, self.settings.reporting.dashboard_path)
         with open(report_path, 'w') as f:
             f.write("\n".join(report))
         
@@ -827,48 +949,73 @@ def main():
     parser.add_argument('--plan', action='store_true', help='Generate consolidation plan')
     parser.add_argument('--execute', action='store_true', help='Execute consolidation plan')
     parser.add_argument('--report', action='store_true', help='Generate consolidation report')
-    parser.add_argument('--group-ids', type=str, help='Comma-separated list of group IDs to consolidate')
+    parser.add_argument('--group-ids', type=str, help='Comma-separated list of group IDs (as in the plan and report) to consolidate')
     parser.add_argument('--dry-run', action='store_true', help='Perform a dry run without making changes')
+    parser.add_argument('--no-cache', action='store_true', help='Re-execute groups whose scripts are unchanged since they were consolidated')
     parser.add_argument('--all', action='store_true', help='Run all steps')
+    parser.add_argument('--store', choices=STORE_BACKENDS, help='Plan/results storage backend (default: from config)')
+    parser.add_argument('--profile', action='store_true', help='Capture cProfile/tracemalloc data and write a timing report')
+    parser.add_argument('--timing-report', type=str, help='Write per-phase timing report (JSON) to this path')
+    parser.add_argument('--set', action='append', metavar='KEY=VALUE', default=[],
+                        help='Override a configuration value (e.g. analysis.min_shared_functions=2)')
     args = parser.parse_args()
     
+    try:
+        settings = load_settings(parse_overrides(args.set))
+    except ConfigError as e:
+        error_handler.handle_error(f"Invalid configuration: {str(e)}", 'E002')
+        return 1
+    
     # Set defaults if no options specified
     if not any([args.analyze, args.plan, args.execute, args.report, args.all]):
         args.analyze = True
     
-    consolidator = ScriptConsolidator()
-    
-    # Process group IDs
-    group_ids = None
-    if args.group_ids:
-        group_ids = [int(x.strip()) for x in args.group_ids.split(',')]
-    
-    # Analysis phase
-    if args.analyze or args.all:
-        logger.info("Starting script analysis...")
-        consolidator.analyze_scripts()
-        consolidator.identify_duplicate_functions()
-        consolidator.analyze_script_content_similarity()
-        logger.info("Analysis completed")
+    metrics = Instrumentation("consolidate_scripts")
+    if args.profile:
+        metrics.start_profiling()
     
-    # Planning phase
-    if args.plan or args.all:
-        logger.info("Generating consolidation plan...")
-        plan = consolidator.generate_consolidation_plan()
-        logger.info(f"Generated plan with {len(plan)} consolidation groups")
-    
-    # Execution phase
-    if args.execute or args.all:
-        logger.info(f"Executing consolidation plan (dry_run={args.dry_run})...")
-        results = consolidator.execute_consolidation(group_ids, args.dry_run)
-        success_count = len([r for r in results if r['success']])
-        logger.info(f"Executed {len(results)} consolidations with {success_count} successes")
-    
-    # Reporting phase
-    if args.report or args.all:
-        logger.info("Generating consolidation report...")
-        report_path = consolidator.generate_report()
-        logger.info(f"Generated report at {report_path}")
+    with ScriptConsolidator(store_backend=args.store, metrics=metrics, settings=settings) as consolidator:
+        # Process group IDs
+        group_ids = None
+        if args.group_ids:
+            group_ids = [x.strip() for x in args.group_ids.split(',') if x.strip()]
+        
+        # Analysis phase
+        if args.analyze or args.all:
+            logger.info("Starting script analysis...")
+            consolidator.analyze_scripts()
+            consolidator.identify_duplicate_functions()
+            consolidator.analyze_script_content_similarity()
+            logger.info("Analysis completed")
+        
+        # Planning phase
+        if args.plan or args.all:
+            logger.info("Generating consolidation plan...")
+            plan = consolidator.generate_consolidation_plan()
+            logger.info(f"Generated plan with {len(plan)} consolidation groups")
+        
+        # Execution phase
+        if args.execute or args.all:
+            logger.info(f"Executing consolidation plan (dry_run={args.dry_run})...")
+            journal = None if args.no_cache or args.dry_run else JobJournal(JOB_NAME)
+            try:
+                results = consolidator.execute_consolidation(group_ids, args.dry_run, journal)
+            finally:
+                if journal is not None:
+                    journal.close()
+            success_count = len([r for r in results if r['success']])
+            logger.info(f"Executed {len(results)} consolidations with {success_count} successes")
+        
+        # Reporting phase
+        if args.report or args.all:
+            logger.info("Generating consolidation report...")
+            report_path = consolidator.generate_report(group_ids)
+            logger.info(f"Generated report at {report_path}")
+        
+        # Timing report
+        if args.profile or args.timing_report:
+            logger.debug(metrics.summary())
+            metrics.write_report(args.timing_report)
     
     logger.info("Script consolidation process completed")
     return 0
@@ -127,7 +127,7 @@ def main():
     # Process group IDs
     group_ids = None
     if args.group_ids:
-        group_ids = [int(x.strip()) for x in args.group_ids.split(',')]
+        group_ids = [x.strip() for x in args.group_ids.split(',') if x.strip()]
     
     # Analysis phase
     if args.analyze or args.all:
@@ -5,7 +5,7 @@
 import os
 import sys
 import json
-import sys
+import argparse
 from datetime import datetime
 
 # Add lib directory to path
@@ -14,7 +14,7 @@ LIB_DIR = os.path.join(SCRIPT_DIR, "lib")
 sys.path.append(LIB_DIR)
 
 # Import from shared library
-from example_script1_script2 import load_data, save_data, get_timestamp
+from example_script1_script2 import load_data, save_data, get_timestamp, expand_inputs, overwritten_inputs, run_batch, add_batch_arguments
 
 def process_file(input_file, output_file):
     """Process a data file"""
@@ -30,9 +30,49 @@ def process_file(input_file, output_file):
     # Save processed data
     return save_data(output_file, data)
 
+def batch_main(argv):
+    """Process many files in one invocation"""
+    parser = argparse.ArgumentParser(prog="example_script1.py --batch", description="Process data files in batch")
+    add_batch_arguments(parser)
+    parser.add_argument('--output-dir', help='Directory for processed files (default: <input>.processed.json)')
+    args = parser.parse_args(argv)
+    
+    try:
+        files = expand_inputs(args.inputs, args.manifest, exclude_paths=[args.summary])
+    except ValueError as e:
+        parser.error(str(e))
+    if not files:
+        print("No input files")
+        return 1
+    
+    if args.output_dir:
+        os.makedirs(args.output_dir, exist_ok=True)
+        outputs = [os.path.join(args.output_dir, os.path.basename(path)) for path in files]
+        if len(set(outputs)) < len(outputs):
+            print("Input files share names; they would overwrite each other in --output-dir")
+            return 1
+    else:
+        outputs = [f"{path}.processed.json" for path in files]
+    
+    overwritten = overwritten_inputs(files, outputs + [args.summary])
+    if overwritten:
+        for path in overwritten:
+            print(f"Output would overwrite an input file: {path}")
+        return 1
+    
+    summary = run_batch(process_file, list(zip(files, outputs)), args.workers, args.processes, args.summary)
+    print(f"Processed {summary['succeeded']} of {summary['files']} files in {summary['duration_s']}s")
+    for path in summary['failed_files']:
+        print(f"Failed: {path}")
+    return 0 if summary['failed'] == 0 else 1
+
 def main():
+    if len(sys.argv) > 1 and sys.argv[1] == '--batch':
+        return batch_main(sys.argv[2:])
+    
     if len(sys.argv) < 3:
         print("Usage: example_script1.py input_file output_file")
+        print("       example_script1.py --batch [--output-dir DIR] [--manifest FILE] [files or globs | -]")
         return 1
         
     input_file = sys.argv[1]
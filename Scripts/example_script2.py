@@ -5,6 +5,7 @@
 import os
 import sys
 import json
+import argparse
 from datetime import datetime
 
 # Add lib directory to path
@@ -13,16 +14,44 @@ LIB_DIR = os.path.join(SCRIPT_DIR, "lib")
 sys.path.append(LIB_DIR)
 
 # Import from shared library
-from example_script1_script2 import load_data, save_data, get_timestamp
+from example_script1_script2 import load_data, save_data, get_timestamp, expand_inputs, overwritten_inputs, run_batch, add_batch_arguments
+from schema_validation import compile_schema, format_path
 
-def validate_data(data):
-    """Validate data structure"""
-    required_fields = ['id', 'name', 'date']
-    for field in required_fields:
-        if field not in data:
-            print(f"Missing required field: {field}")
-            return False
-    return True
+# Expected structure of a data file
+DATA_SCHEMA = {
+    'type': 'object',
+    'required': ['id', 'name', 'date'],
+    'properties': {
+        'id': {'type': ['string', 'integer']},
+        'name': {'type': 'string'},
+        'date': {'type': 'string', 'pattern': r'^\d{4}-\d{2}-\d{2}'},
+        'description': {'type': 'string'},
+        'items': {
+            'type': 'array',
+            'items': {
+                'type': 'object',
+                'required': ['id', 'value'],
+                'properties': {
+                    'id': {'type': 'integer'},
+                    'name': {'type': 'string'},
+                    'value': {'type': 'number', 'minimum': 0},
+                },
+            },
+        },
+    },
+}
+
+_VALIDATOR = compile_schema(DATA_SCHEMA)
+
+def validate_data(data, validator=_VALIDATOR):
+    """Validate a record, or a list of records in one batch, printing and returning every violation"""
+    if isinstance(data, list):
+        violations = validator.validate_batch(data)
+    else:
+        violations = validator.validate(data)
+    for path, message in violations:
+        print(f"{format_path(path)}: {message}" if path else message)
+    return violations
 
 def analyze_file(input_file):
     """Analyze a data file"""
@@ -32,24 +61,62 @@ def analyze_file(input_file):
         return False
         
     # Validate data
-    if not validate_data(data):
-        return False
+    violations = validate_data(data)
     
     # Analyze data
-    analysis = {
-        'id': data['id'],
-        'analyzed_at': get_timestamp(),
-        'fields_count': len(data.keys()),
-        'status': 'analyzed'
-    }
+    if isinstance(data, list):
+        analysis = {
+            'id': None,
+            'analyzed_at': get_timestamp(),
+            'records_count': len(data),
+            'fields_count': len({field for record in data if isinstance(record, dict) for field in record}),
+        }
+    else:
+        analysis = {
+            'id': data.get('id') if isinstance(data, dict) else None,
+            'analyzed_at': get_timestamp(),
+            'fields_count': len(data) if isinstance(data, dict) else 0,
+        }
+    analysis['violations_count'] = len(violations)
+    analysis['status'] = 'invalid' if violations else 'analyzed'
     
     # Save analysis
     analysis_file = f"{input_file}.analysis.json"
-    return save_data(analysis_file, analysis)
+    return save_data(analysis_file, analysis) and not violations
+
+def batch_main(argv):
+    """Analyze many files in one invocation"""
+    parser = argparse.ArgumentParser(prog="example_script2.py --batch", description="Analyze data files in batch")
+    add_batch_arguments(parser)
+    args = parser.parse_args(argv)
+    
+    try:
+        files = expand_inputs(args.inputs, args.manifest, exclude_paths=[args.summary])
+    except ValueError as e:
+        parser.error(str(e))
+    if not files:
+        print("No input files")
+        return 1
+    
+    overwritten = overwritten_inputs(files, [f"{path}.analysis.json" for path in files] + [args.summary])
+    if overwritten:
+        for path in overwritten:
+            print(f"Output would overwrite an input file: {path}")
+        return 1
+    
+    summary = run_batch(analyze_file, [(path,) for path in files], args.workers, args.processes, args.summary)
+    print(f"Analyzed {summary['succeeded']} of {summary['files']} files in {summary['duration_s']}s")
+    for path in summary['failed_files']:
+        print(f"Failed: {path}")
+    return 0 if summary['failed'] == 0 else 1
 
 def main():
+    if len(sys.argv) > 1 and sys.argv[1] == '--batch':
+        return batch_main(sys.argv[2:])
+    
     if len(sys.argv) < 2:
         print("Usage: example_script2.py input_file")
+        print("       example_script2.py --batch [--manifest FILE] [files or globs | -]")
         return 1
         
     input_file = sys.argv[1]
@@ -4,8 +4,10 @@
 
 import os
 import sys
+import re
 import json
 import csv
+from itertools import chain, islice
 from datetime import datetime
 
 # Add lib directory to path
@@ -14,7 +16,119 @@ LIB_DIR = os.path.join(SCRIPT_DIR, "lib")
 sys.path.append(LIB_DIR)
 
 # Import from shared library
-from example_script1_script2 import load_data, get_timestamp
+from example_script1_script2 import get_timestamp
+
+# Records read to find the CSV columns, unless the whole file is scanned first
+SAMPLE_SIZE = 1000
+
+# Input read size; grows while a single record does not fit
+READ_SIZE = 1 << 16
+
+# A record that still does not parse once this much input is buffered is malformed
+MAX_RECORD_SIZE = 1 << 26
+
+_WHITESPACE = ' \t\n\r'
+_SKIP_WHITESPACE = re.compile(r'[ \t\n\r]*')
+
+def iter_json_values(file_path, read_size=READ_SIZE, max_record_size=MAX_RECORD_SIZE):
+    """Yield records from a JSON file without loading it whole
+
+    A top-level array yields its elements one by one; any other document
+    (a single object, or JSON lines / concatenated values) yields each
+    top-level value. Malformed input (missing or extra commas, an
+    unterminated array, data after the array, or a record that does not
+    parse within max_record_size characters) raises json.JSONDecodeError.
+    """
+    decoder = json.JSONDecoder()
+    with open(file_path, 'r', encoding='utf-8') as f:
+        buffer = ''
+        pos = 0
+        eof = False
+        # None until the first value starts, then 'values' (no array) or, in
+        # the array, 'first' (value or ]), 'value', 'separator' (, or ]) and 'closed'
+        state = None
+
+        def fill():
+            # Drop consumed input and read more; returns False at end of file
+            nonlocal buffer, pos, eof, read_size
+            chunk = f.read(read_size)
+            if not chunk:
+                eof = True
+                return False
+            buffer = buffer[pos:] + chunk
+            pos = 0
+            read_size = min(read_size * 2, 1 << 24) if len(buffer) > read_size else read_size
+            return True
+
+        while True:
+            pos = _SKIP_WHITESPACE.match(buffer, pos).end()
+            if pos == len(buffer):
+                if eof or not fill():
+                    break
+                continue
+
+            char = buffer[pos]
+            if state is None:
+                if char == '[':
+                    state = 'first'
+                    pos += 1
+                    continue
+                state = 'values'
+            elif state == 'separator':
+                if char not in ',]':
+                    raise json.JSONDecodeError("Expecting ',' delimiter", buffer, pos)
+                state = 'value' if char == ',' else 'closed'
+                pos += 1
+                continue
+            elif state == 'closed':
+                raise json.JSONDecodeError("Extra data after the top-level array", buffer, pos)
+            elif char == ']' and state == 'first':
+                state = 'closed'
+                pos += 1
+                continue
+            elif char in ',]' and state != 'values':
+                raise json.JSONDecodeError("Expecting value", buffer, pos)
+
+            try:
+                value, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                # Most likely a record cut off at the end of the buffer
+                if eof or len(buffer) - pos > max_record_size or not fill():
+                    raise
+                continue
+            if end == len(buffer) and not eof:
+                # A number may continue in the next chunk
+                if fill():
+                    continue
+            pos = end
+            if state != 'values':
+                state = 'separator'
+            yield value
+
+        if state in ('first', 'value', 'separator'):
+            raise json.JSONDecodeError("Unterminated array", buffer, pos)
+
+def read_fieldnames(records):
+    """Get CSV columns: record keys in order of first appearance"""
+    fieldnames = {}
+    for record in records:
+        fieldnames.update(dict.fromkeys(record))
+    return list(fieldnames)
+
+def write_csv(file_path, records, fieldnames):
+    """Stream records to a CSV file through a buffered writer; returns (rows, rows with dropped keys)"""
+    rows = 0
+    dropped = 0
+    columns = set(fieldnames)
+    with open(file_path, 'w', newline='', buffering=1 << 20) as f:
+        writer = csv.writer(f)
+        writer.writerow(fieldnames)
+        for record in records:
+            if not columns.issuperset(record):
+                dropped += 1
+            writer.writerow([record.get(name, '') for name in fieldnames])
+            rows += 1
+    return rows, dropped
 
 def export_to_csv(file_path, data):
     """Export data to a CSV file"""
@@ -23,13 +137,7 @@ def export_to_csv(file_path, data):
             print("Data must be a non-empty list")
             return False
             
-        # Get field names from first item
-        fieldnames = data[0].keys()
-        
-        with open(file_path, 'w', newline='') as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
-            writer.writerows(data)
+        write_csv(file_path, data, read_fieldnames(data))
         return True
     except Exception as e:
         print(f"Error exporting to CSV: {str(e)}")
@@ -50,38 +158,90 @@ def get_file_stats(file_path):
         print(f"Error getting file stats: {str(e)}")
         return None
 
-def convert_json_to_csv(input_file, output_file):
-    """Convert JSON file to CSV"""
-    # Load data
-    data = load_data(input_file)
-    if data is None:
-        return False
-        
+def _records(file_path, exported_at):
+    """Yield the file's records as dicts with the run's export timestamp"""
+    values = iter_json_values(file_path)
+    head = list(islice(values, 2))
+    if len(head) == 1 and isinstance(head[0], dict) and _is_single_object(file_path):
+        print("Warning: Expected a list of dictionaries")
+    for value in chain(head, values):
+        record = dict(value) if isinstance(value, dict) else {'value': value}
+        record['exported_at'] = exported_at
+        yield record
+
+def _is_single_object(file_path):
+    """Check whether a JSON file holds one object rather than an array or JSON lines"""
+    with open(file_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            stripped = line.lstrip(_WHITESPACE)
+            if stripped:
+                return stripped[0] == '{'
+    return False
+
+def convert_json_to_csv(input_file, output_file, sample_size=SAMPLE_SIZE, schema_scan=False):
+    """Convert a JSON array or JSON lines file to CSV, streaming records
+
+    Columns come from the first sample_size records, or from every record
+    with schema_scan (an extra pass over the input). Keys outside the
+    columns are dropped with a warning.
+    """
     # Get file stats
     stats = get_file_stats(input_file)
+    if stats is None:
+        return False
     print(f"Converting file: {stats['path']}, Size: {stats['size']} bytes")
     
-    # Add timestamp
-    if isinstance(data, list):
-        for item in data:
-            item['exported_at'] = get_timestamp()
-    else:
-        print("Warning: Expected a list of dictionaries")
-        data = [data]  # Convert to list
-        data[0]['exported_at'] = get_timestamp()
+    exported_at = get_timestamp()
+    try:
+        if schema_scan:
+            fieldnames = read_fieldnames(_records(input_file, exported_at))
+            records = _records(input_file, exported_at)
+        else:
+            records = _records(input_file, exported_at)
+            sample = list(islice(records, sample_size))
+            fieldnames = read_fieldnames(sample)
+            records = chain(sample, records)
+        
+        if not fieldnames:
+            print("Data must be a non-empty list")
+            return False
+        
+        rows, dropped = write_csv(output_file, records, fieldnames)
+    except ValueError as e:
+        print(f"Error loading data: {str(e)}")
+        return False
+    except Exception as e:
+        print(f"Error exporting to CSV: {str(e)}")
+        return False
     
-    # Export to CSV
-    return export_to_csv(output_file, data)
+    print(f"Wrote {rows} rows with {len(fieldnames)} columns")
+    if dropped:
+        print(f"Warning: {dropped} rows had keys outside the sampled columns (use --schema-scan)")
+    return True
 
 def main():
-    if len(sys.argv) < 3:
-        print("Usage: example_script3.py input_json output_csv")
+    args = sys.argv[1:]
+    schema_scan = '--schema-scan' in args
+    args = [arg for arg in args if arg != '--schema-scan']
+    sample_size = SAMPLE_SIZE
+    if '--sample' in args:
+        index = args.index('--sample')
+        try:
+            sample_size = int(args[index + 1])
+        except (IndexError, ValueError):
+            print("--sample needs a number of records")
+            return 1
+        del args[index:index + 2]
+    
+    if len(args) < 2:
+        print("Usage: example_script3.py [--schema-scan | --sample N] input_json output_csv")
+        print("  input_json may hold a JSON array, a single object or JSON lines")
         return 1
         
-    input_file = sys.argv[1]
-    output_file = sys.argv[2]
+    input_file = args[0]
+    output_file = args[1]
     
-    success = convert_json_to_csv(input_file, output_file)
+    success = convert_json_to_csv(input_file, output_file, sample_size, schema_scan)
     if success:
         print("File converted successfully.")
         return 0
@@ -5,8 +5,20 @@
 import os
 import sys
 import json
+import time
+import stat
 import yaml
+import atexit
+import weakref
+import tempfile
+import threading
 from pathlib import Path
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: saves are still atomic, just not locked
+    fcntl = None
 
 # Try to import logger, but provide fallback if not available
 try:
@@ -26,26 +38,163 @@ CONFIG_DIR = os.path.join(VAULT_PATH, "System/Configuration")
 # Ensure config directory exists
 os.makedirs(CONFIG_DIR, exist_ok=True)
 
+# Shared instances by absolute config file path
+_registry = {}
+_registry_lock = threading.RLock()
+
+# Instances with deferred saves, flushed at exit
+_write_behind = weakref.WeakSet()
+
+_MISSING = object()
+
 class ConfigManager:
-    """Manages configuration for the vault scripts"""
+    """Manages configuration for the vault scripts
     
-    def __init__(self, config_file=None, config_name=None):
-        self.config_name = config_name or 'default'
+    Instances are shared per config file: constructing a ConfigManager for a
+    file that is already loaded in this process returns the same instance
+    (pass shared=False for a private copy). The file is re-read when its
+    mtime or size changes, and dotted lookups are served from a flattened
+    key cache that is rebuilt after set, delete, merge or reload.
+    
+    Changes made through set, delete, merge and reset are recorded until
+    saved, dropping earlier changes a later one overwrites, so a key set
+    repeatedly is recorded once. Saves hold a lock file and write
+    atomically; if another process saved the file in the meantime, the
+    recorded changes are re-applied on top of its version instead of
+    overwriting it.
+    """
+    
+    reload_interval = 1.0  # Seconds between file change checks (None disables hot reload)
+    write_behind = False  # Defer and coalesce save_config calls
+    save_delay = 2.0  # Seconds a deferred save waits for further changes
+    
+    def __new__(cls, config_file=None, config_name=None, shared=True):
+        if not shared:
+            return super().__new__(cls)
         
-        # Set config file path
+        path = cls._resolve_path(config_file, config_name)
+        with _registry_lock:
+            instance = _registry.get(path)
+            if instance is None:
+                instance = super().__new__(cls)
+                _registry[path] = instance
+            return instance
+    
+    def __init__(self, config_file=None, config_name=None, shared=True):
+        with _registry_lock:
+            if getattr(self, '_initialized', False):
+                return
+            
+            self.config_name = config_name or 'default'
+            self.config_file = self._resolve_path(config_file, self.config_name)
+            
+            # Initialize config
+            self.config = {}
+            self._flat = None
+            self._file_state = None
+            self._last_check = time.monotonic()
+            self._lock = threading.RLock()
+            self._pending_ops = []  # Unsaved changes as (method, *args)
+            self._dirty = False
+            self._flush_timer = None
+            self.load_config()
+            self._initialized = True
+    
+    @staticmethod
+    def _resolve_path(config_file, config_name):
+        """Get the absolute config file path for constructor arguments"""
         if config_file is None:
-            self.config_file = os.path.join(CONFIG_DIR, f"{self.config_name}_config.json")
+            return os.path.join(CONFIG_DIR, f"{config_name or 'default'}_config.json")
         elif os.path.isabs(config_file):
-            self.config_file = config_file
+            return config_file
         else:
-            self.config_file = os.path.join(CONFIG_DIR, config_file)
+            return os.path.join(CONFIG_DIR, config_file)
+    
+    def _file_signature(self):
+        """Get (mtime, size) of the config file, or None if it is missing"""
+        try:
+            file_stat = os.stat(self.config_file)
+            return file_stat.st_mtime_ns, file_stat.st_size
+        except OSError:
+            return None
+    
+    def check_reload(self, force=False):
+        """Reload the config file if it changed on disk since it was last read"""
+        if self.reload_interval is None and not force:
+            return False
         
-        # Initialize config
-        self.config = {}
-        self.load_config()
+        now = time.monotonic()
+        if not force and now - self._last_check < self.reload_interval:
+            return False
+        self._last_check = now
+        
+        if self._file_signature() == self._file_state:
+            return False
+        
+        logger.debug(f"Config file changed on disk, reloading: {self.config_file}")
+        with self._lock:
+            ops = self._pending_ops
+            result = self.load_config()
+            self._pending_ops = ops
+            self._replay_ops()
+        return result
+    
+    def _record(self, op):
+        """Record an unsaved change, dropping earlier ones it overwrites
+        
+        A set or delete replaces earlier sets and deletes of the same key
+        and the keys below it; reset replaces everything. Merges are kept,
+        since a later merge only overwrites part of an earlier one.
+        """
+        method = op[0]
+        if method == 'reset':
+            self._pending_ops = [op]
+            return
+        if method in ('set', 'delete'):
+            path = op[1]
+            prefix = path + '.'
+            self._pending_ops = [
+                earlier for earlier in self._pending_ops
+                if earlier[0] not in ('set', 'delete') or (earlier[1] != path and not earlier[1].startswith(prefix))
+            ]
+        self._pending_ops.append(op)
+    
+    def _replay_ops(self):
+        """Re-apply unsaved changes on top of freshly loaded configuration"""
+        ops, self._pending_ops = self._pending_ops, []
+        for method, *args in ops:
+            getattr(self, method)(*args)
+    
+    def _build_flat(self):
+        """Build the dotted-key lookup table for the current configuration"""
+        flat = {}
+        
+        def _walk(node, prefix):
+            for key, value in node.items():
+                dotted = f"{prefix}{key}"
+                flat[dotted] = value
+                if isinstance(value, dict):
+                    _walk(value, dotted + '.')
+        
+        if isinstance(self.config, dict):
+            _walk(self.config, '')
+        self._flat = flat
+        return flat
+    
+    def _invalidate(self):
+        """Drop the dotted-key cache after a change"""
+        self._flat = None
     
     def load_config(self):
-        """Load configuration from file"""
+        """Load configuration from file, discarding unsaved changes"""
+        with self._lock:
+            self._pending_ops = []
+            self._file_state = self._file_signature()
+            self._invalidate()
+            return self._read_config()
+    
+    def _read_config(self):
+        """Parse the config file into self.config"""
         try:
             if os.path.exists(self.config_file):
                 with open(self.config_file, 'r') as f:
@@ -67,46 +216,126 @@ class ConfigManager:
             logger.error(f"Error loading config: {str(e)}")
             return False
     
+    def set_write_behind(self, enabled=True, delay=None):
+        """Enable or disable deferred, coalesced saves for this instance"""
+        with self._lock:
+            self.write_behind = enabled
+            if delay is not None:
+                self.save_delay = delay
+            if enabled:
+                _write_behind.add(self)
+            elif self._dirty:
+                return self.flush()
+        return True
+    
     def save_config(self):
-        """Save configuration to file"""
-        try:
-            # Ensure directory exists
-            os.makedirs(os.path.dirname(self.config_file), exist_ok=True)
-            
-            # Write config file
-            with open(self.config_file, 'w') as f:
-                if self.config_file.endswith('.json'):
-                    json.dump(self.config, f, indent=2)
-                elif self.config_file.endswith(('.yaml', '.yml')):
-                    yaml.dump(self.config, f, default_flow_style=False)
-                else:
-                    logger.warning(f"Unknown config file type: {self.config_file}")
-                    return False
+        """Save configuration to file
+        
+        In write-behind mode the write is deferred by save_delay seconds and
+        coalesced with any further saves; pending writes are flushed at exit.
+        """
+        if not self.write_behind:
+            return self.flush()
+        
+        with self._lock:
+            self._dirty = True
+            if self._flush_timer is None:
+                self._flush_timer = threading.Timer(self.save_delay, self.flush)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+        return True
+    
+    def flush(self):
+        """Write configuration to file now"""
+        with self._lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
             
-            logger.debug(f"Saved configuration to {self.config_file}")
-            return True
-        except Exception as e:
-            logger.error(f"Error saving config: {str(e)}")
-            return False
+            try:
+                # Ensure directory exists
+                os.makedirs(os.path.dirname(self.config_file), exist_ok=True)
+                
+                with self._file_lock():
+                    if self._file_signature() != self._file_state:
+                        # Another process saved since we loaded: keep its settings
+                        logger.debug(f"Config file changed on disk, merging changes: {self.config_file}")
+                        ops = self._pending_ops
+                        self._file_state = self._file_signature()
+                        self._read_config()
+                        self._invalidate()
+                        if not ops:
+                            self._dirty = False
+                            return True  # Nothing of ours to write over its version
+                        self._pending_ops = ops
+                        self._replay_ops()
+                    
+                    data = self._serialize()
+                    if data is None:
+                        return False
+                    self._atomic_write(data)
+                    self._file_state = self._file_signature()
+                
+                self._pending_ops = []
+                self._dirty = False
+                logger.debug(f"Saved configuration to {self.config_file}")
+                return True
+            except Exception as e:
+                logger.error(f"Error saving config: {str(e)}")
+                return False
+    
+    def _serialize(self):
+        """Get the configuration as file content for the config file type"""
+        if self.config_file.endswith('.json'):
+            return json.dumps(self.config, indent=2)
+        elif self.config_file.endswith(('.yaml', '.yml')):
+            return yaml.dump(self.config, default_flow_style=False)
+        
+        logger.warning(f"Unknown config file type: {self.config_file}")
+        return None
+    
+    @contextmanager
+    def _file_lock(self):
+        """Hold an exclusive lock file next to the config file"""
+        directory, name = os.path.split(self.config_file)
+        with open(os.path.join(directory, f".{name}.lock"), 'a') as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+    
+    def _atomic_write(self, data):
+        """Write data to a temp file and rename it over the config file"""
+        directory, name = os.path.split(self.config_file)
+        fd, temp_path = tempfile.mkstemp(prefix=f".{name}.", suffix='.tmp', dir=directory)
+        try:
+            with os.fdopen(fd, 'w') as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            if os.path.exists(self.config_file):
+                os.chmod(temp_path, stat.S_IMODE(os.stat(self.config_file).st_mode))
+            else:
+                os.chmod(temp_path, 0o644)
+            os.replace(temp_path, self.config_file)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
     
     def get(self, path, default=None):
         """Get configuration value by path (dot-separated)"""
-        try:
-            # Split path into components
-            parts = path.split('.')
-            
-            # Navigate through config
-            current = self.config
-            for part in parts:
-                if part in current:
-                    current = current[part]
-                else:
-                    return default
-            
-            return current
-        except Exception as e:
-            logger.error(f"Error getting config value {path}: {str(e)}")
-            return default
+        self.check_reload()
+        flat = self._flat
+        if flat is None:
+            with self._lock:
+                flat = self._build_flat()
+        
+        value = flat.get(path, _MISSING)
+        return default if value is _MISSING else value
     
     def set(self, path, value):
         """Set configuration value by path (dot-separated)"""
@@ -123,6 +352,8 @@ class ConfigManager:
             
             # Set the final value
             current[parts[-1]] = value
+            self._invalidate()
+            self._record(('set', path, value))
             
             logger.debug(f"Set config {path} = {value}")
             return True
@@ -151,6 +382,8 @@ class ConfigManager:
             # Delete the final value
             if parts[-1] in current:
                 del current[parts[-1]]
+                self._invalidate()
+                self._record(('delete', path))
                 logger.debug(f"Deleted config {path}")
                 return True
             else:
@@ -170,6 +403,8 @@ class ConfigManager:
                         source[key] = value
             
             _merge_dict(self.config, config_dict)
+            self._invalidate()
+            self._record(('merge', config_dict))
             logger.debug(f"Merged configuration with {len(config_dict)} keys")
             return True
         except Exception as e:
@@ -179,6 +414,8 @@ class ConfigManager:
     def reset(self):
         """Reset configuration to empty"""
         self.config = {}
+        self._invalidate()
+        self._record(('reset',))
         logger.debug("Reset configuration to empty")
         return True
     
@@ -187,6 +424,19 @@ class ConfigManager:
         return self.config
 
 def get_config(config_name):
-    """Get configuration instance by name"""
+    """Get the shared configuration instance by name"""
     config_file = f"{config_name}_config.json"
-    return ConfigManager(config_file, config_name)
\ No newline at end of file
+    return ConfigManager(config_file, config_name)
+
+def flush_all_configs():
+    """Write any deferred saves (registered to run at exit)"""
+    for manager in list(_write_behind):
+        if manager._dirty:
+            manager.flush()
+
+atexit.register(flush_all_configs)
+
+def clear_config_registry():
+    """Forget shared instances so the next ConfigManager re-reads its file"""
+    with _registry_lock:
+        _registry.clear()
\ No newline at end of file
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+# consolidation_store.py
+# Storage backends for script consolidation plans and results
+
+import os
+import json
+import sqlite3
+from datetime import datetime
+
+# Try to import logger, but provide fallback if not available
+try:
+    from logger import VaultLogger
+    logger = VaultLogger("consolidation_store")
+except ImportError:
+    import logging
+    logger = logging.getLogger("consolidation_store")
+    logger.setLevel(logging.INFO)
+    handler = logging.StreamHandler()
+    logger.addHandler(handler)
+
+# Vault path configuration
+VAULT_PATH = os.environ.get("VAULT_PATH", os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+CONFIG_DIR = os.path.join(VAULT_PATH, "System/Configuration")
+
+PLAN_PATH = os.path.join(CONFIG_DIR, "script_consolidation_plan.json")
+RESULTS_PATH = os.path.join(CONFIG_DIR, "script_consolidation_results.json")
+SQLITE_PATH = os.path.join(CONFIG_DIR, "script_consolidation.db")
+
+STORE_BACKENDS = ('json', 'sqlite')
+
+def _unchanged_groups(old_plans, plans):
+    """Get IDs of groups whose plan keeps the same scripts (group_key) across a re-plan
+
+    Results of any other group describe a different set of scripts and must
+    not attach to the new plan.
+    """
+    old_keys = {p['group_id']: p.get('group_key') for p in old_plans}
+    return {
+        p['group_id'] for p in plans
+        if p.get('group_key') is not None and old_keys.get(p['group_id']) == p['group_key']
+    }
+
+class JSONConsolidationStore:
+    """Stores plans and results as whole JSON documents (original format)
+
+    The results file keeps the latest result of every group, so executing a
+    subset of groups does not discard the results of the others. Saving a
+    new plan drops the results of groups it replaces.
+    """
+
+    def __init__(self, plan_path=PLAN_PATH, results_path=RESULTS_PATH):
+        self.plan_path = plan_path
+        self.results_path = results_path
+
+    def save_plans(self, plans):
+        """Replace the stored plan, dropping results of replaced or removed groups"""
+        old_plans = []
+        if os.path.exists(self.plan_path):
+            try:
+                old_plans = self.load_plans()
+            except ValueError:
+                pass  # Unreadable plan: no results can be trusted
+        unchanged = _unchanged_groups(old_plans, plans)
+
+        os.makedirs(os.path.dirname(self.plan_path), exist_ok=True)
+        with open(self.plan_path, 'w') as f:
+            json.dump(plans, f, indent=2)
+
+        results = self.load_results()
+        kept = [r for r in results if r['group_id'] in unchanged]
+        if len(kept) < len(results):
+            self._write_results(kept)
+        return True
+
+    def load_plans(self, group_ids=None):
+        """Load plan records, optionally restricted to the given group IDs"""
+        with open(self.plan_path, 'r') as f:
+            plans = json.load(f)
+
+        if group_ids is not None:
+            wanted = set(group_ids)
+            plans = [p for p in plans if p['group_id'] in wanted]
+        return plans
+
+    def append_results(self, results):
+        """Record results, replacing earlier results for the same groups and keeping the rest"""
+        existing = {r['group_id']: r for r in self.load_results()}
+        for result in results:
+            existing[result['group_id']] = result
+        self._write_results([existing[k] for k in sorted(existing)])
+        return True
+
+    def _write_results(self, results):
+        os.makedirs(os.path.dirname(self.results_path), exist_ok=True)
+        with open(self.results_path, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    def load_results(self, group_ids=None):
+        """Load the latest result for each group"""
+        if not os.path.exists(self.results_path):
+            return []
+
+        with open(self.results_path, 'r') as f:
+            results = json.load(f)
+
+        if group_ids is not None:
+            wanted = set(group_ids)
+            results = [r for r in results if r['group_id'] in wanted]
+        return results
+
+    def close(self):
+        """Nothing to release; files are closed after each read and write"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+class SQLiteConsolidationStore:
+    """Stores plans and results in an indexed SQLite database
+
+    Plans are keyed by group_id so selected groups can be read without
+    parsing the rest. Results are append-only; the newest row for a group
+    wins when reading. Saving a new plan deletes the results of groups it
+    replaces.
+
+    Databases from before group IDs were derived from group keys (integer
+    group_id columns) are cleared on open: their IDs were plan positions,
+    which name different groups after every re-plan.
+    """
+
+    def __init__(self, db_path=SQLITE_PATH):
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        self.conn = sqlite3.connect(self.db_path)
+        self._init_schema()
+
+    def _init_schema(self):
+        """Create tables and indexes if they don't exist"""
+        with self.conn:
+            columns = {row[1]: row[2] for row in self.conn.execute("PRAGMA table_info(plans)")}
+            if columns.get('group_id') == 'INTEGER':
+                logger.info(f"Clearing plans and results with positional group IDs from {self.db_path}")
+                self.conn.execute("DROP TABLE plans")
+                self.conn.execute("DROP TABLE IF EXISTS results")
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS plans ("
+                "group_id TEXT PRIMARY KEY, data TEXT NOT NULL)"
+            )
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, group_id TEXT NOT NULL, "
+                "recorded_at TEXT NOT NULL, data TEXT NOT NULL)"
+            )
+            self.conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_results_group ON results (group_id, id)"
+            )
+
+    @staticmethod
+    def _encode(record):
+        return json.dumps(record, separators=(',', ':'))
+
+    def _select_groups(self, group_ids):
+        """Put group IDs in the temp.selected_groups table, for IN (SELECT ...) filters
+
+        One ? per ID would fail beyond SQLite's variable limit (999 in
+        older builds). Call inside a transaction.
+        """
+        self.conn.execute("CREATE TEMP TABLE IF NOT EXISTS selected_groups (group_id TEXT PRIMARY KEY)")
+        self.conn.execute("DELETE FROM temp.selected_groups")
+        self.conn.executemany(
+            "INSERT OR IGNORE INTO temp.selected_groups (group_id) VALUES (?)",
+            [(group_id,) for group_id in group_ids]
+        )
+
+    def _id_filter(self, column, group_ids):
+        """Build a WHERE clause for a group ID filter (inside a transaction)"""
+        if group_ids is None:
+            return ""
+        self._select_groups(group_ids)
+        return f" WHERE {column} IN (SELECT group_id FROM temp.selected_groups)"
+
+    def save_plans(self, plans):
+        """Replace the stored plan, deleting results of replaced or removed groups"""
+        unchanged = _unchanged_groups(self.load_plans(), plans)
+        with self.conn:
+            self._select_groups(unchanged)
+            self.conn.execute("DELETE FROM results WHERE group_id NOT IN (SELECT group_id FROM temp.selected_groups)")
+            self.conn.execute("DELETE FROM plans")
+            self.conn.executemany(
+                "INSERT INTO plans (group_id, data) VALUES (?, ?)",
+                [(p['group_id'], self._encode(p)) for p in plans]
+            )
+        return True
+
+    def load_plans(self, group_ids=None):
+        """Load plan records, optionally restricted to the given group IDs"""
+        with self.conn:
+            where = self._id_filter('group_id', group_ids)
+            rows = self.conn.execute(f"SELECT data FROM plans{where} ORDER BY rowid").fetchall()
+        return [json.loads(data) for (data,) in rows]
+
+    def append_results(self, results):
+        """Append results without rewriting earlier ones"""
+        recorded_at = datetime.now().isoformat()
+        with self.conn:
+            self.conn.executemany(
+                "INSERT INTO results (group_id, recorded_at, data) VALUES (?, ?, ?)",
+                [(r['group_id'], recorded_at, self._encode(r)) for r in results]
+            )
+        return True
+
+    def load_results(self, group_ids=None):
+        """Load the latest result for each group"""
+        with self.conn:
+            where = self._id_filter('group_id', group_ids)
+            rows = self.conn.execute(
+                "SELECT data FROM results WHERE id IN ("
+                f"SELECT MAX(id) FROM results{where} GROUP BY group_id"
+                ") ORDER BY group_id"
+            ).fetchall()
+        return [json.loads(data) for (data,) in rows]
+
+    def close(self):
+        """Close the database connection"""
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+def get_consolidation_store(backend='json', path=None):
+    """Get a plan/results store for the named backend"""
+    if backend == 'sqlite':
+        return SQLiteConsolidationStore(path or SQLITE_PATH)
+    if backend == 'json':
+        return JSONConsolidationStore()
+
+    logger.warning(f"Unknown consolidation store backend: {backend}, using json")
+    return JSONConsolidationStore()
@@ -3,8 +3,14 @@
 # Error handling utilities for Obsidian vault scripts
 
 import os
+import re
 import sys
+import time
+import atexit
+import tempfile
 import traceback
+import subprocess
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, wait, FIRST_COMPLETED
 from datetime import datetime
 import functools
 import json
@@ -27,6 +33,18 @@ ERROR_LOG_DIR = os.path.join(VAULT_PATH, "System/Logs/Errors")
 # Ensure error log directory exists
 os.makedirs(ERROR_LOG_DIR, exist_ok=True)
 
+# Aggregate errors into one summary per run instead of one file per error, e.g. VAULT_ERROR_AGGREGATE=1
+AGGREGATE_BY_DEFAULT = os.environ.get("VAULT_ERROR_AGGREGATE", "").lower() in ("1", "true", "yes", "on")
+
+# Quoted text and numbers vary between otherwise identical errors
+_SIGNATURE_VARIABLE = re.compile(r"'[^']*'|\"[^\"]*\"|\d+")
+
+# Aggregating handlers with errors not yet written out by close(); summaries are written at exit
+_aggregating = set()
+
+# Marks the end of a batch's item iterator
+_END = object()
+
 # Error codes
 ERROR_CODES = {
     # General errors
@@ -69,15 +87,46 @@ ERROR_CODES = {
     'E503': 'Schema error'
 }
 
+def _format_traceback(error):
+    """Get the traceback for an exception, even outside its except block"""
+    if isinstance(error, BaseException) and error.__traceback__ is not None:
+        return ''.join(traceback.format_exception(type(error), error, error.__traceback__))
+    return traceback.format_exc()
+
+def error_signature(error, error_code):
+    """Get the key that groups recurring errors: code, exception type and message shape"""
+    message = _SIGNATURE_VARIABLE.sub('*', str(error))
+    return f"{error_code}:{type(error).__name__}:{message}"
+
 class ErrorHandler:
-    """Handles errors for vault scripts"""
+    """Handles errors for vault scripts
+    
+    With aggregate=True, recurring errors are grouped by code and signature
+    (see error_signature) with counts and sample paths, and reported as one
+    {script}_summary_{timestamp}.json written at exit and, optionally, every
+    summary_interval seconds. Each signature is logged to the console at most
+    console_limit times, then at most once per console_interval seconds with
+    its running count; suppressed errors are still logged at debug level.
+    Long-running callers should close() handlers they are done with.
+    """
     
-    def __init__(self, script_name=None):
+    max_samples = 5  # Sample messages and paths kept per signature
+    
+    def __init__(self, script_name=None, aggregate=None, summary_interval=None,
+                 console_limit=3, console_interval=30.0):
         self.script_name = script_name or os.path.basename(sys.argv[0])
         self.errors = []
+        self.aggregate = AGGREGATE_BY_DEFAULT if aggregate is None else aggregate
+        self.summary_interval = summary_interval
+        self.console_limit = console_limit
+        self.console_interval = console_interval
+        self.groups = {}  # Signature -> aggregated counts and samples
+        self.summary_file = None
+        self._started = datetime.now()
+        self._last_summary = time.monotonic()
     
-    def handle_error(self, error, error_code='E001', exit_on_error=False, log=True, report=True):
-        """Handle an error"""
+    def handle_error(self, error, error_code='E001', exit_on_error=False, log=True, report=True, path=None):
+        """Handle an error (path names the file being processed, if any)"""
         # Build error info
         error_info = {
             'timestamp': datetime.now().isoformat(),
@@ -85,20 +134,23 @@ class ErrorHandler:
             'error_code': error_code,
             'error_desc': ERROR_CODES.get(error_code, 'Unknown error'),
             'error_msg': str(error),
-            'traceback': traceback.format_exc()
+            'traceback': _format_traceback(error)
         }
         
-        # Store error
-        self.errors.append(error_info)
-        
-        # Log error
-        if log:
-            error_message = f"ERROR {error_code}: {error_info['error_desc']} - {error_info['error_msg']}"
-            logger.error(error_message)
-        
-        # Report error
-        if report:
-            self._report_error(error_info)
+        if self.aggregate:
+            self._aggregate_error(error, error_info, path, log, report)
+        else:
+            # Store error
+            self.errors.append(error_info)
+            
+            # Log error
+            if log:
+                error_message = f"ERROR {error_code}: {error_info['error_desc']} - {error_info['error_msg']}"
+                logger.error(error_message)
+            
+            # Report error
+            if report:
+                self._report_error(error_info)
         
         # Exit if required
         if exit_on_error:
@@ -125,6 +177,98 @@ class ErrorHandler:
         except Exception as e:
             logger.error(f"Failed to write error report: {str(e)}")
     
+    def _aggregate_error(self, error, error_info, path, log, report):
+        """Count an error under its signature, rate-limiting console output"""
+        _aggregating.add(self)
+        signature = error_signature(error, error_info['error_code'])
+        group = self.groups.get(signature)
+        if group is None:
+            # The first occurrence keeps its full error info and traceback
+            self.errors.append(error_info)
+            group = self.groups[signature] = {
+                'error_code': error_info['error_code'],
+                'error_desc': error_info['error_desc'],
+                'signature': signature,
+                'count': 0,
+                'first_seen': error_info['timestamp'],
+                'last_seen': error_info['timestamp'],
+                'sample_messages': [],
+                'sample_paths': [],
+                'traceback': error_info['traceback'],
+                '_last_console': 0.0,
+            }
+        group['count'] += 1
+        group['last_seen'] = error_info['timestamp']
+        if len(group['sample_messages']) < self.max_samples:
+            group['sample_messages'].append(error_info['error_msg'])
+        path = path or getattr(error, 'filename', None)
+        if path and len(group['sample_paths']) < self.max_samples and path not in group['sample_paths']:
+            group['sample_paths'].append(str(path))
+        
+        if log:
+            error_message = f"ERROR {error_info['error_code']}: {error_info['error_desc']} - {error_info['error_msg']}"
+            now = time.monotonic()
+            if group['count'] <= self.console_limit:
+                logger.error(error_message)
+                group['_last_console'] = now
+            elif now - group['_last_console'] >= self.console_interval:
+                logger.error(f"{error_message} ({group['count']} occurrences so far)")
+                group['_last_console'] = now
+            else:
+                logger.debug(error_message)
+        
+        if report and self.summary_interval is not None \
+                and time.monotonic() - self._last_summary >= self.summary_interval:
+            self.write_summary()
+    
+    def write_summary(self):
+        """Write the aggregated error summary, replacing this run's previous one"""
+        if not self.groups:
+            return None
+        try:
+            if self.summary_file is None:
+                timestamp = self._started.strftime("%Y%m%d_%H%M%S")
+                self.summary_file = os.path.join(ERROR_LOG_DIR, f"{self.script_name}_summary_{timestamp}.json")
+            
+            groups = sorted(self.groups.values(), key=lambda g: -g['count'])
+            summary = {
+                'script': self.script_name,
+                'started': self._started.isoformat(),
+                'updated': datetime.now().isoformat(),
+                'total_errors': sum(g['count'] for g in groups),
+                'by_code': self._counts_by_code(),
+                'groups': [{k: v for k, v in g.items() if not k.startswith('_')} for g in groups],
+            }
+            
+            fd, temp_path = tempfile.mkstemp(prefix=".summary.", suffix='.tmp', dir=ERROR_LOG_DIR)
+            try:
+                with os.fdopen(fd, 'w') as f:
+                    json.dump(summary, f, indent=2)
+                os.replace(temp_path, self.summary_file)
+            except BaseException:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+                raise
+            self._last_summary = time.monotonic()
+            
+            logger.debug(f"Error summary written to {self.summary_file}")
+            return self.summary_file
+        except Exception as e:
+            logger.error(f"Failed to write error summary: {str(e)}")
+            return None
+    
+    def close(self):
+        """Write the summary now instead of at exit, and release the handler"""
+        _aggregating.discard(self)
+        return self.write_summary()
+    
+    def _counts_by_code(self):
+        """Get total error counts by error code"""
+        counts = {}
+        for group in self.groups.values():
+            counts[group['error_code']] = counts.get(group['error_code'], 0) + group['count']
+        return counts
+    
     def _log_exit(self, error_code):
         """Log script exit due to error"""
         exit_message = f"Script {self.script_name} exiting due to error {error_code}"
@@ -142,6 +286,12 @@ class ErrorHandler:
         """Get summary of errors encountered"""
         if not self.errors:
             return "No errors encountered"
+        
+        if self.aggregate:
+            return "\n".join(
+                f"{g['error_code']}: {g['error_desc']} - {g['sample_messages'][0]} (x{g['count']})"
+                for g in sorted(self.groups.values(), key=lambda g: -g['count'])
+            )
             
         summary = []
         for error in self.errors:
@@ -149,6 +299,20 @@ class ErrorHandler:
             
         return "\n".join(summary)
 
+def error_code_for(error):
+    """Get the error code for an exception type"""
+    if isinstance(error, FileNotFoundError):
+        return 'E101'
+    elif isinstance(error, PermissionError):
+        return 'E102'
+    elif isinstance(error, (TimeoutError, subprocess.TimeoutExpired)):
+        return 'E202'
+    elif isinstance(error, KeyboardInterrupt):
+        return 'E203'
+    elif isinstance(error, SyntaxError) or isinstance(error, ValueError):
+        return 'E501'
+    return 'E001'  # Default unknown error
+
 def safe_execution(func):
     """Decorator for safe function execution with error handling"""
     @functools.wraps(func)
@@ -159,24 +323,170 @@ def safe_execution(func):
         try:
             return func(*args, **kwargs)
         except Exception as e:
-            # Determine error code based on exception type
-            error_code = 'E001'  # Default unknown error
-            if isinstance(e, FileNotFoundError):
-                error_code = 'E101'
-            elif isinstance(e, PermissionError):
-                error_code = 'E102'
-            elif isinstance(e, TimeoutError):
-                error_code = 'E202'
-            elif isinstance(e, KeyboardInterrupt):
-                error_code = 'E203'
-            elif isinstance(e, SyntaxError) or isinstance(e, ValueError):
-                error_code = 'E501'
-            
-            error_handler.handle_error(e, error_code=error_code, exit_on_error=True)
+            error_handler.handle_error(e, error_code=error_code_for(e), exit_on_error=True)
             return 1  # Should not reach here due to exit_on_error=True
     
     return wrapper
 
+def _run_item(func, item, retries, backoff):
+    """Run func(item), retrying E202 timeouts with exponential backoff
+    
+    Returns (ok, result or exception, error code, attempts); runs in a worker.
+    """
+    attempt = 0
+    while True:
+        attempt += 1
+        try:
+            return True, func(item), None, attempt
+        except Exception as e:
+            code = error_code_for(e)
+            if code == 'E202' and attempt <= retries:
+                time.sleep(backoff * 2 ** (attempt - 1))
+                continue
+            return False, e, code, attempt
+
+class BatchResult:
+    """Outcome of a BatchExecutor run"""
+    
+    def __init__(self):
+        self.results = {}  # Item key -> return value
+        self.failed = {}  # Item key -> error code
+        self.skipped = 0  # Items completed by an earlier, interrupted run
+        self.retried = 0  # Extra attempts made after E202 timeouts
+    
+    @property
+    def ok(self):
+        return not self.failed
+    
+    def summary(self):
+        """Get a one-line summary of the run"""
+        return (f"{len(self.results)} succeeded, {len(self.failed)} failed, "
+                f"{self.skipped} skipped (already done), {self.retried} retries")
+
+class BatchExecutor:
+    """Error-tolerant per-item execution across a worker pool
+    
+    Unlike safe_execution, a failing item does not end the run: its
+    exception is mapped to an error code and reported through an
+    ErrorHandler (aggregating by default), and the batch continues. E202
+    timeouts are retried with exponential backoff. With a checkpoint file,
+    each completed item's key is appended as it finishes so a rerun after
+    an interruption skips it; the checkpoint is removed once a run finishes
+    with no failures. Failed items are never checkpointed, so reruns retry
+    them.
+    
+    For file sweeps, pass a job_journal.JobJournal (item keys must be
+    paths) instead of a checkpoint: unchanged files processed by any earlier
+    run are skipped, not only those from an interrupted one.
+    
+    initializer(*initargs) runs once in each worker, e.g. to hand large
+    shared state to worker processes once instead of pickling it per item.
+    """
+    
+    def __init__(self, name, workers=4, retries=2, backoff=1.0, checkpoint=None,
+                 error_handler=None, processes=False, key=str, journal=None, initializer=None, initargs=()):
+        self.name = name
+        self.workers = workers
+        self.retries = retries
+        self.backoff = backoff
+        self.checkpoint = checkpoint
+        self._owns_handler = error_handler is None  # Closed after each run
+        self.error_handler = error_handler or ErrorHandler(name, aggregate=True)
+        self.processes = processes  # Processes need a picklable, module-level func
+        self.key = key
+        self.journal = journal
+        self.initializer = initializer
+        self.initargs = initargs
+    
+    def _load_checkpoint(self):
+        """Get the keys completed by an earlier run"""
+        done = set()
+        if self.checkpoint and os.path.exists(self.checkpoint):
+            with open(self.checkpoint, 'r') as f:
+                for line in f:
+                    try:
+                        done.add(json.loads(line))
+                    except ValueError:
+                        continue  # Torn last line from an interrupted write
+        return done
+    
+    def run(self, func, items):
+        """Run func on every item; returns a BatchResult"""
+        result = BatchResult()
+        done = self._load_checkpoint()
+        if done:
+            logger.info(f"Resuming {self.name}: {len(done)} items already completed")
+        
+        journal = None
+        if self.checkpoint:
+            os.makedirs(os.path.dirname(os.path.abspath(self.checkpoint)), exist_ok=True)
+            journal = open(self.checkpoint, 'a')
+        
+        pool_type = ProcessPoolExecutor if self.processes else ThreadPoolExecutor
+        pool = pool_type(max_workers=self.workers, initializer=self.initializer, initargs=self.initargs)
+        pending = {}
+        try:
+            items = iter(items)
+            exhausted = False
+            while True:
+                # Keep a bounded number of items in flight
+                while not exhausted and len(pending) < self.workers * 4:
+                    item = next(items, _END)
+                    if item is _END:
+                        exhausted = True
+                        break
+                    key = self.key(item)
+                    if key in done or (self.journal is not None and self.journal.is_current(key)):
+                        result.skipped += 1
+                        continue
+                    future = pool.submit(_run_item, func, item, self.retries, self.backoff)
+                    pending[future] = key
+                
+                if not pending:
+                    break
+                
+                finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    key = pending.pop(future)
+                    ok, value, code, attempts = future.result()
+                    result.retried += attempts - 1
+                    if ok:
+                        result.results[key] = value
+                        if journal is not None:
+                            journal.write(json.dumps(key) + '\n')
+                        if self.journal is not None:
+                            self.journal.mark_done(key)
+                    else:
+                        result.failed[key] = code
+                        if self.journal is not None:
+                            self.journal.mark_failed(key)
+                        self.error_handler.handle_error(value, error_code=code, path=key)
+                
+                if journal is not None:
+                    journal.flush()
+        except KeyboardInterrupt as e:
+            self.error_handler.handle_error(e, error_code='E203')
+            raise
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+            if journal is not None:
+                journal.close()
+            if self._owns_handler:
+                self.error_handler.close()
+        
+        if self.checkpoint and result.ok and os.path.exists(self.checkpoint):
+            os.remove(self.checkpoint)
+        
+        logger.info(f"{self.name}: {result.summary()}")
+        return result
+
+def write_error_summaries():
+    """Write summaries for all aggregating handlers (registered to run at exit)"""
+    for handler in list(_aggregating):
+        handler.write_summary()
+
+atexit.register(write_error_summaries)
+
 def get_error_details(error_code):
     """Get details for a specific error code"""
     if error_code in ERROR_CODES:
@@ -3,23 +3,185 @@
 # Shared functions extracted from example scripts
 # Created by script_consolidation.py on 2025-04-15
 
+import os
+import sys
+import glob
 import json
+import mmap
+import time
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 
-def load_data(file_path):
-    """Load data from a JSON file"""
+# Optional fast JSON libraries; the stdlib backend is always available
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+# The default backend is the fastest one installed: msgspec, then orjson, then
+# stdlib. VAULT_JSON_BACKEND=stdlib forces the stdlib backend, the only one that
+# writes NaN and Infinity (as non-standard literals) instead of null
+JSON_BACKEND = os.environ.get("VAULT_JSON_BACKEND", "").lower() or None
+
+# Indented output from save_data unless a caller asks otherwise
+PRETTY_BY_DEFAULT = os.environ.get("VAULT_JSON_PRETTY", "").lower() in ("1", "true", "yes", "on")
+
+# Files at least this large are parsed from a memory map instead of a copy
+MMAP_THRESHOLD = 8 * 1024 * 1024
+
+# Default output names of the batch modes (<input>.processed.json, <input>.analysis.json),
+# and the suffix --summary files should use so later globs skip them too
+OUTPUT_SUFFIXES = ('.processed.json', '.analysis.json', '.summary.json')
+
+# orjson reads integers beyond 64 bits (20 digits) as floats; documents with a
+# run of this many digits are decoded by the stdlib backend instead
+_LONG_DIGIT_RUN = b'9' * 19
+_DIGITS_TO_NINE = bytes.maketrans(b'0123456789', b'9999999999')
+
+def _has_long_digit_run(buffer, chunk_size=1 << 20):
+    """Check for a run of 19 or more digits, a chunk at a time (an mmap is never copied whole)"""
+    if isinstance(buffer, str):
+        buffer = buffer.encode('utf-8')
+    overlap = len(_LONG_DIGIT_RUN) - 1
+    with memoryview(buffer) as view:
+        for start in range(0, len(view), chunk_size):
+            chunk = view[max(0, start - overlap):start + chunk_size].tobytes()
+            if _LONG_DIGIT_RUN in chunk.translate(_DIGITS_TO_NINE):
+                return True
+    return False
+
+class _StdlibBackend:
+    name = 'stdlib'
+
+    @staticmethod
+    def decode(buffer):
+        if isinstance(buffer, (memoryview, mmap.mmap)):
+            # json.loads only takes str, bytes and bytearray; decode the text
+            # straight from the buffer rather than copying it to bytes first
+            encoding = json.detect_encoding(bytes(buffer[:4]))
+            buffer = str(buffer, encoding, 'surrogatepass')
+        return json.loads(buffer)
+
+    @staticmethod
+    def encode(data, pretty=False):
+        if pretty:
+            return json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+        return json.dumps(data, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+class _OrjsonBackend:
+    name = 'orjson'
+
+    @staticmethod
+    def decode(buffer):
+        if _has_long_digit_run(buffer):
+            return _StdlibBackend.decode(buffer)
+        if isinstance(buffer, mmap.mmap):
+            with memoryview(buffer) as view:
+                return orjson.loads(view)
+        return orjson.loads(buffer)
+
+    @staticmethod
+    def encode(data, pretty=False):
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if pretty else 0)
+        return orjson.dumps(data, option=option)
+
+class _MsgspecBackend:
+    name = 'msgspec'
+
+    @staticmethod
+    def decode(buffer):
+        if isinstance(buffer, mmap.mmap):
+            with memoryview(buffer) as view:
+                return msgspec.json.decode(view)
+        return msgspec.json.decode(buffer)
+
+    @staticmethod
+    def encode(data, pretty=False):
+        encoded = msgspec.json.encode(data)
+        return msgspec.json.format(encoded, indent=2) if pretty else encoded
+
+def _available_backends():
+    """Get the installed backends, fastest first"""
+    backends = {}
+    if msgspec is not None:
+        backends['msgspec'] = _MsgspecBackend
+    if orjson is not None:
+        backends['orjson'] = _OrjsonBackend
+    backends['stdlib'] = _StdlibBackend
+    return backends
+
+BACKENDS = _available_backends()
+
+DEFAULT_BACKEND = next(iter(BACKENDS))
+
+def get_backend(name=None):
+    """Get a JSON backend by name, or the configured one (VAULT_JSON_BACKEND, else the fastest installed)"""
+    name = name or JSON_BACKEND or DEFAULT_BACKEND
+    if name not in BACKENDS:
+        raise ValueError(f"JSON backend not available: {name} (installed: {', '.join(BACKENDS)})")
+    return BACKENDS[name]
+
+def decode_json(buffer, backend=None):
+    """Parse JSON from str, bytes, bytearray, memoryview or mmap
+
+    Every backend keeps integers exact. The fast backends reject NaN and
+    Infinity literals, so documents the stdlib backend wrote with them are
+    parsed again by the stdlib backend.
+    """
+    backend = get_backend(backend)
+    try:
+        return backend.decode(buffer)
+    except ValueError:
+        if backend is _StdlibBackend:
+            raise
+        return _StdlibBackend.decode(buffer)
+
+def encode_json(data, pretty=False, backend=None):
+    """Serialize data to UTF-8 JSON bytes, compact unless pretty
+
+    The fast backends write NaN and Infinity as null; the stdlib backend
+    keeps them (as the non-standard NaN and Infinity literals).
+    """
+    backend = get_backend(backend)
     try:
-        with open(file_path, 'r') as f:
-            return json.load(f)
+        return backend.encode(data, pretty)
+    except (TypeError, OverflowError):
+        if backend is _StdlibBackend:
+            raise
+        # Values the fast encoders reject, e.g. integers beyond 64 bits
+        return _StdlibBackend.encode(data, pretty)
+
+def load_data(source, use_mmap=None):
+    """Load data from a JSON file, or from bytes, memoryview or mmap data
+
+    Files are read as bytes (no text decoding pass); files of
+    MMAP_THRESHOLD bytes or more are parsed from a memory map unless
+    use_mmap is False.
+    """
+    try:
+        if not isinstance(source, (str, os.PathLike)):
+            return decode_json(source)
+        with open(source, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if size and (use_mmap if use_mmap is not None else size >= MMAP_THRESHOLD):
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    return decode_json(mapped)
+            return decode_json(f.read())
     except Exception as e:
         print(f"Error loading data: {str(e)}")
         return None
 
-def save_data(file_path, data):
-    """Save data to a JSON file"""
+def save_data(file_path, data, pretty=None):
+    """Save data to a JSON file (compact unless pretty or VAULT_JSON_PRETTY is set)"""
     try:
-        with open(file_path, 'w') as f:
-            json.dump(data, f, indent=2)
+        encoded = encode_json(data, PRETTY_BY_DEFAULT if pretty is None else pretty)
+        with open(file_path, 'wb') as f:
+            f.write(encoded)
         return True
     except Exception as e:
         print(f"Error saving data: {str(e)}")
@@ -27,4 +189,103 @@ def save_data(file_path, data):
 
 def get_timestamp():
     """Get current timestamp in ISO format"""
-    return datetime.now().isoformat()
\ No newline at end of file
+    return datetime.now().isoformat()
+
+def _is_glob(pattern):
+    return any(char in pattern for char in '*?[')
+
+def expand_inputs(patterns, manifest=None, exclude_suffixes=OUTPUT_SUFFIXES, exclude_paths=()):
+    """Get input files from glob patterns and manifests, in order and without duplicates
+
+    A manifest lists one path or glob per line (# starts a comment); "-" as
+    a pattern or manifest reads the list from stdin, so it may be given
+    only once (ValueError otherwise). Glob matches ending in one of
+    exclude_suffixes, the outputs of earlier batch runs, are skipped;
+    files named explicitly are kept. exclude_paths (e.g. the --summary file
+    the run writes) are never inputs.
+    """
+    if list(patterns).count('-') + (manifest == '-') > 1:
+        raise ValueError('stdin can only be read once: use "-" as one input or as --manifest, not both')
+
+    entries = []
+    for pattern in patterns:
+        if pattern == '-':
+            entries.extend(sys.stdin.read().splitlines())
+        else:
+            entries.append(pattern)
+    if manifest:
+        if manifest == '-':
+            entries.extend(sys.stdin.read().splitlines())
+        else:
+            with open(manifest, 'r') as f:
+                entries.extend(f.read().splitlines())
+
+    excluded = {os.path.realpath(path) for path in exclude_paths if path}
+    files = {}
+    for entry in entries:
+        entry = entry.strip()
+        if not entry or entry.startswith('#'):
+            continue
+        matches = sorted(glob.glob(entry, recursive=True)) if _is_glob(entry) else [entry]
+        if not matches:
+            print(f"No files match: {entry}")
+        if _is_glob(entry) and exclude_suffixes:
+            matches = [path for path in matches if not path.endswith(tuple(exclude_suffixes))]
+        for path in matches:
+            if os.path.realpath(path) in excluded:
+                continue
+            if os.path.isfile(path):
+                files.setdefault(os.path.abspath(path), None)
+            elif not _is_glob(entry):
+                print(f"Skipping missing file: {path}")
+    return list(files)
+
+def overwritten_inputs(files, outputs):
+    """Get the outputs that are also input files, which a batch would overwrite before reading"""
+    inputs = {os.path.realpath(path) for path in files}
+    return [path for path in outputs if path and os.path.realpath(path) in inputs]
+
+def run_batch(func, jobs, workers=None, processes=False, summary_file=None, name=None):
+    """Run func(*job) for each job tuple in a worker pool; returns the batch summary
+
+    func returns True on success. Modules are loaded once per process, so
+    a batch costs one interpreter start instead of one per file. Use
+    processes=True for CPU-bound work (func must be a module-level function).
+    The summary is saved with save_data when summary_file is given.
+    """
+    started_at = get_timestamp()
+    start = time.perf_counter()
+    failed = []
+    pool_class = ProcessPoolExecutor if processes else ThreadPoolExecutor
+    with pool_class(max_workers=workers or os.cpu_count() or 4) as pool:
+        futures = [(job, pool.submit(func, *job)) for job in jobs]
+        for job, future in futures:
+            try:
+                ok = future.result()
+            except Exception as e:
+                print(f"Error processing {job[0]}: {str(e)}")
+                ok = False
+            if not ok:
+                failed.append(job[0])
+
+    summary = {
+        'batch': name or getattr(func, '__name__', 'batch'),
+        'started_at': started_at,
+        'finished_at': get_timestamp(),
+        'duration_s': round(time.perf_counter() - start, 3),
+        'files': len(futures),
+        'succeeded': len(futures) - len(failed),
+        'failed': len(failed),
+        'failed_files': failed,
+    }
+    if summary_file:
+        save_data(summary_file, summary)
+    return summary
+
+def add_batch_arguments(parser):
+    """Add the shared batch mode options to an argparse parser"""
+    parser.add_argument('inputs', nargs='*', help='Input files or globs (globs skip earlier batch outputs; "-" reads a file list from stdin)')
+    parser.add_argument('--manifest', help='File listing inputs, one path or glob per line ("-" for stdin)')
+    parser.add_argument('--workers', type=int, help='Worker pool size (default: CPU count)')
+    parser.add_argument('--processes', action='store_true', help='Use worker processes instead of threads')
+    parser.add_argument('--summary', help='Save the batch summary to this JSON file (e.g. batch.summary.json, which globs skip)')
@@ -10,7 +10,7 @@ import shutil
 import yaml
 from pathlib import Path
 from datetime import datetime
-import tempfile
+import secrets
 import hashlib
 
 # Vault path configuration
@@ -27,6 +27,36 @@ except ImportError:
     handler = logging.StreamHandler()
     logger.addHandler(handler)
 
+# YAML frontmatter block at the start of a note
+FRONTMATTER_PATTERN = re.compile(r'^---\s*\n(.+?)\n---\s*\n', re.DOTALL)
+
+# libyaml's loader when PyYAML was built with it
+_YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+def _create_temp(directory, name):
+    """Create a unique temp file for name in directory; returns (fd, path)
+
+    The file is created with mode 0666, so the kernel applies the umask and
+    any default ACL of the directory, as for a file written in place.
+    """
+    while True:
+        temp_path = os.path.join(directory, f".{name}.{secrets.token_hex(4)}.tmp")
+        try:
+            return os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666), temp_path
+        except FileExistsError:
+            continue
+
+def split_frontmatter(content):
+    """Get (frontmatter text, body) for note content; the text is None without frontmatter"""
+    match = FRONTMATTER_PATTERN.match(content)
+    if match is None:
+        return None, content
+    return match.group(1), content[match.end():]
+
+def load_frontmatter(text):
+    """Parse frontmatter YAML text, using the C loader when available"""
+    return yaml.load(text, Loader=_YAML_LOADER)
+
 class VaultFile:
     """Class for handling Obsidian vault files"""
     
@@ -58,9 +88,15 @@ class VaultFile:
             return None
     
     def write(self, content, backup=True):
-        """Write content to file with optional backup"""
+        """Write content to file with optional backup
+        
+        A symlinked note is written through the link: its target is
+        replaced and the link kept.
+        """
+        target_path = os.path.realpath(self.file_path)
+        
         # Ensure directory exists
-        directory = os.path.dirname(self.file_path)
+        directory = os.path.dirname(target_path)
         if directory and not os.path.exists(directory):
             try:
                 os.makedirs(directory, exist_ok=True)
@@ -75,11 +111,17 @@ class VaultFile:
             if not backup_result:
                 logger.warning("Backup failed, proceeding with write operation")
         
-        # Write content
+        # Write content to a temporary file and swap it in, so readers never see a partial note
+        temp_path = None
         try:
-            with open(self.file_path, 'w', encoding='utf-8') as f:
+            fd, temp_path = _create_temp(directory, os.path.basename(target_path))
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
                 f.write(content)
-            
+            if os.path.exists(target_path):
+                shutil.copymode(target_path, temp_path)
+            os.replace(temp_path, target_path)
+            temp_path = None
+
             self.content = content
             self.exists = True
             self.is_file = True
@@ -87,6 +129,8 @@ class VaultFile:
             return True
         except Exception as e:
             logger.error(f"Error writing to file {self.file_path}: {str(e)}")
+            if temp_path is not None and os.path.exists(temp_path):
+                os.remove(temp_path)
             return False
     
     def backup(self, backup_dir=None):
@@ -152,12 +196,11 @@ class VaultFile:
             return None
         
         # Look for YAML frontmatter
-        frontmatter_match = re.match(r'^---\s*\n(.+?)\n---\s*\n', self.content, re.DOTALL)
+        frontmatter_text, _ = split_frontmatter(self.content)
         
-        if frontmatter_match:
-            frontmatter_text = frontmatter_match.group(1)
+        if frontmatter_text is not None:
             try:
-                self.frontmatter = yaml.safe_load(frontmatter_text)
+                self.frontmatter = load_frontmatter(frontmatter_text)
                 return self.frontmatter
             except Exception as e:
                 logger.error(f"Error parsing frontmatter: {str(e)}")
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+# frontmatter_standardizer.py
+# Bulk YAML frontmatter standardization (backend for maintenance/frontmatter.sh)
+
+import os
+import re
+import sys
+import argparse
+import functools
+from datetime import date
+
+# Try to import logger, but provide fallback if not available
+try:
+    from logger import VaultLogger
+    logger = VaultLogger("frontmatter_standardizer")
+except ImportError:
+    import logging
+    logger = logging.getLogger("frontmatter_standardizer")
+    logger.setLevel(logging.INFO)
+    handler = logging.StreamHandler()
+    logger.addHandler(handler)
+
+import file_utils
+import tag_engine
+import error_handler
+import job_journal
+from file_utils import VaultFile
+from tag_engine import iter_notes
+from error_handler import BatchExecutor
+from job_journal import JobJournal
+
+# Vault path configuration
+VAULT_PATH = os.environ.get("VAULT_PATH", os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+# Bump when the rules change so cached results are re-checked
+SCHEMA_VERSION = '1'
+
+STANDARD_FIELDS = ('title', 'date_created', 'date_modified', 'status', 'tags')
+
+# Legacy keys and their standard names
+FIELD_RENAMES = {
+    'date': 'date_created',
+    'created': 'date_created',
+    'updated': 'date_modified',
+    'modified': 'date_modified',
+}
+
+JOB_NAME = "frontmatter_standardize"
+
+_TOP_LEVEL_KEY = re.compile(r'^([A-Za-z_][\w-]*):', re.MULTILINE)
+_CLOSING_LINE = re.compile(r'^---[ \t]*\r?$', re.MULTILINE)
+_TITLE_SEPARATORS = re.compile(r'[-_]')
+
+def _title_from_filename(path):
+    """Get a title from a note's file name (my-note_name -> My Note Name)"""
+    name = os.path.splitext(os.path.basename(path))[0]
+    return ' '.join(word[:1].upper() + word[1:] for word in _TITLE_SEPARATORS.sub(' ', name).split(' '))
+
+def standardize_content(content, path, today=None):
+    """Get (new content, outcome) with the standard frontmatter schema applied
+
+    Outcome is 'added' (frontmatter created), 'changed' or 'unchanged'. Only
+    frontmatter lines are edited; key order, formatting and the note body are
+    kept byte for byte. Raises ValueError for an unclosed frontmatter block.
+    """
+    today = today or date.today().isoformat()
+    first_newline = content.find('\n')
+    first_line = content[:first_newline if first_newline >= 0 else len(content)]
+
+    if first_line.rstrip() != '---':
+        filename = os.path.splitext(os.path.basename(path))[0]
+        header = (f'---\ntitle: "{filename}"\ndate_created: {today}\ndate_modified: {today}\n'
+                  f'status: active\ntags: []\n---\n\n')
+        return header + content, 'added'
+
+    closing = _CLOSING_LINE.search(content, first_newline + 1) if first_newline >= 0 else None
+    if closing is None:
+        raise ValueError(f"Invalid frontmatter in {path} (missing closing ---)")
+
+    head = content[:first_newline + 1]
+    lines = content[first_newline + 1:closing.start()].splitlines(keepends=True)
+    tail = content[closing.start():]
+    keys = {m.group(1) for m in map(_TOP_LEVEL_KEY.match, lines) if m}
+
+    for i, line in enumerate(lines):
+        match = _TOP_LEVEL_KEY.match(line)
+        if match is None:
+            continue
+        key = match.group(1)
+        standard = FIELD_RENAMES.get(key)
+        if standard is not None and standard not in keys and line[match.end():match.end() + 1] == ' ':
+            # Rename legacy date keys unless the standard key is already set
+            lines[i] = standard + line[len(key):]
+            keys.discard(key)
+            keys.add(standard)
+        elif key == 'tags':
+            value = line[match.end():].strip()
+            if value and not value.startswith('['):
+                # Inline tag string becomes a flow list; block lists are left alone
+                newline = '\r\n' if line.endswith('\r\n') else '\n'
+                lines[i] = f"tags: [{value}]{newline}"
+
+    defaults = {
+        'title': f'"{_title_from_filename(path)}"',
+        'date_created': today,
+        'date_modified': today,
+        'status': 'active',
+        'tags': '[]',
+    }
+    missing = [f"{field}: {defaults[field]}\n" for field in STANDARD_FIELDS if field not in keys]
+
+    new_content = head + ''.join(missing + lines) + tail
+    return new_content, ('unchanged' if new_content == content else 'changed')
+
+def standardize_file(path, dry_run=False, backup=False, today=None):
+    """Standardize one note through VaultFile, writing it only if it changed"""
+    vault_file = VaultFile(path)
+    content = vault_file.read()
+    if content is None:
+        raise OSError(f"Unable to read file: {path}")
+
+    new_content, outcome = standardize_content(content, path, today)
+    if outcome != 'unchanged' and not dry_run:
+        if not vault_file.write(new_content, backup=backup):
+            raise OSError(f"Unable to write file: {path}")
+    return outcome
+
+def collect_notes(targets):
+    """Get absolute note paths from files and directories"""
+    paths = []
+    for target in targets:
+        target = os.path.abspath(target)
+        if os.path.isdir(target):
+            paths.extend(iter_notes(target))
+        elif os.path.isfile(target):
+            paths.append(target)
+        else:
+            logger.warning(f"Skipping missing path: {target}")
+    return paths
+
+def standardize_notes(targets, workers=4, processes=False, dry_run=False, backup=False, use_cache=True):
+    """Standardize every note under targets in a worker pool; returns (BatchResult, outcome counts)
+
+    Unless use_cache is False, notes whose content matches what an earlier
+    run left behind are skipped without being read (see JobJournal).
+    """
+    journal = JobJournal(JOB_NAME, version=SCHEMA_VERSION) if use_cache and not dry_run else None
+    work = functools.partial(standardize_file, dry_run=dry_run, backup=backup, today=date.today().isoformat())
+    executor = BatchExecutor(JOB_NAME, workers=workers, processes=processes, journal=journal)
+    try:
+        result = executor.run(work, collect_notes(targets))
+    finally:
+        if journal is not None:
+            journal.close()
+
+    outcomes = {'added': 0, 'changed': 0, 'unchanged': 0}
+    for path, outcome in sorted(result.results.items()):
+        outcomes[outcome] += 1
+        if outcome != 'unchanged':
+            verb = 'Would update' if dry_run else 'Updated'
+            logger.info(f"{verb} frontmatter ({outcome}): {path}")
+    return result, outcomes
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk Frontmatter Standardizer")
+    parser.add_argument('paths', nargs='*', default=[VAULT_PATH], help='Notes or directories (default: vault)')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 4, help='Worker pool size')
+    parser.add_argument('--processes', action='store_true', help='Use worker processes instead of threads')
+    parser.add_argument('--dry-run', action='store_true', help='Report changes without writing')
+    parser.add_argument('--backup', action='store_true', help='Back up files before rewriting them')
+    parser.add_argument('--no-cache', action='store_true', help='Re-check notes an earlier run left unchanged')
+    args = parser.parse_args()
+
+    # stdout carries only the summary line (parsed by frontmatter.sh)
+    for module_logger in (logger, file_utils.logger, tag_engine.logger, error_handler.logger, job_journal.logger):
+        if hasattr(module_logger, 'set_console_stream'):
+            module_logger.set_console_stream(sys.stderr)
+
+    result, outcomes = standardize_notes(args.paths, args.workers, args.processes, args.dry_run,
+                                         args.backup, not args.no_cache)
+    # Last line is read by frontmatter.sh
+    processed = len(result.results) + len(result.failed) + result.skipped
+    print(f"{processed} {outcomes['added']} {outcomes['changed']} "
+          f"{outcomes['unchanged'] + result.skipped} {len(result.failed)}")
+    return 0 if result.ok else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+# instrumentation.py
+# Phase timers, counters and optional profiling for vault scripts
+
+import os
+import io
+import json
+import time
+import pstats
+import cProfile
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+
+# Try to import logger, but provide fallback if not available
+try:
+    from logger import VaultLogger, LOG_DIR
+    logger = VaultLogger("instrumentation")
+except ImportError:
+    import logging
+    logger = logging.getLogger("instrumentation")
+    logger.setLevel(logging.INFO)
+    handler = logging.StreamHandler()
+    logger.addHandler(handler)
+    VAULT_PATH = os.environ.get("VAULT_PATH", os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+    LOG_DIR = os.path.join(VAULT_PATH, "System/Logs")
+
+class Instrumentation:
+    """Collects per-phase wall/CPU timings and counters for a script run"""
+
+    def __init__(self, script_name=None):
+        self.script_name = script_name or 'script'
+        self.started_at = datetime.now().isoformat()
+        self.phases = {}
+        self.counters = {}
+        self.profiler = None
+        self.tracing_memory = False
+
+    @contextmanager
+    def phase(self, name):
+        """Time a block of work under the given phase name"""
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield
+        finally:
+            stats = self.phases.setdefault(name, {'calls': 0, 'wall_s': 0.0, 'cpu_s': 0.0})
+            stats['calls'] += 1
+            stats['wall_s'] += time.perf_counter() - wall_start
+            stats['cpu_s'] += time.process_time() - cpu_start
+
+    def count(self, name, amount=1):
+        """Increment a named counter"""
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def start_profiling(self, cpu=True, memory=True):
+        """Start cProfile and/or tracemalloc capture"""
+        if cpu and self.profiler is None:
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+        if memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self.tracing_memory = True
+
+    def stop_profiling(self):
+        """Stop any running profilers"""
+        if self.profiler is not None:
+            self.profiler.disable()
+
+    def _profile_summary(self, stats_file=None, limit=20):
+        """Summarize cProfile output by cumulative time"""
+        if self.profiler is None:
+            return None
+
+        if stats_file:
+            self.profiler.dump_stats(stats_file)
+
+        stats = pstats.Stats(self.profiler, stream=io.StringIO())
+        stats.sort_stats('cumulative')
+        top = []
+        for func in stats.fcn_list[:limit]:
+            calls, primitive_calls, total_time, cumulative_time, _ = stats.stats[func]
+            filename, line, name = func
+            top.append({
+                'function': f"{os.path.basename(filename)}:{line}({name})",
+                'calls': calls,
+                'total_s': round(total_time, 6),
+                'cumulative_s': round(cumulative_time, 6)
+            })
+
+        return {'stats_file': stats_file, 'top': top}
+
+    def _memory_summary(self, limit=10):
+        """Summarize tracemalloc peak and top allocation sites"""
+        if not self.tracing_memory:
+            return None
+
+        current, peak = tracemalloc.get_traced_memory()
+        snapshot = tracemalloc.take_snapshot()
+        top = []
+        for stat in snapshot.statistics('lineno')[:limit]:
+            frame = stat.traceback[0]
+            top.append({
+                'location': f"{os.path.basename(frame.filename)}:{frame.lineno}",
+                'size_bytes': stat.size,
+                'count': stat.count
+            })
+        tracemalloc.stop()
+        self.tracing_memory = False
+
+        return {'current_bytes': current, 'peak_bytes': peak, 'top': top}
+
+    def get_report(self, stats_file=None):
+        """Get the timing report as a dictionary"""
+        self.stop_profiling()
+        phases = {
+            name: {
+                'calls': stats['calls'],
+                'wall_s': round(stats['wall_s'], 6),
+                'cpu_s': round(stats['cpu_s'], 6)
+            }
+            for name, stats in self.phases.items()
+        }
+
+        report = {
+            'script': self.script_name,
+            'started_at': self.started_at,
+            'phases': phases,
+            'counters': dict(self.counters),
+            'total_wall_s': round(sum(p['wall_s'] for p in phases.values()), 6)
+        }
+
+        profile = self._profile_summary(stats_file)
+        if profile:
+            report['profile'] = profile
+        memory = self._memory_summary()
+        if memory:
+            report['memory'] = memory
+
+        return report
+
+    def write_report(self, report_path=None):
+        """Write the timing report as JSON (and cProfile stats if enabled)"""
+        if report_path is None:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            report_path = os.path.join(LOG_DIR, f"{self.script_name}_timing_{timestamp}.json")
+
+        try:
+            os.makedirs(os.path.dirname(report_path) or '.', exist_ok=True)
+            stats_file = None
+            if self.profiler is not None:
+                stats_file = os.path.splitext(report_path)[0] + '.prof'
+
+            with open(report_path, 'w') as f:
+                json.dump(self.get_report(stats_file), f, indent=2, sort_keys=True)
+
+            logger.info(f"Timing report written to {report_path}")
+            return report_path
+        except Exception as e:
+            logger.error(f"Error writing timing report: {str(e)}")
+            return None
+
+    def summary(self):
+        """Get a one-line-per-phase human readable summary"""
+        lines = []
+        for name, stats in self.phases.items():
+            lines.append(f"{name}: {stats['wall_s']:.3f}s wall, {stats['cpu_s']:.3f}s cpu ({stats['calls']} calls)")
+        for name, value in sorted(self.counters.items()):
+            lines.append(f"{name}: {value}")
+        return "\n".join(lines)
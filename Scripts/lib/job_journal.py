@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+# job_journal.py
+# Checkpoint/resume journal for long-running maintenance sweeps
+
+import os
+import json
+import hashlib
+import atexit
+
+# Try to import logger, but provide fallback if not available
+try:
+    from logger import VaultLogger
+    logger = VaultLogger("job_journal")
+except ImportError:
+    import logging
+    logger = logging.getLogger("job_journal")
+    logger.setLevel(logging.INFO)
+    handler = logging.StreamHandler()
+    logger.addHandler(handler)
+
+# Vault path configuration
+VAULT_PATH = os.environ.get("VAULT_PATH", os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+JOURNAL_DIR = os.path.join(VAULT_PATH, "System/Configuration/Jobs")
+
+JOURNAL_HEADER = "# vault-job-journal v1"
+
+DONE = 'd'
+FAILED = 'f'
+
+# Journals open in this process, closed (flushed and fsynced) at exit
+_open_journals = set()
+
+def content_hash(path=None, data=None):
+    """Get a short BLAKE2 hash of a file's bytes (or of data)"""
+    digest = hashlib.blake2b(digest_size=8)
+    if data is not None:
+        digest.update(data.encode('utf-8') if isinstance(data, str) else data)
+    else:
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+    return digest.hexdigest()
+
+class JobJournal:
+    """Records which files a job has processed and what they contained
+
+    Each processed path is appended to System/Configuration/Jobs/{job}.journal
+    as one line: content hash, size, mtime_ns, status and the JSON-encoded
+    path. A path is current (skipped by pending) when its last entry is done
+    and the file is unchanged: matching size and mtime are trusted, otherwise
+    the content hash is compared, so touched-but-identical files are still
+    skipped. Entries are written as they happen, so an interrupted run resumes
+    where it stopped; a completed journal makes reruns skip unchanged files.
+
+    Changing version (e.g. when job options change) starts a fresh journal.
+    Superseded lines are compacted away on close.
+    """
+
+    def __init__(self, job_name, version='1', journal_dir=JOURNAL_DIR):
+        self.job_name = job_name
+        self.version = str(version)
+        self.journal_path = os.path.join(journal_dir, f"{job_name}.journal")
+        self.entries = {}  # Path -> (hash, size, mtime_ns, status)
+        self._lines = 0
+        self._file = None
+        os.makedirs(journal_dir, exist_ok=True)
+        self._load()
+
+    def _header(self):
+        return f"{JOURNAL_HEADER} job={self.job_name} version={self.version}\n"
+
+    def _load(self):
+        """Read the journal, keeping the last entry per path"""
+        if not os.path.exists(self.journal_path):
+            return
+        try:
+            with open(self.journal_path, 'r', encoding='utf-8') as f:
+                if f.readline() != self._header():
+                    logger.info(f"Job {self.job_name} changed version, starting a fresh journal")
+                    self.entries = {}
+                    self._lines = 0
+                    self.reset()
+                    return
+                for line in f:
+                    try:
+                        digest, size, mtime_ns, status, path = line.rstrip('\n').split(' ', 4)
+                        self.entries[json.loads(path)] = (digest, int(size), int(mtime_ns), status)
+                        self._lines += 1
+                    except ValueError:
+                        continue  # Torn last line from an interrupted write
+            if self.entries:
+                logger.debug(f"Loaded {len(self.entries)} journal entries for {self.job_name}")
+        except Exception as e:
+            logger.error(f"Error reading job journal {self.journal_path}: {str(e)}")
+            self.entries = {}
+
+    def _append(self, path, entry):
+        """Record an entry in memory and on disk"""
+        if self._file is None:
+            new_file = not os.path.exists(self.journal_path)
+            self._file = open(self.journal_path, 'a', encoding='utf-8', buffering=1)
+            if new_file:
+                self._file.write(self._header())
+            _open_journals.add(self)
+        self.entries[path] = entry
+        digest, size, mtime_ns, status = entry
+        self._file.write(f"{digest} {size} {mtime_ns} {status} {json.dumps(path)}\n")
+        self._lines += 1
+
+    def is_current(self, path):
+        """Check if path was processed successfully and has not changed since"""
+        entry = self.entries.get(path)
+        if entry is None or entry[3] != DONE:
+            return False
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return False
+        if stat.st_size != entry[1]:
+            return False
+        if stat.st_mtime_ns == entry[2]:
+            return True
+        return content_hash(path) == entry[0]
+
+    def pending(self, paths):
+        """Yield the paths that still need processing"""
+        skipped = 0
+        for path in paths:
+            if self.is_current(path):
+                skipped += 1
+                continue
+            yield path
+        if skipped:
+            logger.info(f"{self.job_name}: skipped {skipped} unchanged files already processed")
+
+    def mark_done(self, path, digest=None):
+        """Record path as processed in its current state
+
+        Call this after any changes the job writes to the file, so the
+        journal holds the content the next run will see.
+        """
+        try:
+            stat = os.stat(path)
+            self._append(path, (digest or content_hash(path), stat.st_size, stat.st_mtime_ns, DONE))
+            return True
+        except Exception as e:
+            logger.error(f"Error recording {path} in job journal: {str(e)}")
+            return False
+
+    def mark_failed(self, path):
+        """Record path as failed so the next run retries it"""
+        self._append(path, ('-', -1, -1, FAILED))
+        return True
+
+    def forget(self, path):
+        """Drop path from the journal so it is processed again"""
+        if path in self.entries:
+            self.mark_failed(path)
+
+    def compact(self):
+        """Rewrite the journal with only the latest entry per path"""
+        try:
+            self._close_file()
+            temp_path = self.journal_path + '.tmp'
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                f.write(self._header())
+                for path, (digest, size, mtime_ns, status) in self.entries.items():
+                    f.write(f"{digest} {size} {mtime_ns} {status} {json.dumps(path)}\n")
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self.journal_path)
+            self._lines = len(self.entries)
+            return True
+        except Exception as e:
+            logger.error(f"Error compacting job journal {self.journal_path}: {str(e)}")
+            return False
+
+    def reset(self):
+        """Forget all progress for this job"""
+        self._close_file()
+        self.entries = {}
+        self._lines = 0
+        if os.path.exists(self.journal_path):
+            os.remove(self.journal_path)
+        return True
+
+    def _close_file(self):
+        if self._file is not None:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._file.close()
+            self._file = None
+        _open_journals.discard(self)
+
+    def close(self):
+        """Flush the journal, compacting it if most lines are superseded"""
+        self._close_file()
+        if self._lines > 2 * len(self.entries) + 100:
+            self.compact()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+def close_all_journals():
+    """Flush journals left open (registered to run at exit)"""
+    for journal in list(_open_journals):
+        journal.close()
+
+atexit.register(close_all_journals)
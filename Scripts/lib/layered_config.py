@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+# layered_config.py
+# Layered configuration (defaults < file < env < CLI) with compiled schema validation
+
+import os
+import json
+import difflib
+from types import MappingProxyType
+from collections import namedtuple
+
+# Try to import logger, but provide fallback if not available
+try:
+    from logger import VaultLogger
+    logger = VaultLogger("layered_config")
+except ImportError:
+    import logging
+    logger = logging.getLogger("layered_config")
+    logger.setLevel(logging.INFO)
+    handler = logging.StreamHandler()
+    logger.addHandler(handler)
+
+from config_manager import ConfigManager
+
+_TRUE_STRINGS = frozenset(['1', 'true', 'yes', 'on'])
+_FALSE_STRINGS = frozenset(['0', 'false', 'no', 'off'])
+
+class ConfigError(ValueError):
+    """Raised when configuration layers fail schema validation"""
+
+    def __init__(self, problems):
+        self.problems = list(problems)
+        super().__init__("; ".join(self.problems))
+
+class Field:
+    """Schema entry for one dotted configuration key"""
+
+    def __init__(self, type, default=None, min=None, max=None, choices=None, item_type=None):
+        self.type = type
+        self.default = default
+        self.min = min
+        self.max = max
+        self.choices = frozenset(choices) if choices is not None else None
+        self.item_type = item_type
+
+def _compile_validator(key, field):
+    """Build a function that checks a value against a field once per layer"""
+    expected = field.type
+    accepts = (int, float) if expected is float else expected
+    rejects_bool = expected in (int, float)
+    low, high, choices, item_type = field.min, field.max, field.choices, field.item_type
+
+    def validate(value):
+        if value is None and field.default is None:
+            return None
+        if not isinstance(value, accepts) or (rejects_bool and isinstance(value, bool)):
+            raise ValueError(f"{key} must be {expected.__name__}, got {type(value).__name__}")
+        if low is not None and value < low:
+            raise ValueError(f"{key} must be >= {low}, got {value}")
+        if high is not None and value > high:
+            raise ValueError(f"{key} must be <= {high}, got {value}")
+        if choices is not None and value not in choices:
+            raise ValueError(f"{key} must be one of {sorted(choices)}, got {value!r}")
+        if item_type is not None:
+            for item in value:
+                if not isinstance(item, item_type):
+                    raise ValueError(f"{key} items must be {item_type.__name__}, got {type(item).__name__}")
+        return float(value) if expected is float else value
+
+    return validate
+
+def _compile_parser(key, field):
+    """Build a function that converts an env/CLI string to the field type"""
+    expected = field.type
+
+    if expected is bool:
+        def parse(text):
+            lowered = text.strip().lower()
+            if lowered in _TRUE_STRINGS:
+                return True
+            if lowered in _FALSE_STRINGS:
+                return False
+            raise ValueError(f"{key} must be a boolean, got {text!r}")
+    elif expected in (int, float):
+        def parse(text):
+            try:
+                return expected(text)
+            except ValueError:
+                raise ValueError(f"{key} must be {expected.__name__}, got {text!r}")
+    elif expected in (list, dict):
+        def parse(text):
+            text = text.strip()
+            if text[:1] in ('[', '{'):
+                return json.loads(text)
+            if expected is list:
+                return [item.strip() for item in text.split(',') if item.strip()]
+            raise ValueError(f"{key} must be a JSON object, got {text!r}")
+    else:
+        def parse(text):
+            return text
+
+    return parse
+
+def _freeze(value):
+    """Get an immutable copy of a configuration value"""
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+class ConfigSchema:
+    """A configuration schema compiled once into validators and snapshot types
+
+    Fields are keyed by dotted path. Sections become nested named tuples so
+    snapshots are read by attribute (settings.analysis.min_shared_functions).
+    """
+
+    def __init__(self, fields, name='Config'):
+        self.fields = dict(fields)
+        self.validators = {key: _compile_validator(key, f) for key, f in self.fields.items()}
+        self.parsers = {key: _compile_parser(key, f) for key, f in self.fields.items()}
+        self.sections = set()
+        for key in self.fields:
+            parts = key.split('.')
+            for i in range(1, len(parts)):
+                self.sections.add('.'.join(parts[:i]))
+        self._snapshot_type = self._build_type(name, '')
+
+    def _build_type(self, type_name, prefix):
+        """Build the named tuple type for one section and its children"""
+        names = []
+        children = {}
+        for key in self.fields:
+            if not key.startswith(prefix):
+                continue
+            name = key[len(prefix):].split('.', 1)[0]
+            if name in names:
+                continue
+            names.append(name)
+            section = f"{prefix}{name}"
+            if section in self.sections:
+                title = ''.join(part.title() for part in name.split('_'))
+                children[name] = self._build_type(f"{type_name}{title}", section + '.')
+
+        snapshot_type = namedtuple(type_name, names)
+        snapshot_type.children = children
+        return snapshot_type
+
+    def defaults(self):
+        """Get the default value for every field"""
+        return {key: field.default for key, field in self.fields.items()}
+
+    def flatten(self, config, source, problems):
+        """Get schema keys from a nested dict, reporting unknown keys"""
+        values = {}
+
+        def _walk(node, prefix):
+            for name, value in node.items():
+                key = f"{prefix}{name}"
+                if key in self.fields:
+                    values[key] = value
+                elif key in self.sections and isinstance(value, dict):
+                    _walk(value, key + '.')
+                else:
+                    known = list(self.fields) + list(self.sections)
+                    hint = difflib.get_close_matches(key, known, n=1)
+                    suggestion = f" (did you mean {hint[0]}?)" if hint else ""
+                    problems.append(f"{source}: unknown key {key}{suggestion}")
+
+        if isinstance(config, dict):
+            _walk(config, '')
+        elif config is not None:
+            problems.append(f"{source}: expected a mapping at the top level")
+        return values
+
+    def snapshot(self, values):
+        """Build a frozen snapshot from validated flat values"""
+        def _build(snapshot_type, prefix):
+            items = []
+            for name in snapshot_type._fields:
+                child = snapshot_type.children.get(name)
+                if child is not None:
+                    items.append(_build(child, f"{prefix}{name}."))
+                else:
+                    items.append(_freeze(values[f"{prefix}{name}"]))
+            return snapshot_type(*items)
+
+        return _build(self._snapshot_type, '')
+
+class LayeredConfig:
+    """Resolves configuration from defaults, a config file, env and CLI
+
+    Later layers win: schema defaults < config file < environment variables
+    (PREFIX_SECTION__KEY, e.g. VAULT_SCRIPT_CONSOLIDATION_ANALYSIS__MIN_SHARED_FUNCTIONS)
+    < CLI overrides. Every layer is validated; problems are collected and
+    raised together as ConfigError. With strict=False, unknown file keys
+    are logged instead of raised.
+    """
+
+    def __init__(self, schema, config_file=None, config_name=None, env_prefix=None,
+                 overrides=None, strict=False):
+        self.schema = schema
+        self.manager = ConfigManager(config_file, config_name)
+        self.env_prefix = env_prefix
+        self.overrides = dict(overrides or {})
+        self.strict = strict
+        self._snapshot = None
+
+    def env_var(self, key):
+        """Get the environment variable name for a dotted key"""
+        return f"{self.env_prefix}_{key.upper().replace('.', '__')}"
+
+    def resolve(self):
+        """Get validated flat values from all layers"""
+        problems = []
+        warnings = []
+        values = self.schema.defaults()
+        validators = self.schema.validators
+        parsers = self.schema.parsers
+
+        # (key, value, source) in layer order, so later layers win
+        entries = []
+        file_values = self.schema.flatten(self.manager.get_all(), self.manager.config_file,
+                                          problems if self.strict else warnings)
+        entries.extend((key, value, self.manager.config_file) for key, value in file_values.items())
+
+        if self.env_prefix:
+            for key in self.schema.fields:
+                name = self.env_var(key)
+                if name in os.environ:
+                    entries.append((key, os.environ[name], name))
+
+        for key, value in self.overrides.items():
+            if key in self.schema.fields:
+                entries.append((key, value, 'cli'))
+            else:
+                hint = difflib.get_close_matches(key, list(self.schema.fields), n=1)
+                suggestion = f" (did you mean {hint[0]}?)" if hint else ""
+                problems.append(f"cli: unknown key {key}{suggestion}")
+
+        for key, value, source in entries:
+            try:
+                # Env and CLI values arrive as text; file values must already be typed
+                if source != self.manager.config_file and isinstance(value, str) \
+                        and self.schema.fields[key].type is not str:
+                    value = parsers[key](value)
+                values[key] = validators[key](value)
+            except ValueError as e:
+                problems.append(f"{source}: {e}")
+
+        for warning in warnings:
+            logger.warning(warning)
+        if problems:
+            raise ConfigError(problems)
+        return values
+
+    def snapshot(self):
+        """Get a frozen snapshot, rebuilt only when the config file changed"""
+        if self.manager.check_reload() or self._snapshot is None:
+            self._snapshot = self.schema.snapshot(self.resolve())
+        return self._snapshot
+
+def parse_overrides(assignments):
+    """Parse KEY=VALUE strings (e.g. from repeated --set options) into a dict"""
+    overrides = {}
+    for assignment in assignments or []:
+        key, sep, value = assignment.partition('=')
+        if not sep:
+            raise ConfigError([f"cli: expected KEY=VALUE, got {assignment!r}"])
+        overrides[key.strip()] = value
+    return overrides
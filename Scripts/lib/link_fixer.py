@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+# link_fixer.py
+# Vault-wide wiki link rewriting from a precomputed target map (backend for maintenance/links.sh)
+
+import os
+import re
+import sys
+import csv
+import argparse
+import functools
+
+# Try to import logger, but provide fallback if not available
+try:
+    from logger import VaultLogger
+    logger = VaultLogger("link_fixer")
+except ImportError:
+    import logging
+    logger = logging.getLogger("link_fixer")
+    logger.setLevel(logging.INFO)
+    handler = logging.StreamHandler()
+    logger.addHandler(handler)
+
+import file_utils
+import tag_engine
+import error_handler
+import job_journal
+from file_utils import VaultFile
+from tag_engine import iter_notes
+from error_handler import BatchExecutor
+from job_journal import JobJournal, content_hash
+
+# Vault path configuration
+VAULT_PATH = os.environ.get("VAULT_PATH", os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+JOB_NAME = "link_fix"
+
+# Every [[...]] link on one line; the target ends at the first | or #
+_WIKI_LINK = re.compile(r'\[\[([^\]\n]*)\]\]')
+_TARGET_END = re.compile(r'[|#]')
+
+# Runs of characters that differ between a link and its file name (case is folded separately)
+_KEY_SEPARATORS = re.compile(r'[^a-z0-9/]+')
+
+# Link map of the running batch in each worker process, set once by _init_worker
+_worker_link_map = None
+
+def link_key(target):
+    """Get the normalized form of a link target used to match it to a file
+
+    Case, a leading /, a .md extension and runs of spaces, underscores and
+    punctuation are ignored: "Interview: Roquan Smith" and
+    "interview-roquan-smith.md" have the same key.
+    """
+    target = target.strip().lower().lstrip('/')
+    if target.endswith('.md'):
+        target = target[:-3]
+    return '/'.join(_KEY_SEPARATORS.sub('-', part).strip('-') for part in target.split('/'))
+
+def load_renames(path):
+    """Read an old,new CSV of renamed or moved notes (vault-relative paths)"""
+    renames = {}
+    with open(path, 'r', newline='', encoding='utf-8') as f:
+        for row in csv.reader(f):
+            if len(row) < 2 or not row[0].strip() or row[0].strip().lower() == 'old':
+                continue
+            renames[row[0].strip()] = row[1].strip()
+    return renames
+
+class LinkMap:
+    """Old -> new link targets for a vault, built once from its file list
+
+    A target that names an existing file is left alone. Otherwise it is
+    looked up by link_key in the explicit renames, then among full vault
+    paths, then among file names; only a single unambiguous match is used.
+    New targets are vault-relative paths without .md, the form verify.sh
+    checks. The map holds only sets and dicts, so it can be sent to worker
+    processes (once each, see fix_links).
+    """
+
+    def __init__(self, root=VAULT_PATH, renames=None):
+        self.root = os.path.abspath(root)
+        self.files = set()  # Valid targets: vault-relative paths, with and without .md
+        self.by_path = {}  # link_key of path -> set of new targets
+        self.by_name = {}  # link_key of file name -> set of new targets
+        self.renames = {}  # link_key of old path -> new target
+
+        for directory, dirs, names in os.walk(self.root):
+            dirs[:] = [d for d in dirs if not d.startswith('.')]
+            rel_dir = os.path.relpath(directory, self.root)
+            for name in names:
+                if name.startswith('.'):
+                    continue
+                rel_path = name if rel_dir == '.' else f"{rel_dir}/{name}"
+                target = rel_path[:-3] if rel_path.endswith('.md') else rel_path
+                self.files.add(rel_path)
+                self.files.add(target)
+                self.by_path.setdefault(link_key(target), set()).add(target)
+                self.by_name.setdefault(link_key(os.path.basename(target)), set()).add(target)
+
+        for old, new in (renames or {}).items():
+            new = new.strip().lstrip('/')
+            self.renames[link_key(old)] = new[:-3] if new.endswith('.md') else new
+
+    def resolve(self, target):
+        """Get the new target for a link target, or None to leave it as is"""
+        target = target.strip()
+        if not target or '{{' in target:
+            return None  # Template placeholder
+
+        key = link_key(target)
+        new = self.renames.get(key)
+        if new is None:
+            if target.lstrip('/') in self.files:
+                return None
+            matches = self.by_path.get(key) or self.by_name.get(key.rsplit('/', 1)[-1])
+            if not matches or len(matches) > 1:
+                return None
+            new = next(iter(matches))
+        return new if new != target else None
+
+    def digest(self):
+        """Get a short hash of everything resolve depends on, to version the job journal"""
+        parts = sorted(self.files)
+        parts.extend(f"{old} -> {new}" for old, new in sorted(self.renames.items()))
+        return content_hash(data='\n'.join(parts))
+
+def rewrite_links(content, link_map):
+    """Get (new content, [(old link, new link)]) with every mapped link rewritten in one scan
+
+    Headings and aliases are kept. A rewritten link without an alias gets
+    its old target as alias, so it still reads the same in the note.
+    """
+    if '[[' not in content:
+        return content, []
+
+    fixes = []
+    resolved = {}
+
+    def _replace(match):
+        inner = match.group(1)
+        end = _TARGET_END.search(inner)
+        target, suffix = (inner[:end.start()], inner[end.start():]) if end else (inner, '')
+        if target not in resolved:
+            resolved[target] = link_map.resolve(target)
+        new = resolved[target]
+        if new is None:
+            return match.group(0)
+        if '|' not in suffix:
+            suffix = f"{suffix}|{target.strip()}"
+        link = f"[[{new}{suffix}]]"
+        fixes.append((match.group(0), link))
+        return link
+
+    return _WIKI_LINK.sub(_replace, content), fixes
+
+def fix_file(path, link_map, dry_run=False, backup=False):
+    """Rewrite the links of one note through VaultFile; returns the (old, new) fixes"""
+    vault_file = VaultFile(path)
+    content = vault_file.read()
+    if content is None:
+        raise OSError(f"Unable to read file: {path}")
+
+    new_content, fixes = rewrite_links(content, link_map)
+    if fixes and not dry_run:
+        if not vault_file.write(new_content, backup=backup):
+            raise OSError(f"Unable to write file: {path}")
+    return fixes
+
+def _init_worker(link_map):
+    global _worker_link_map
+    _worker_link_map = link_map
+
+def _fix_file_in_worker(path, dry_run=False, backup=False):
+    return fix_file(path, _worker_link_map, dry_run, backup)
+
+def collect_notes(targets, templates='include'):
+    """Get absolute note paths from files and directories
+
+    templates is 'include', 'exclude' or 'only' for notes with "template"
+    in their path.
+    """
+    paths = []
+    for target in targets:
+        target = os.path.abspath(target)
+        if os.path.isdir(target):
+            paths.extend(iter_notes(target))
+        elif os.path.isfile(target):
+            paths.append(target)
+        else:
+            logger.warning(f"Skipping missing path: {target}")
+    if templates == 'exclude':
+        paths = [path for path in paths if 'template' not in path]
+    elif templates == 'only':
+        paths = [path for path in paths if 'template' in path]
+    return paths
+
+def fix_links(targets, root=VAULT_PATH, renames=None, workers=4, processes=False, dry_run=False,
+              backup=False, templates='include', use_cache=True):
+    """Fix links in every note under targets in a worker pool; returns (BatchResult, links fixed)
+
+    Unless use_cache is False, notes left unchanged since an earlier run
+    fixed them are skipped without being read (see JobJournal). The journal
+    is versioned by the link map's digest, so renaming, adding or removing
+    a file, or new renames, start it afresh.
+    """
+    link_map = LinkMap(root, renames)
+    journal = JobJournal(JOB_NAME, version=link_map.digest()) if use_cache and not dry_run else None
+    if processes:
+        # Send the map to each worker process once, not pickled with every note
+        work = functools.partial(_fix_file_in_worker, dry_run=dry_run, backup=backup)
+        executor = BatchExecutor(JOB_NAME, workers=workers, processes=True, journal=journal,
+                                 initializer=_init_worker, initargs=(link_map,))
+    else:
+        work = functools.partial(fix_file, link_map=link_map, dry_run=dry_run, backup=backup)
+        executor = BatchExecutor(JOB_NAME, workers=workers, journal=journal)
+    try:
+        result = executor.run(work, collect_notes(targets, templates))
+    finally:
+        if journal is not None:
+            journal.close()
+
+    fixed = 0
+    verb = 'Would fix' if dry_run else 'Fixed'
+    for path, fixes in sorted(result.results.items()):
+        fixed += len(fixes)
+        for old, new in fixes:
+            logger.info(f"{verb} link in {path}: {old} -> {new}")
+    return result, fixed
+
+def main():
+    parser = argparse.ArgumentParser(description="Vault Link Fixer")
+    parser.add_argument('paths', nargs='*', help='Notes or directories (default: vault)')
+    parser.add_argument('--root', default=VAULT_PATH, help='Vault root that links resolve against')
+    parser.add_argument('--renames', help='CSV of old,new note paths to rewrite links for')
+    parser.add_argument('--templates', choices=('include', 'exclude', 'only'), default='include',
+                        help='Whether to fix notes with "template" in their path')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 4, help='Worker pool size')
+    parser.add_argument('--processes', action='store_true', help='Use worker processes instead of threads')
+    parser.add_argument('--dry-run', action='store_true', help='Report fixes without writing')
+    parser.add_argument('--backup', action='store_true', help='Back up files before rewriting them')
+    parser.add_argument('--no-cache', action='store_true', help='Re-check notes an earlier run left unchanged')
+    args = parser.parse_args()
+
+    # stdout carries only the summary line (parsed by links.sh)
+    for module_logger in (logger, file_utils.logger, tag_engine.logger, error_handler.logger, job_journal.logger):
+        if hasattr(module_logger, 'set_console_stream'):
+            module_logger.set_console_stream(sys.stderr)
+
+    renames = load_renames(args.renames) if args.renames else None
+    result, fixed = fix_links(args.paths or [args.root], args.root, renames, args.workers, args.processes,
+                              args.dry_run, args.backup, args.templates, not args.no_cache)
+    # Last line is read by links.sh
+    changed = sum(1 for fixes in result.results.values() if fixes)
+    processed = len(result.results) + len(result.failed) + result.skipped
+    print(f"{processed} {changed} {fixed} {len(result.failed)}")
+    return 0 if result.ok else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,9 +3,21 @@
 # Standardized logging module for Python scripts in Obsidian vault
 
 import os
+import re
 import sys
+import gzip
+import json
+import time
+import uuid
+import queue
+import atexit
+import shutil
 import logging
-from datetime import datetime
+import threading
+import contextvars
+from contextlib import contextmanager
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from datetime import datetime, timedelta
 from pathlib import Path
 
 # Vault path configuration
@@ -30,6 +42,38 @@ COLORS = {
 # Custom log levels
 SUCCESS = 25  # Between INFO and WARNING
 
+# Queued (non-blocking) logging for every VaultLogger, e.g. VAULT_LOG_QUEUE=1
+QUEUE_BY_DEFAULT = os.environ.get("VAULT_LOG_QUEUE", "").lower() in ("1", "true", "yes", "on")
+
+# Running queue listeners by logger name
+_listeners = {}
+
+# Log file lifecycle: one size-capped file per script instead of one file per run
+ROTATE_BY_DEFAULT = os.environ.get("VAULT_LOG_ROTATE", "").lower() in ("1", "true", "yes", "on")
+LOG_MAX_BYTES = int(os.environ.get("VAULT_LOG_MAX_BYTES", 5 * 1024 * 1024))
+LOG_BACKUP_COUNT = int(os.environ.get("VAULT_LOG_BACKUPS", 5))
+
+# Append-only index of created log files (JSON lines, newest last)
+LOG_INDEX_NAME = ".log_index.jsonl"
+
+# Log files this process has recorded in the index
+_indexed = set()
+
+# Structured logging: JSON lines in the log file, e.g. VAULT_LOG_FORMAT=json
+STRUCTURED_BY_DEFAULT = os.environ.get("VAULT_LOG_FORMAT", "").lower() == "json"
+
+# Identifies this run's records across log files (export VAULT_RUN_ID to share one with child scripts)
+RUN_ID = os.environ.get("VAULT_RUN_ID") or uuid.uuid4().hex[:12]
+
+# Innermost open span in the calling thread or task
+_current_span = contextvars.ContextVar("vault_log_span", default=None)
+
+# Sampling profiler for the whole run, e.g. VAULT_PROFILE=1 or VAULT_PROFILE=speedscope
+PROFILE_REQUESTED = bool(os.environ.get("VAULT_PROFILE"))
+
+# Run timestamp in log file names (script_YYYYMMDD_HHMMSS.log)
+_LOG_TIMESTAMP = re.compile(r"_(\d{8}_\d{6})\.log(?:\.gz)?$")
+
 class ColoredFormatter(logging.Formatter):
     """Custom formatter to add colors to log output"""
     
@@ -44,36 +88,232 @@ class ColoredFormatter(logging.Formatter):
             logging.CRITICAL: COLORS['PURPLE'] + self._fmt + COLORS['RESET'],
         }
         self.style = style  # Store style explicitly
+        
+        # Build one formatter per level up front rather than one per record
+        self._formatters = {
+            level: logging.Formatter(level_fmt, self.datefmt, style)
+            for level, level_fmt in self.FORMATS.items()
+        }
+        self._default_formatter = logging.Formatter(None, self.datefmt, style)
     
     def format(self, record):
-        log_fmt = self.FORMATS.get(record.levelno)
-        formatter = logging.Formatter(log_fmt, self.datefmt, self.style)
+        formatter = self._formatters.get(record.levelno, self._default_formatter)
         return formatter.format(record)
 
+class LazyQueueHandler(QueueHandler):
+    """Queue handler that leaves message formatting to the listener thread
+    
+    The stock QueueHandler formats every record in the calling thread so it
+    can be pickled; records here never leave the process, so the caller only
+    pays for creating the record and putting it on the queue.
+    """
+    
+    def prepare(self, record):
+        return record
+
+class JSONLineFormatter(logging.Formatter):
+    """Formats records as one JSON object per line
+    
+    Every line carries ts, level, logger, run_id, span_id and msg; fields
+    passed as extra={'fields': {...}} (see VaultLogger.event and span) are
+    merged in at the top level.
+    """
+    
+    def format(self, record):
+        entry = {
+            'ts': datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'run_id': getattr(record, 'run_id', RUN_ID),
+            'span_id': getattr(record, 'span_id', None),
+            'msg': record.getMessage(),
+        }
+        fields = getattr(record, 'fields', None)
+        if fields:
+            entry.update(fields)
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+class _ContextFilter(logging.Filter):
+    """Stamps records with the run and span IDs of the logging thread
+    
+    Logger filters run in the caller's thread, so IDs are correct even when
+    a queue listener formats the record later.
+    """
+    
+    def filter(self, record):
+        span = _current_span.get()
+        record.run_id = RUN_ID
+        record.span_id = span.span_id if span is not None else None
+        return True
+
+class Span:
+    """A timed unit of work; records logged inside it carry its span_id"""
+    
+    def __init__(self, name, parent=None):
+        self.name = name
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent.span_id if parent is not None else None
+        self.counters = {}
+        self.fields = {}
+    
+    def count(self, name, amount=1):
+        """Add to a named counter reported when the span ends"""
+        self.counters[name] = self.counters.get(name, 0) + amount
+    
+    def set(self, **fields):
+        """Attach fields to the span's end record"""
+        self.fields.update(fields)
+
+def _gzip_file(source, dest):
+    """Compress source into dest and remove source"""
+    try:
+        temp_path = dest + '.tmp'
+        with open(source, 'rb') as src, gzip.open(temp_path, 'wb') as dst:
+            shutil.copyfileobj(src, dst)
+        os.replace(temp_path, dest)
+        os.remove(source)
+    except Exception as e:
+        print(f"Error compressing log {source}: {str(e)}")
+
+class CompressingRotatingFileHandler(RotatingFileHandler):
+    """Size-capped log file whose rotated copies are gzipped in the background
+    
+    Rotation renames the full file aside and returns immediately; a thread
+    compresses it to name.N.gz. Rotation is not coordinated between
+    processes, so each script should have a single writer. With a
+    script_name, each fresh file started by a rollover is recorded in the
+    log index.
+    """
+    
+    def __init__(self, filename, max_bytes=LOG_MAX_BYTES, backup_count=LOG_BACKUP_COUNT, script_name=None):
+        super().__init__(filename, maxBytes=max_bytes, backupCount=backup_count, delay=True)
+        self.script_name = script_name
+        self.namer = lambda name: name + '.gz'
+        self.rotator = self._rotate
+        self._compressor = None
+    
+    def _rotate(self, source, dest):
+        pending = dest[:-len('.gz')]
+        os.rename(source, pending)
+        self._compressor = threading.Thread(target=_gzip_file, args=(pending, dest))
+        self._compressor.start()
+    
+    def doRollover(self):
+        # Let the previous compression finish before backups are renumbered
+        if self._compressor is not None:
+            self._compressor.join()
+        super().doRollover()
+        if self.script_name is not None:
+            _append_index(self.baseFilename, self.script_name)
+
+def log_file_timestamp(name):
+    """Get the run time encoded in a log file name, or None"""
+    match = _LOG_TIMESTAMP.search(name)
+    if match is None:
+        return None
+    try:
+        return datetime.strptime(match.group(1), "%Y%m%d_%H%M%S")
+    except ValueError:
+        return None
+
+def _index_new_file(log_file, script_name):
+    """Record log_file in the index if this run is the one creating it"""
+    if log_file in _indexed or os.path.exists(log_file):
+        return
+    _indexed.add(log_file)
+    _append_index(log_file, script_name)
+
+def _append_index(log_file, script_name):
+    """Record a newly created log file in the log directory's index"""
+    try:
+        entry = {
+            'file': os.path.basename(log_file),
+            'script': script_name,
+            'created': datetime.now().isoformat(timespec='seconds')
+        }
+        with open(os.path.join(os.path.dirname(log_file), LOG_INDEX_NAME), 'a') as f:
+            f.write(json.dumps(entry) + '\n')
+    except Exception as e:
+        print(f"Error updating log index: {str(e)}")
+
+def _read_index_reverse(index_path, block_size=65536):
+    """Yield index entries newest first, reading the file backwards in blocks"""
+    with open(index_path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        position = f.tell()
+        tail = b''
+        while position > 0:
+            size = min(block_size, position)
+            position -= size
+            f.seek(position)
+            lines = (f.read(size) + tail).split(b'\n')
+            tail = lines.pop(0)
+            for line in reversed(lines):
+                if line.strip():
+                    try:
+                        yield json.loads(line)
+                    except ValueError:
+                        continue
+        if tail.strip():
+            try:
+                yield json.loads(tail)
+            except ValueError:
+                pass
+
+def _stop_listener(name):
+    """Drain and stop the queue listener for a logger, if any"""
+    listener = _listeners.pop(name, None)
+    if listener is not None:
+        listener.stop()
+
+def shutdown_queued_logging():
+    """Drain and stop all queue listeners (registered to run at exit)"""
+    for name in list(_listeners):
+        _stop_listener(name)
+
+atexit.register(shutdown_queued_logging)
+
 class VaultLogger:
     """Standardized logger for Obsidian vault scripts"""
     
-    def __init__(self, script_name=None, log_file=None, console_level=logging.INFO, file_level=logging.DEBUG):
+    def __init__(self, script_name=None, log_file=None, console_level=logging.INFO, file_level=logging.DEBUG,
+                 queued=None, rotating=None, structured=None, console_stream=None):
         # Add custom log level
         logging.addLevelName(SUCCESS, 'SUCCESS')
         
         # Create logger
         self.logger = logging.getLogger(script_name)
         self.logger.setLevel(logging.DEBUG)
+        _stop_listener(script_name)  # Flush records queued by an earlier instance
         self.logger.handlers = []  # Clear existing handlers
+        self.script_name = script_name
+        self.queued = QUEUE_BY_DEFAULT if queued is None else queued
+        self.rotating = ROTATE_BY_DEFAULT if rotating is None else rotating
+        self.structured = STRUCTURED_BY_DEFAULT if structured is None else structured
+        self.logger.filters = [_ContextFilter()] if self.structured else []
+        handlers = []
         
-        # Determine log file path
+        # Determine log file path (auto-named files are recorded in the log index)
+        indexed_name = None
         if log_file is None and script_name is not None:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            log_file = os.path.join(LOG_DIR, f"{script_name}_{timestamp}.log")
+            indexed_name = script_name
+            if self.rotating:
+                log_file = os.path.join(LOG_DIR, f"{script_name}.log")
+            else:
+                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+                log_file = os.path.join(LOG_DIR, f"{script_name}_{timestamp}.log")
+            _index_new_file(log_file, script_name)
         
         # Console handler with colored output
-        console_handler = logging.StreamHandler(sys.stdout)
+        console_handler = logging.StreamHandler(console_stream or sys.stdout)
         console_handler.setLevel(console_level)
+        self.console_handler = console_handler
         console_format = '%(levelname)s: %(message)s'
         console_formatter = ColoredFormatter(console_format)
         console_handler.setFormatter(console_formatter)
-        self.logger.addHandler(console_handler)
+        handlers.append(console_handler)
         
         # File handler if log_file is provided
         if log_file:
@@ -82,12 +322,49 @@ class VaultLogger:
             if log_dir:
                 os.makedirs(log_dir, exist_ok=True)
                 
-            file_handler = logging.FileHandler(log_file)
+            if self.rotating:
+                file_handler = CompressingRotatingFileHandler(log_file, script_name=indexed_name)
+            else:
+                file_handler = logging.FileHandler(log_file)
             file_handler.setLevel(file_level)
-            file_format = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-            file_formatter = logging.Formatter(file_format)
+            if self.structured:
+                file_formatter = JSONLineFormatter()
+            else:
+                file_format = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+                file_formatter = logging.Formatter(file_format)
             file_handler.setFormatter(file_formatter)
-            self.logger.addHandler(file_handler)
+            handlers.append(file_handler)
+        
+        if PROFILE_REQUESTED:
+            from sampling_profiler import start_from_env
+            run_name = os.path.splitext(os.path.basename(sys.argv[0] or ''))[0] or 'python'
+            start_from_env(os.path.dirname(log_file) if log_file else LOG_DIR,
+                           f"{run_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}")
+        
+        if self.queued:
+            # Callers only enqueue; a listener thread formats and writes
+            log_queue = queue.SimpleQueue()
+            listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+            listener.start()
+            _listeners[script_name] = listener
+            self.logger.addHandler(LazyQueueHandler(log_queue))
+        else:
+            for handler in handlers:
+                self.logger.addHandler(handler)
+    
+    def flush(self):
+        """Write out queued records (restarting the listener) or flush handlers"""
+        listener = _listeners.get(self.script_name)
+        if listener is not None:
+            listener.stop()
+            listener.start()
+        else:
+            for handler in self.logger.handlers:
+                handler.flush()
+    
+    def set_console_stream(self, stream):
+        """Send console output to another stream, e.g. sys.stderr when stdout carries results"""
+        self.console_handler.setStream(stream)
     
     def debug(self, msg, *args, **kwargs):
         """Log a debug message"""
@@ -117,36 +394,167 @@ class VaultLogger:
         """Log an exception with traceback"""
         self.logger.exception(msg, *args, exc_info=exc_info, **kwargs)
     
+    def event(self, msg, level=logging.INFO, **fields):
+        """Log a message with structured fields (written in JSON mode only)"""
+        self.logger.log(level, msg, extra={'fields': fields})
+    
+    def count(self, name, amount=1):
+        """Add to a counter on the innermost open span, if any"""
+        span = _current_span.get()
+        if span is not None:
+            span.count(name, amount)
+    
+    @contextmanager
+    def span(self, name, level=logging.DEBUG, **fields):
+        """Time a block of work and log a span_end record when it exits
+        
+        Yields the Span so the block can count and set fields. The end record
+        has duration_s, cpu_s, status (ok/error), counters and parent_span_id;
+        failed spans are logged at WARNING or above.
+        """
+        span = Span(name, _current_span.get())
+        span.fields.update(fields)
+        token = _current_span.set(span)
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        status = 'ok'
+        try:
+            yield span
+        except BaseException:
+            status = 'error'
+            raise
+        finally:
+            _current_span.reset(token)
+            duration = time.perf_counter() - wall_start
+            end_fields = dict(span.fields)
+            end_fields.update({
+                'event': 'span_end',
+                'span': name,
+                'span_id': span.span_id,
+                'parent_span_id': span.parent_id,
+                'duration_s': round(duration, 6),
+                'cpu_s': round(time.process_time() - cpu_start, 6),
+                'status': status,
+                'counters': span.counters,
+            })
+            if status == 'ok':
+                self.logger.log(level, f"{name} finished in {duration:.3f}s", extra={'fields': end_fields})
+            else:
+                self.logger.log(max(level, logging.WARNING), f"{name} failed after {duration:.3f}s",
+                                extra={'fields': end_fields})
+    
+    @staticmethod
+    def _list_logs(log_dir):
+        """Get (sort time, name) for .log and .log.gz files, newest first
+        
+        Run times are read from timestamped names; only files without one are
+        stat'ed for their modification time.
+        """
+        logs = []
+        for name in os.listdir(log_dir):
+            if not name.endswith(('.log', '.log.gz')):
+                continue
+            stamp = log_file_timestamp(name)
+            if stamp is None:
+                stamp = datetime.fromtimestamp(os.path.getmtime(os.path.join(log_dir, name)))
+            logs.append((stamp, name))
+        logs.sort(reverse=True)
+        return logs
+    
     @staticmethod
     def rotate_logs(max_logs=30, log_dir=LOG_DIR):
         """Rotate logs, keeping only the most recent ones"""
         try:
-            log_files = [f for f in os.listdir(log_dir) if f.endswith('.log')]
-            # Sort by modification time (newest first)
-            log_files.sort(key=lambda x: os.path.getmtime(os.path.join(log_dir, x)), reverse=True)
+            logs = VaultLogger._list_logs(log_dir)
             
             # Remove older logs
-            for old_log in log_files[max_logs:]:
+            for _, old_log in logs[max_logs:]:
                 os.remove(os.path.join(log_dir, old_log))
-                
+            
+            VaultLogger._compact_index(log_dir, {name for _, name in logs[:max_logs]})
             return True
         except Exception as e:
             print(f"Error rotating logs: {str(e)}")
             return False
     
+    @staticmethod
+    def _compact_index(log_dir, kept):
+        """Rewrite the log index without entries for removed files"""
+        index_path = os.path.join(log_dir, LOG_INDEX_NAME)
+        if not os.path.exists(index_path):
+            return
+        
+        entries = [
+            e for e in reversed(list(_read_index_reverse(index_path)))
+            if e.get('file') in kept or e.get('file', '') + '.gz' in kept
+        ]
+        temp_path = index_path + '.tmp'
+        with open(temp_path, 'w') as f:
+            for entry in entries:
+                f.write(json.dumps(entry) + '\n')
+        os.replace(temp_path, index_path)
+    
+    @staticmethod
+    def compress_logs(older_than_days=1, log_dir=LOG_DIR, background=True):
+        """Gzip timestamped .log files from runs older than the given age
+        
+        Returns the compression thread when running in the background.
+        """
+        cutoff = datetime.now() - timedelta(days=older_than_days)
+        old_logs = [
+            name for name in os.listdir(log_dir)
+            if name.endswith('.log') and (log_file_timestamp(name) or cutoff) < cutoff
+        ]
+        
+        def _compress():
+            for name in old_logs:
+                path = os.path.join(log_dir, name)
+                _gzip_file(path, path + '.gz')
+        
+        if not background:
+            _compress()
+            return None
+        thread = threading.Thread(target=_compress, name="compress_logs")
+        thread.start()
+        return thread
+    
     @staticmethod
     def get_recent_logs(n=5, log_dir=LOG_DIR, script_name=None):
-        """Get the n most recent log files for a script"""
+        """Get the n most recent log files for a script
+        
+        Reads the log index newest-first, so only the returned files are
+        checked. When the index has fewer than n matches (no index yet, or
+        logs written before it existed), the rest come from a directory scan
+        of the files it does not list.
+        """
         try:
-            if script_name:
-                log_files = [f for f in os.listdir(log_dir) if f.startswith(f"{script_name}_") and f.endswith('.log')]
-            else:
-                log_files = [f for f in os.listdir(log_dir) if f.endswith('.log')]
-                
-            # Sort by modification time (newest first)
-            log_files.sort(key=lambda x: os.path.getmtime(os.path.join(log_dir, x)), reverse=True)
+            recent = []
+            seen = set()
+            index_path = os.path.join(log_dir, LOG_INDEX_NAME)
+            if os.path.exists(index_path):
+                for entry in _read_index_reverse(index_path):
+                    name = entry.get('file')
+                    if not name or name in seen:
+                        continue
+                    seen.update((name, name + '.gz'))
+                    if script_name and entry.get('script') != script_name:
+                        continue
+                    if os.path.exists(os.path.join(log_dir, name)):
+                        recent.append(name)
+                    elif os.path.exists(os.path.join(log_dir, name + '.gz')):
+                        recent.append(name + '.gz')
+                    if len(recent) >= n:
+                        return recent
             
-            return log_files[:n]
+            for _, name in VaultLogger._list_logs(log_dir):
+                if len(recent) >= n:
+                    break
+                if name in seen:
+                    continue
+                if script_name and not (name.startswith(f"{script_name}_") or name.startswith(f"{script_name}.log")):
+                    continue
+                recent.append(name)
+            return recent
         except Exception as e:
             print(f"Error getting recent logs: {str(e)}")
             return []
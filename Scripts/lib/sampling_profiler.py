@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+# sampling_profiler.py
+# Low-overhead signal-based stack sampler with collapsed-stack and speedscope output
+
+import os
+import sys
+import json
+import time
+import signal
+import atexit
+import threading
+
+# Profile any script without code changes, e.g. VAULT_PROFILE=1 or VAULT_PROFILE=speedscope
+PROFILE_SETTING = os.environ.get("VAULT_PROFILE", "").lower()
+PROFILE_INTERVAL = float(os.environ.get("VAULT_PROFILE_INTERVAL_MS", 5)) / 1000.0
+
+# Also count threads blocked in a known wait (VAULT_PROFILE_IDLE=1)
+PROFILE_IDLE = os.environ.get("VAULT_PROFILE_IDLE", "").lower() in ("1", "true", "yes", "on")
+
+PROFILE_FORMATS = ('collapsed', 'speedscope')
+
+MAX_DEPTH = 128
+
+# Functions a thread sits in while it blocks: (end of file path, function name).
+# C-level waits (lock acquire, select, SimpleQueue.get) have no frame of
+# their own, so these are the innermost Python frames above them.
+IDLE_FUNCTIONS = frozenset([
+    ('threading.py', 'wait'),  # Condition.wait: Event.wait, Queue.get, Thread.join timeouts
+    ('threading.py', 'wait_for'),
+    ('threading.py', '_wait_for_tstate_lock'),  # Thread.join
+    ('selectors.py', 'select'),  # socketserver.serve_forever, multiprocessing and subprocess waits
+    ('logging/handlers.py', 'dequeue'),  # QueueListener on a SimpleQueue
+    ('concurrent/futures/thread.py', '_worker'),  # Thread pool worker waiting for work
+    ('vault_watcher.py', 'wait'),  # Watch source waiting for changes
+])
+
+# The process-wide profiler started from the environment, if any
+_active = None
+
+class StackSampler:
+    """Samples the Python stacks of every thread on a CPU-time timer
+
+    On Unix, ITIMER_PROF delivers SIGPROF every interval seconds of process
+    CPU time, and the handler counts each thread's stack (from
+    sys._current_frames) as a tuple of code objects, so a fully idle
+    process costs nothing and names are only built when the profile is
+    written. Elsewhere, or when started outside the main thread, a daemon
+    thread samples on a wall-clock timer instead.
+
+    A thread blocked in a known wait (IDLE_FUNCTIONS: the log queue
+    listener, idle pool workers, the status server) is not running, so its
+    stack is only counted in idle_samples, unless include_idle is set.
+    """
+
+    def __init__(self, interval=PROFILE_INTERVAL, max_depth=MAX_DEPTH, include_idle=PROFILE_IDLE):
+        self.interval = interval
+        self.max_depth = max_depth
+        self.include_idle = include_idle
+        self.counts = {}  # Stack of code objects, root last -> samples
+        self.samples = 0
+        self.idle_samples = 0
+        self._idle_codes = {}  # Code object -> whether it is a known wait
+        self.started = None
+        self.elapsed = 0.0
+        self.mode = None
+        self._previous_handler = None
+        self._thread = None
+        self._stop = threading.Event()
+
+    def _is_idle(self, code):
+        idle = self._idle_codes.get(code)
+        if idle is None:
+            filename = code.co_filename.replace(os.sep, '/')
+            idle = self._idle_codes[code] = any(
+                code.co_name == name and filename.endswith(suffix) for suffix, name in IDLE_FUNCTIONS
+            )
+        return idle
+
+    def _record(self, frame):
+        if not self.include_idle and self._is_idle(frame.f_code):
+            self.idle_samples += 1
+            return
+        stack = []
+        while frame is not None and len(stack) < self.max_depth:
+            stack.append(frame.f_code)
+            frame = frame.f_back
+        stack = tuple(stack)
+        self.counts[stack] = self.counts.get(stack, 0) + 1
+        self.samples += 1
+
+    def _record_threads(self, current_frame=None):
+        """Record every thread's stack; the calling thread's is current_frame, or skipped if None"""
+        current = threading.get_ident()
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == current:
+                frame = current_frame
+            if frame is not None:
+                self._record(frame)
+
+    def _on_signal(self, signum, frame):
+        self._record_threads(frame)
+
+    def _sample_thread(self):
+        while not self._stop.wait(self.interval):
+            self._record_threads()
+
+    def start(self):
+        """Start sampling"""
+        self.started = time.perf_counter()
+        in_main = threading.current_thread() is threading.main_thread()
+        if hasattr(signal, 'setitimer') and in_main:
+            self.mode = 'signal'
+            self._previous_handler = signal.signal(signal.SIGPROF, self._on_signal)
+            signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+        else:
+            self.mode = 'thread'
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._sample_thread, name="stack_sampler", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop sampling"""
+        if self.mode == 'signal':
+            signal.setitimer(signal.ITIMER_PROF, 0, 0)
+            signal.signal(signal.SIGPROF, self._previous_handler or signal.SIG_DFL)
+        elif self.mode == 'thread':
+            self._stop.set()
+            self._thread.join()
+        if self.started is not None:
+            self.elapsed = time.perf_counter() - self.started
+        self.mode = None
+        return self
+
+    @staticmethod
+    def _frame_name(code):
+        return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+    def collapsed(self):
+        """Get the profile as collapsed stacks (flamegraph.pl / speedscope input)"""
+        lines = []
+        for stack, count in sorted(self.counts.items(), key=lambda item: -item[1]):
+            names = ';'.join(self._frame_name(code).replace(';', ',') for code in reversed(stack))
+            lines.append(f"{names} {count}")
+        return '\n'.join(lines) + '\n'
+
+    def speedscope(self, name='profile'):
+        """Get the profile as a speedscope sampled-profile document"""
+        frames = []
+        frame_index = {}
+        samples = []
+        weights = []
+        for stack, count in self.counts.items():
+            sample = []
+            for code in reversed(stack):
+                index = frame_index.get(code)
+                if index is None:
+                    index = frame_index[code] = len(frames)
+                    frames.append({'name': code.co_name, 'file': code.co_filename, 'line': code.co_firstlineno})
+                sample.append(index)
+            samples.append(sample)
+            weights.append(count * self.interval)
+
+        return {
+            '$schema': 'https://www.speedscope.app/file-format-schema.json',
+            'name': name,
+            'exporter': 'vault sampling_profiler',
+            'shared': {'frames': frames},
+            'profiles': [{
+                'type': 'sampled',
+                'name': name,
+                'unit': 'seconds',
+                'startValue': 0,
+                'endValue': sum(weights),
+                'samples': samples,
+                'weights': weights,
+            }],
+        }
+
+    def write(self, path, format='collapsed'):
+        """Write the profile to path in the given format"""
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, 'w') as f:
+            if format == 'speedscope':
+                json.dump(self.speedscope(os.path.basename(path)), f)
+            else:
+                f.write(self.collapsed())
+        return path
+
+def profile_format():
+    """Get the output format requested by VAULT_PROFILE, or None if profiling is off"""
+    if PROFILE_SETTING in PROFILE_FORMATS:
+        return PROFILE_SETTING
+    if PROFILE_SETTING in ("1", "true", "yes", "on"):
+        return 'collapsed'
+    return None
+
+def start_from_env(log_dir, run_name):
+    """Start the process-wide profiler if VAULT_PROFILE is set
+
+    The profile is written at exit to {log_dir}/{run_name}.profile.txt
+    (collapsed) or {run_name}.speedscope.json. Returns the sampler, or None.
+    """
+    global _active
+    format = profile_format()
+    if format is None or _active is not None:
+        return _active
+
+    suffix = '.speedscope.json' if format == 'speedscope' else '.profile.txt'
+    output = os.path.join(log_dir, run_name + suffix)
+    sampler = StackSampler().start()
+    _active = sampler
+
+    def _write_profile():
+        mode = sampler.mode
+        sampler.stop()
+        try:
+            sampler.write(output, format)
+            print(f"Profile written to {output} ({sampler.samples} {mode} samples, "
+                  f"{sampler.idle_samples} idle thread samples left out)", file=sys.stderr)
+        except Exception as e:
+            print(f"Error writing profile: {str(e)}", file=sys.stderr)
+
+    atexit.register(_write_profile)
+    return sampler
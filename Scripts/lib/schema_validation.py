@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+# schema_validation.py
+# Declarative record schemas compiled into validator functions
+
+import re
+from collections import namedtuple
+
+# NumPy is optional: with it, range checks inside arrays run columnar over large batches
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Batches at least this long use the columnar range checks when NumPy is installed
+COLUMNAR_THRESHOLD = 256
+
+# Integers are only exact as float64 within this magnitude
+_FLOAT_EXACT = 2 ** 53
+
+Violation = namedtuple('Violation', ['path', 'message'])
+
+_TYPES = {
+    'string': (str,),
+    'integer': (int,),
+    'number': (int, float),
+    'boolean': (bool,),
+    'object': (dict,),
+    'array': (list,),
+    'null': (type(None),),
+}
+
+def format_path(path):
+    """Get a readable location ('[3].items[0].value') from a path tuple"""
+    return ''.join(f"[{part}]" if isinstance(part, int) else f".{part}" for part in path).lstrip('.')
+
+class _Run:
+    """Per-validation state shared by the compiled checks"""
+
+    __slots__ = ('violations', 'columns')
+
+    def __init__(self, columnar=False):
+        self.violations = []
+        self.columns = {} if columnar else None  # Column location -> (values, paths)
+
+def _compile_type(names):
+    names = [names] if isinstance(names, str) else list(names)
+    unknown = [name for name in names if name not in _TYPES]
+    if unknown:
+        raise ValueError(f"Unknown schema type: {', '.join(unknown)}")
+    accepted = tuple({python_type for name in names for python_type in _TYPES[name]})
+    # bool is an int subclass, but only counts where 'boolean' is allowed
+    allow_bool = 'boolean' in names
+    expected = ' or '.join(names)
+
+    def check_type(value, path, run):
+        if isinstance(value, accepted) and (allow_bool or not isinstance(value, bool)):
+            return True
+        run.violations.append(Violation(path, f"expected {expected}, got {type(value).__name__}"))
+        return False
+    return check_type
+
+def _range_message(value, minimum, maximum):
+    if minimum is not None and value < minimum:
+        return f"value {value} is below minimum {minimum}"
+    return f"value {value} is above maximum {maximum}"
+
+def _exact_as_float(bound):
+    """Check whether a range bound compares the same as a float64"""
+    return bound is None or isinstance(bound, float) or abs(bound) <= _FLOAT_EXACT
+
+def _compile(schema, location, columns):
+    """Compile one schema node into check(value, path, run) -> bool
+
+    Only the constraints present in the node are turned into checks, so
+    validation does no schema lookups. location is the node's place in the
+    schema ('items[].value'); range checks inside arrays are registered in
+    columns under it so batches can check them columnar.
+    """
+    checks = []
+
+    if 'type' in schema:
+        checks.append(_compile_type(schema['type']))
+
+    if 'enum' in schema:
+        allowed = list(schema['enum'])
+        try:
+            allowed_set = frozenset(allowed)
+        except TypeError:
+            allowed_set = None
+
+        def check_enum(value, path, run):
+            try:
+                ok = value in allowed_set if allowed_set is not None else value in allowed
+            except TypeError:
+                ok = value in allowed
+            if not ok:
+                run.violations.append(Violation(path, f"{value!r} is not one of {allowed}"))
+            return ok
+        checks.append(check_enum)
+
+    if 'pattern' in schema:
+        pattern = re.compile(schema['pattern'])
+
+        def check_pattern(value, path, run):
+            if isinstance(value, str) and pattern.search(value) is None:
+                run.violations.append(Violation(path, f"{value!r} does not match pattern {pattern.pattern}"))
+                return False
+            return True
+        checks.append(check_pattern)
+
+    minimum = schema.get('minimum')
+    maximum = schema.get('maximum')
+    if minimum is not None or maximum is not None:
+        columnar = '[]' in location and _exact_as_float(minimum) and _exact_as_float(maximum)
+        if columnar:
+            columns[location] = (minimum, maximum)
+
+        def check_range(value, path, run):
+            if not isinstance(value, (int, float)) or isinstance(value, bool):
+                return True
+            if columnar and run.columns is not None and (isinstance(value, float) or -_FLOAT_EXACT <= value <= _FLOAT_EXACT):
+                # Checked with the rest of its column once the batch is gathered
+                values, paths = run.columns.setdefault(location, ([], []))
+                values.append(value)
+                paths.append(path)
+                return True
+            if (minimum is not None and value < minimum) or (maximum is not None and value > maximum):
+                run.violations.append(Violation(path, _range_message(value, minimum, maximum)))
+                return False
+            return True
+        checks.append(check_range)
+
+    required = tuple(schema.get('required', ()))
+    properties = {
+        name: _compile(subschema, f"{location}.{name}" if location else name, columns)
+        for name, subschema in schema.get('properties', {}).items()
+    }
+    if required or properties:
+        def check_object(value, path, run):
+            if not isinstance(value, dict):
+                return True  # Reported by the type check, if the schema has one
+            ok = True
+            for name in required:
+                if name not in value:
+                    run.violations.append(Violation(path, f"Missing required field: {name}"))
+                    ok = False
+            for name, check in properties.items():
+                if name in value and not check(value[name], path + (name,), run):
+                    ok = False
+            return ok
+        checks.append(check_object)
+
+    if 'items' in schema:
+        check_item = _compile(schema['items'], f"{location}[]", columns)
+
+        def check_items(value, path, run):
+            if not isinstance(value, list):
+                return True
+            ok = True
+            for index, item in enumerate(value):
+                if not check_item(item, path + (index,), run):
+                    ok = False
+            return ok
+        checks.append(check_items)
+
+    if not checks:
+        return lambda value, path, run: True
+    if len(checks) == 1:
+        return checks[0]
+    type_check, rest = (checks[0], checks[1:]) if 'type' in schema else (None, checks)
+
+    def check(value, path, run):
+        if type_check is not None and not type_check(value, path, run):
+            return False  # Other constraints are meaningless for the wrong type
+        ok = True
+        for constraint in rest:
+            if not constraint(value, path, run):
+                ok = False
+        return ok
+    return check
+
+class CompiledSchema:
+    """A schema compiled into validator functions
+
+    Supported keywords: type (name or list of names), required,
+    properties, items, minimum, maximum, enum and pattern. Every violation
+    is reported; validation does not stop at the first one.
+    """
+
+    def __init__(self, schema):
+        self.schema = schema
+        self.columns = {}  # Column location -> (minimum, maximum), for range checks inside arrays
+        self._check = _compile(schema, '', self.columns)
+
+    def validate(self, value):
+        """Get the violations of one value"""
+        run = _Run()
+        self._check(value, (), run)
+        return run.violations
+
+    def validate_batch(self, records, columnar=None):
+        """Get the violations of every record, with paths starting at the record index
+
+        With NumPy installed, batches of COLUMNAR_THRESHOLD records or more
+        (or columnar=True) collect range-checked numbers inside arrays, such
+        as items[].value, into one column per field while the other checks
+        run, then check each column with one vectorized comparison.
+        Integers beyond 2**53, or columns whose bounds are, are checked
+        exactly one by one instead. Violations are listed by record either
+        way; within a record, columnar range violations come last.
+        """
+        if columnar is None:
+            columnar = numpy is not None and bool(self.columns) and len(records) >= COLUMNAR_THRESHOLD
+        elif columnar and numpy is None:
+            raise RuntimeError("Columnar validation needs NumPy")
+
+        run = _Run(columnar)
+        check = self._check
+        for index, record in enumerate(records):
+            check(record, (index,), run)
+        if columnar and run.columns:
+            for location, (values, paths) in run.columns.items():
+                minimum, maximum = self.columns[location]
+                column = numpy.array(values, dtype=numpy.float64)
+                outside = numpy.zeros(len(values), dtype=bool)
+                if minimum is not None:
+                    outside |= column < minimum
+                if maximum is not None:
+                    outside |= column > maximum
+                for position in numpy.flatnonzero(outside).tolist():
+                    value = values[position]
+                    run.violations.append(Violation(paths[position], _range_message(value, minimum, maximum)))
+            run.violations.sort(key=lambda violation: violation.path[0])
+        return run.violations
+
+def compile_schema(schema):
+    """Compile a declarative schema (see CompiledSchema)"""
+    return CompiledSchema(schema)
@@ -0,0 +1,399 @@
+#!/usr/bin/env python3
+# script_analyzers.py
+# Function and import analyzers for shell and JavaScript scripts
+#
+# Each analyzer scans the source once with a master token pattern. Strings,
+# comments, heredocs (shell) and template and regex literals (JavaScript) are
+# skipped inside the regex engine, so only brackets and definition heads are
+# returned to Python and names inside strings are never mistaken for
+# definitions.
+
+import re
+import zlib
+
+_SH_NAME = r"[A-Za-z_][\w:.-]*"
+_JS_NAME = r"[A-Za-z_$][\w$]*"
+
+# Text that never affects structure, consumed in C without returning to Python.
+# Words are dispatched on their first letter so only those that could start a
+# keyword pay for a lookahead.
+_SH_SKIP = (
+    r"(?:[^\"'`\\#$(){}<.a-zA-Z_]+"
+    r"|(?:[abdg-rt-zA-Z_]|c(?!ase\b)|e(?!sac\b)|f(?!unction\b)|s(?!ource\b))[\w-]*"
+    r"|\"(?:\\.|[^\"\\])*\"|'[^']*'|`(?:\\.|[^`\\])*`"
+    r"|\$\{(?:[^{}]|\{[^}]*\})*\}"
+    r"|\$\(\((?:[^()]|\([^()]*\))*\)\)"
+    r"|\$\((?:[^()\"'`\\]|\"(?:\\.|[^\"\\])*\"|'[^']*'|\\.)*\)"
+    r"|\$(?!\()"
+    r"|(?<![\w:.$-])\#[^\n]*|\#"
+    r"|\\."
+    r"|\.(?![ \t])"
+    r"|<<<|<(?!<))*+"
+)
+
+_SH_TOKEN = re.compile(
+    _SH_SKIP +
+    r"(?:(?P<heredoc><<-?[ \t]*(?P<hq>['\"]?)(?P<hdelim>[A-Za-z_]\w*)(?P=hq))"
+    rf"|(?P<function>function[ \t]+(?P<fname>{_SH_NAME})(?:[ \t]*\([ \t]*\))?)"
+    r"|(?P<defparens>\([ \t]*\))"
+    r"|(?P<source>(?:source|\.)[ \t]+(?P<src>\"[^\"\n]*\"|'[^'\n]*'|[^\s;&|(){}]+))"
+    r"|(?P<case>case[ \t])"
+    r"|(?P<esac>esac\b)"
+    r"|(?P<subst>\$\()"
+    r"|(?P<open>[({])"
+    r"|(?P<close>[)}])"
+    r"|(?P<other>.))",
+    re.DOTALL
+)
+
+def _chars_except(excluded):
+    """Build a character class matching any character not in excluded
+
+    The class is written as positive ranges, which the regex engine tests
+    with a bitmap; a negated class of literals is checked one literal at a
+    time and makes long runs roughly twice as slow.
+    """
+    ranges = []
+    start = 0
+    for code in sorted(set(map(ord, excluded))):
+        if code > start:
+            ranges.append((start, code - 1))
+        start = code + 1
+    ranges.append((start, 0x10FFFF))
+    return "[" + "".join(rf"\U{low:08x}-\U{high:08x}" for low, high in ranges) + "]"
+
+def _js_string(quote, guard=""):
+    """Pattern for a string literal; only template literals span lines"""
+    ends = quote + "\\" + ("" if quote == "`" else "\n")
+    return rf"{quote}{guard}(?:{_chars_except(ends)}++|\\[\s\S])*+{quote}"
+
+def _js_module_guard(quote):
+    """Lookbehinds that fail for a string right after from/require/import"""
+    return "".join(
+        rf"(?<!{keyword}{quote})" for keyword in ("from", "from ", r"require\(", "import", "import ", r"import\(")
+    )
+
+def _js_nested(open_char, close_char, atom, depth):
+    """Pattern for a bracketed span with up to depth levels of nesting"""
+    pattern = rf"\{open_char}(?:{atom})*+\{close_char}"
+    for _ in range(depth):
+        pattern = rf"\{open_char}(?:{atom}|{pattern})*+\{close_char}"
+    return pattern
+
+# JavaScript is scanned once with a master token pattern like the shell one.
+# Strings, template literals, comments, regex literals and the heads of
+# control statements are skipped inside the regex engine; only a ')' or '=>'
+# that opens a function body, a '{' after a word (a possible class body) and
+# module strings after from/require/import are returned to Python.
+_JS_STRING = "|".join(_js_string(quote) for quote in "'\"`")
+_JS_COMMENT = r"//[^\n]*+|/\*[^*]*+\*++(?:[^/*][^*]*+\*++)*+/"
+# A '/' starts a regex literal after an operator, an opening bracket or return
+_JS_REGEX = (
+    r"/(?:(?<=[=(,:\[!&|?{};]/)|(?<=[=(,:\[!&|?{};] /)|(?<=return/)|(?<=return /))"
+    r"(?![*/])(?:[^/\\\n\[]++|\\.|\[(?:[^\]\\\n]++|\\.)*+\])++/[a-z]*+"
+)
+_JS_PAREN_ATOM = rf"{_chars_except(chr(39) + chr(34) + '`()')}++|{_JS_STRING}|['\"`]"
+# 'if (', 'for (' and friends, up to the matching ')'
+_JS_CONTROL_HEAD = (
+    r"\((?<=[fhre ]\()(?:" +
+    "|".join(rf"(?<=[^\w$.]{keyword}\()|(?<=[^\w$.]{keyword} \()"
+             for keyword in ("if", "for", "while", "switch", "catch", "with")) +
+    rf")(?:{_JS_PAREN_ATOM}|{_js_nested('(', ')', _JS_PAREN_ATOM, 2)})*+\)"
+)
+
+_JS_SKIP = (
+    rf"(?:{_chars_except(chr(39) + chr(34) + '`/(){>')}++"
+    rf"|{_js_string(chr(39), _js_module_guard(chr(39)))}"
+    rf"|{_js_string(chr(34), _js_module_guard(chr(34)))}"
+    rf"|{_js_string('`')}"
+    rf"|{_JS_COMMENT}|{_JS_REGEX}|/"
+    rf"|{_JS_CONTROL_HEAD}|\("
+    r"|\)(?!\s*+(?:\{|=>))"
+    r"|\{(?<![\w$]\{)(?<![\w$]\s\{)"
+    r"|>(?<!=>))*+"
+)
+
+_JS_TOKEN = re.compile(
+    _JS_SKIP +
+    r"(?:(?P<module>'[^'\n]*+'|\"[^\"\n]*+\")"
+    r"|(?P<params>\)\s*+\{)"
+    r"|(?P<arrow_params>\)\s*+=>\s*+\{?)"
+    r"|(?P<arrow>>\s*+\{?)"
+    r"|(?P<block>\{)"
+    r"|(?P<other>.))",
+    re.DOTALL
+)
+
+# A function or class body from its '{', skipping the same literals
+_JS_BODY = re.compile(_js_nested(
+    "{", "}", rf"{_chars_except(chr(39) + chr(34) + '`/{}')}++|{_JS_STRING}|{_JS_COMMENT}|{_JS_REGEX}|/", 10
+))
+_JS_CLASS_HEAD = re.compile(rf"(?<![\w$])class\s+({_JS_NAME})(?:\s+extends\s[^{{;]*)?\s*$")
+_JS_COMMENT_LINE = re.compile(r"^[ \t]*//[^\n]*$", re.MULTILINE)
+_JS_IDENT_CHARS = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789_$"
+_JS_KEYWORDS = frozenset([
+    "if", "for", "while", "switch", "catch", "with", "function", "return", "typeof",
+    "new", "await", "yield", "in", "of", "else", "do", "void", "delete", "throw", "case",
+])
+# Characters before '=' that make it part of a comparison or compound operator
+_JS_OPERATOR_CHARS = frozenset("=!<>+-*/%&|^?:")
+
+_SH_COMMENT_LINE = re.compile(r"^[ \t]*#[^\n]*$", re.MULTILINE)
+
+_SH_NAME_CHARS = frozenset("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789_:.-")
+_SH_WORD_CHARS = _SH_NAME_CHARS | {'$'}
+_SH_COMMAND_BREAKS = frozenset(["", "\n", ";", "{", "}", "(", ")", "&", "|"])
+_SH_COMMAND_KEYWORDS = frozenset(["then", "do", "else"])
+_NAME_STARTS = frozenset("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz_$")
+
+def _fingerprint(body):
+    """Get a whitespace-insensitive fingerprint for a function body"""
+    normalized = ' '.join(body.split())
+    return format(zlib.crc32(normalized.encode('utf-8')), '08x')
+
+def _unquote(value):
+    """Strip matching quotes from a path literal"""
+    if len(value) >= 2 and value[0] == value[-1] and value[0] in '\'"':
+        return value[1:-1]
+    return value
+
+def _previous_char(content, index):
+    """Get the nearest non-blank character before index ('' at start)"""
+    while index > 0:
+        index -= 1
+        char = content[index]
+        if char not in ' \t':
+            return char
+    return ''
+
+def _name_before(content, index, name_chars, blanks=' \t'):
+    """Get (name, start) of the identifier ending just before index"""
+    end = index
+    while end > 0 and content[end - 1] in blanks:
+        end -= 1
+    start = end
+    while start > 0 and content[start - 1] in name_chars:
+        start -= 1
+    # Drop leading characters that cannot start a name (digits, '-', '.')
+    while start < end and content[start] not in _NAME_STARTS:
+        start += 1
+    if start == end:
+        return None, index
+    return content[start:end], start
+
+def _at_command_start(content, index):
+    """Check whether a shell command can start at index
+
+    True after a separator or bracket, or after a keyword such as 'then' that
+    is itself at a command start.
+    """
+    if _previous_char(content, index) in _SH_COMMAND_BREAKS:
+        return True
+    word, word_start = _name_before(content, index, _SH_NAME_CHARS)
+    return word in _SH_COMMAND_KEYWORDS and _at_command_start(content, word_start)
+
+def analyze_shell(content):
+    """Analyze a shell script in one scan
+
+    Returns a dict with 'functions' (definition order), 'imports' (sourced
+    paths) and 'fingerprints' (function name -> normalized body hash).
+    """
+    functions = []
+    imports = []
+    fingerprints = {}
+
+    stack = []  # Open brackets: 'brace', 'paren', 'subst' or 'case'
+    bodies = []  # Open function bodies: (name, stack depth, body start)
+    subst_depth = 0
+    pending = None  # Function whose body bracket comes next
+    resume = None  # End of a heredoc body, skipped once its opening line is done
+    match_token = _SH_TOKEN.match
+    pos = 0
+    limit = len(content)
+
+    while True:
+        match = match_token(content, pos, limit)
+        if match is None:
+            if resume is None:
+                break
+            pos, limit, resume = resume, len(content), None
+            continue
+        kind = match.lastgroup
+        start = match.start(kind)
+        pos = match.end()
+
+        if kind == 'other':
+            continue
+
+        if kind == 'heredoc':
+            if resume is None:
+                line_end = content.find('\n', pos)
+                if line_end != -1:
+                    delimiter = re.escape(match.group('hdelim'))
+                    end = re.compile(rf"^[ \t]*{delimiter}[ \t]*$", re.MULTILINE).search(content, line_end + 1)
+                    limit = line_end
+                    resume = end.end() if end else len(content)
+            continue
+
+        before = content[start - 1] if start else '\n'
+        if kind in ('function', 'source', 'case', 'esac') and before in _SH_WORD_CHARS:
+            # Keyword is the tail of a longer word
+            pos = start + 1
+            continue
+
+        if kind == 'function':
+            if not subst_depth:
+                name = match.group('fname')
+                functions.append(name)
+                pending = name
+            continue
+
+        if kind == 'defparens':
+            name, name_start = _name_before(content, start, _SH_NAME_CHARS)
+            if name and not subst_depth and _at_command_start(content, name_start):
+                functions.append(name)
+                pending = name
+            continue
+
+        if kind == 'source':
+            if not subst_depth and _at_command_start(content, start):
+                imports.append(_unquote(match.group('src')))
+            pending = None
+            continue
+
+        if kind == 'case':
+            if _at_command_start(content, start):
+                stack.append('case')
+        elif kind == 'esac':
+            if stack and stack[-1] == 'case':
+                stack.pop()
+        elif kind == 'subst':
+            stack.append('subst')
+            subst_depth += 1
+        elif kind == 'open':
+            stack.append('brace' if content[start] == '{' else 'paren')
+            if pending is not None:
+                bodies.append((pending, len(stack), pos))
+        else:
+            # Unmatched ')' are case patterns; ignore them
+            expected = ('brace',) if content[start] == '}' else ('paren', 'subst')
+            if stack and stack[-1] in expected:
+                if bodies and bodies[-1][1] == len(stack):
+                    name, _, body_start = bodies.pop()
+                    body = content[body_start:start]
+                    if '#' in body:
+                        body = _SH_COMMENT_LINE.sub('', body)
+                    fingerprints[name] = _fingerprint(body)
+                if stack.pop() == 'subst':
+                    subst_depth -= 1
+        pending = None
+
+    return {'functions': functions, 'imports': imports, 'fingerprints': fingerprints}
+
+def _split_name(text):
+    """Split text into (rest, identifier ending it), ignoring trailing blanks"""
+    text = text.rstrip()
+    rest = text.rstrip(_JS_IDENT_CHARS)
+    return rest, text[len(rest):]
+
+def _assigned_name(head):
+    """Get the name in a head ending with 'name =' or 'name:' (then 'async')"""
+    rest, word = _split_name(head)
+    if word == 'async':
+        rest, word = _split_name(rest)
+    if word:
+        return None
+    rest = rest.rstrip()
+    if not rest or rest[-1] not in '=:' or rest[-2:-1] in _JS_OPERATOR_CHARS:
+        return None
+    name = _split_name(rest[:-1])[1]
+    return name if name and name[0] in _NAME_STARTS else None
+
+def _open_paren(content, close):
+    """Find the '(' matching the ')' at close (-1 if there is none)"""
+    start = content.rfind('(', 0, close)
+    while start > 0 and content.count(')', start, close) >= content.count('(', start, close):
+        start = content.rfind('(', 0, start)
+    return start
+
+def analyze_javascript(content):
+    """Analyze a JavaScript file in one scan
+
+    Finds function declarations and expressions (including async, generator
+    and exported ones), arrow functions and function expressions assigned to
+    a name or property, and method shorthand in object literals and classes.
+    Class members are reported as 'Class.method'. Returns a dict with
+    'functions', 'imports' and 'fingerprints'.
+    """
+    functions = []
+    imports = []
+    fingerprints = {}
+    frames = []  # Open bodies: (end, class name or None for a function)
+    match_token = _JS_TOKEN.match
+    match_body = _JS_BODY.match
+    pos = 0
+
+    while True:
+        match = match_token(content, pos)
+        if match is None:
+            break
+        kind = match.lastgroup
+        pos = match.end()
+
+        if kind == 'other':
+            continue
+
+        if kind == 'module':
+            imports.append(match.group(kind)[1:-1])
+            continue
+
+        start = match.start(kind)
+        if kind == 'block':
+            head = content[max(0, start - 200):start]
+            keyword = head.rfind('class')
+            class_match = _JS_CLASS_HEAD.match(head, keyword) if keyword >= 0 else None
+            if class_match is None:
+                continue
+            name = class_match.group(1)
+        elif kind == 'arrow':
+            # 'name = param =>'
+            rest, param = _split_name(content[max(0, start - 200):start - 1])
+            name = _assigned_name(rest) if param else None
+        else:
+            paren = _open_paren(content, start)
+            if paren < 0:
+                continue
+            rest, word = _split_name(content[max(0, paren - 200):paren])
+            if kind == 'arrow_params':
+                # 'name = (params) =>' or 'name = async (params) =>'
+                name = _assigned_name(rest + word) if word in ('', 'async') else None
+            elif word == 'function':
+                name = _assigned_name(rest)
+            elif word in _JS_KEYWORDS:
+                name = None
+            else:
+                # Declaration, named function expression or method shorthand
+                name = word
+        if not name:
+            continue
+
+        while frames and frames[-1][0] <= start:
+            frames.pop()
+        body = match_body(content, pos - 1) if content[pos - 1] == '{' else None
+
+        if kind == 'block':
+            if body:
+                frames.append((body.end(), name))
+            continue
+
+        if frames and frames[-1][1] is not None:
+            name = f"{frames[-1][1]}.{name}"
+        functions.append(name)
+        if body:
+            text = content[pos:body.end() - 1]
+            if '//' in text:
+                text = _JS_COMMENT_LINE.sub('', text)
+            fingerprints[name] = _fingerprint(text)
+            frames.append((body.end(), None))
+
+    return {'functions': functions, 'imports': imports, 'fingerprints': fingerprints}
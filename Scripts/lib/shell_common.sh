@@ -49,7 +49,11 @@ init_logging() {
   
   # Initialize log
   echo "[$(date +"%Y-%m-%d %H:%M:%S")] INFO: Logging initialized for $SCRIPT_NAME" > "$LOG_FILE"
-  
+
+  # Record the log in the index used by VaultLogger.get_recent_logs
+  printf '{"file": "%s", "script": "%s", "created": "%s"}\n' \
+    "$(basename "$LOG_FILE")" "$SCRIPT_NAME" "$(date +"%Y-%m-%dT%H:%M:%S")" >> "$LOG_DIR/.log_index.jsonl"
+
   # Export for child processes
   export SCRIPT_LOG_FILE="$LOG_FILE"
 }
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+# tag_engine.py
+# Single-pass tag extraction and auditing for vault notes (backend for maintenance/tags.sh)
+
+import os
+import re
+import sys
+import csv
+import argparse
+
+# Try to import logger, but provide fallback if not available
+try:
+    from logger import VaultLogger
+    logger = VaultLogger("tag_engine")
+except ImportError:
+    import logging
+    logger = logging.getLogger("tag_engine")
+    logger.setLevel(logging.INFO)
+    handler = logging.StreamHandler()
+    logger.addHandler(handler)
+
+import file_utils
+import job_journal
+from file_utils import split_frontmatter, load_frontmatter
+from job_journal import JobJournal, content_hash
+
+# Vault path configuration
+VAULT_PATH = os.environ.get("VAULT_PATH", os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+# Known tag categories for standardization (kept in sync with maintenance/tags.sh)
+PRIMARY_TAGS = frozenset([
+    "interview", "research", "strategy", "compliance",
+    "active", "draft", "archived", "template", "placeholder",
+    "in-progress", "completed", "pending-review",
+])
+
+SECONDARY_TAGS = frozenset([
+    "player", "agent", "industry-professional",
+    "competitor", "market-analysis", "industry",
+    "football", "basketball", "baseball",
+    "advisor", "athlete", "coach",
+])
+
+ISSUES_HEADER = ['file_path', 'tag', 'standardized', 'issue_type']
+
+JOB_NAME = "tag_audit"
+
+# Same rules as tags.sh: lowercase, spaces and underscores become hyphens
+_TAG_SEPARATORS = str.maketrans(' _', '--')
+
+# Splits a tags string ("a, b c") into tags
+_TAG_SPLIT = re.compile(r'[\s,]+')
+
+# tags: line for frontmatter that is not valid YAML
+_TAGS_LINE = re.compile(r'^tags:[ \t]*(.*)$', re.MULTILINE)
+
+def normalize_tag(tag):
+    """Get the standardized form of a tag"""
+    return tag.lower().translate(_TAG_SEPARATORS)
+
+def tags_from_frontmatter(frontmatter_text):
+    """Get the tags declared in frontmatter text, in order"""
+    try:
+        frontmatter = load_frontmatter(frontmatter_text)
+        raw = frontmatter.get('tags') if isinstance(frontmatter, dict) else None
+    except Exception:
+        # Invalid YAML: fall back to the tags line, as tags.sh reads it
+        match = _TAGS_LINE.search(frontmatter_text)
+        raw = match.group(1).strip('[] \t').replace('"', '') if match else None
+
+    if raw is None:
+        return []
+    if isinstance(raw, (list, tuple)):
+        # Repeated standardize runs left nested lists (- - tag) in some notes
+        items = []
+        pending = list(reversed(raw))
+        while pending:
+            item = pending.pop()
+            if isinstance(item, (list, tuple)):
+                pending.extend(reversed(item))
+            elif item is not None:
+                items.append(str(item))
+    else:
+        items = _TAG_SPLIT.split(str(raw))
+    return [item.strip() for item in items if item and item.strip()]
+
+def iter_notes(root=VAULT_PATH):
+    """Yield markdown note paths under root, skipping hidden files and directories"""
+    for directory, dirs, files in os.walk(root):
+        dirs[:] = [d for d in dirs if not d.startswith('.')]
+        for name in files:
+            if name.endswith('.md') and not name.startswith('.'):
+                yield os.path.join(directory, name)
+
+def read_note_tags(path):
+    """Get the frontmatter tags of a note file ([] without frontmatter)"""
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        content = f.read()
+    frontmatter_text, _ = split_frontmatter(content)
+    if frontmatter_text is None:
+        return []
+    return tags_from_frontmatter(frontmatter_text)
+
+class TagEngine:
+    """Audits note tags against the vault taxonomy in one pass over the vault"""
+
+    def __init__(self, root=VAULT_PATH, primary_tags=PRIMARY_TAGS, secondary_tags=SECONDARY_TAGS):
+        self.root = root
+        self.taxonomy = frozenset(primary_tags) | frozenset(secondary_tags)
+        self._normalized = {}  # Raw tag -> standardized tag
+
+    def normalize(self, tag):
+        """Get the standardized form of a tag, memoized per engine"""
+        standardized = self._normalized.get(tag)
+        if standardized is None:
+            standardized = self._normalized[tag] = normalize_tag(tag)
+        return standardized
+
+    def tag_issues(self, path, tags):
+        """Get (tag, standardized, issue_type) issues for one note's tags"""
+        if not tags:
+            return [('', 'missing', 'File has no tags')]
+
+        issues = []
+        for tag in tags:
+            standardized = self.normalize(tag)
+            if tag != standardized:
+                issues.append((tag, standardized, 'formatting'))
+            if standardized not in self.taxonomy:
+                issues.append((tag, standardized, 'non-standard'))
+        return issues
+
+    def journal_version(self, issues_file):
+        """Get the job journal version for audits into issues_file
+
+        Rows depend on the taxonomy, and are carried over from the CSV at
+        issues_file, so either changing starts a fresh journal.
+        """
+        return content_hash(data='\n'.join(sorted(self.taxonomy) + [os.path.abspath(issues_file)]))
+
+    def _previous_issues(self, issues_file):
+        """Get the rows of an earlier audit's CSV by path, or None if it is missing or unreadable"""
+        try:
+            with open(issues_file, 'r', newline='', encoding='utf-8') as f:
+                reader = csv.reader(f)
+                if next(reader, None) != ISSUES_HEADER:
+                    return None
+                rows = {}
+                for row in reader:
+                    if len(row) == len(ISSUES_HEADER):
+                        rows.setdefault(row[0], []).append(row)
+                return rows
+        except OSError:
+            return None
+
+    def audit(self, issues_file, journal=None):
+        """Write the tag issues CSV for every note; returns audit counts
+
+        Rows match the CSV tags.sh wrote, so standardize can consume it.
+
+        With a job_journal.JobJournal (see journal_version), notes unchanged
+        since an earlier audit are not read again: their rows are copied
+        from the CSV that audit wrote. The CSV is replaced atomically and
+        notes are only marked done once it is in place, so the journal never
+        gets ahead of it.
+        """
+        stats = {'files_processed': 0, 'files_with_issues': 0, 'tag_issues': 0, 'unreadable': 0, 'unchanged': 0}
+        os.makedirs(os.path.dirname(os.path.abspath(issues_file)), exist_ok=True)
+
+        previous = None
+        if journal is not None:
+            previous = self._previous_issues(issues_file)
+            if previous is None and journal.entries:
+                journal.reset()  # Rows of the journaled notes are gone
+
+        read = []  # Notes read this run, marked done once the CSV is written
+        temp_path = issues_file + '.tmp'
+        with open(temp_path, 'w', newline='', encoding='utf-8', buffering=1 << 16) as f:
+            writer = csv.writer(f, lineterminator='\n')
+            writer.writerow(ISSUES_HEADER)
+            for path in iter_notes(self.root):
+                stats['files_processed'] += 1
+                if previous is not None and journal.is_current(path):
+                    stats['unchanged'] += 1
+                    issues = [tuple(row[1:]) for row in previous.get(path, ())]
+                else:
+                    try:
+                        tags = read_note_tags(path)
+                    except OSError as e:
+                        stats['unreadable'] += 1
+                        logger.warning(f"Cannot read {path}: {str(e)}")
+                        continue
+                    issues = self.tag_issues(path, tags)
+                    read.append(path)
+
+                if issues:
+                    stats['files_with_issues'] += 1
+                    stats['tag_issues'] += len(issues)
+                    writer.writerows((path,) + issue for issue in issues)
+        os.replace(temp_path, issues_file)
+
+        if journal is not None:
+            for path in read:
+                journal.mark_done(path)
+            if stats['unchanged']:
+                logger.info(f"Reused the issues of {stats['unchanged']} unchanged notes")
+        return stats
+
+def main():
+    parser = argparse.ArgumentParser(description="Vault Tag Engine")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    audit_parser = subparsers.add_parser('audit', help='Write the tag issues CSV')
+    audit_parser.add_argument('--root', default=VAULT_PATH, help='Vault root to scan')
+    audit_parser.add_argument('--issues-file', required=True, help='Tag issues CSV to write')
+    audit_parser.add_argument('--no-cache', action='store_true', help='Re-read notes unchanged since the last audit')
+
+    args = parser.parse_args()
+
+    # stdout carries only the summary line (parsed by tags.sh)
+    for module_logger in (logger, file_utils.logger, job_journal.logger):
+        if hasattr(module_logger, 'set_console_stream'):
+            module_logger.set_console_stream(sys.stderr)
+
+    if args.command == 'audit':
+        engine = TagEngine(args.root)
+        journal = None if args.no_cache else JobJournal(JOB_NAME, version=engine.journal_version(args.issues_file))
+        try:
+            stats = engine.audit(args.issues_file, journal)
+        finally:
+            if journal is not None:
+                journal.close()
+        # Last line is read by tags.sh
+        print(f"{stats['files_processed']} {stats['files_with_issues']} {stats['tag_issues']}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+# tag_index.py
+# Persistent inverted tag index (tag -> note postings) maintained incrementally
+
+import os
+import sys
+import csv
+import json
+import argparse
+import tempfile
+from collections import Counter
+
+# Try to import logger, but provide fallback if not available
+try:
+    from logger import VaultLogger
+    logger = VaultLogger("tag_index")
+except ImportError:
+    import logging
+    logger = logging.getLogger("tag_index")
+    logger.setLevel(logging.INFO)
+    handler = logging.StreamHandler()
+    logger.addHandler(handler)
+
+import tag_engine
+from tag_engine import iter_notes, read_note_tags, normalize_tag
+
+# Vault path configuration
+VAULT_PATH = os.environ.get("VAULT_PATH", os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+INDEX_PATH = os.path.join(VAULT_PATH, "System/Configuration/tag_index.json")
+
+INDEX_VERSION = 1
+
+class TagIndex:
+    """Inverted index from standardized tags to the notes that use them
+
+    Notes get integer IDs; each tag maps to a set of note IDs (its postings),
+    and each note keeps (mtime_ns, size, tags). refresh() stats the vault and
+    re-reads only new or changed notes, and update() re-indexes given paths
+    (e.g. from a file watcher), so queries never rescan note contents. The
+    index is saved as JSON only when it changed; loaded is False when there
+    was no usable saved index.
+    """
+
+    def __init__(self, root=VAULT_PATH, index_path=INDEX_PATH):
+        self.root = os.path.abspath(root)
+        self.index_path = index_path
+        self.paths = []  # Note ID -> vault-relative path (None once removed)
+        self.ids = {}  # Vault-relative path -> note ID
+        self.notes = {}  # Note ID -> (mtime_ns, size, tags)
+        self.postings = {}  # Tag -> set of note IDs
+        self.dirty = False
+        self.loaded = self.load()
+
+    def load(self):
+        """Load the saved index, if it matches this vault root"""
+        if not os.path.exists(self.index_path):
+            return False
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') != INDEX_VERSION or data.get('root') != self.root:
+                logger.info(f"Tag index {self.index_path} is for another vault or version, rebuilding")
+                return False
+            self.paths = data['paths']
+            self.ids = {path: note_id for note_id, path in enumerate(self.paths) if path is not None}
+            self.notes = {int(note_id): tuple(note) for note_id, note in data['notes'].items()}
+            self.postings = {tag: set(ids) for tag, ids in data['postings'].items()}
+            return True
+        except Exception as e:
+            logger.error(f"Error loading tag index: {str(e)}")
+            self.paths, self.ids, self.notes, self.postings = [], {}, {}, {}
+            return False
+
+    def save(self):
+        """Write the index atomically if it changed"""
+        if not self.dirty:
+            return True
+        try:
+            # Drop IDs of removed notes once they dominate
+            if len(self.paths) > 2 * len(self.ids) + 100:
+                self._renumber()
+            data = {
+                'version': INDEX_VERSION,
+                'root': self.root,
+                'paths': self.paths,
+                'notes': {str(note_id): list(note) for note_id, note in self.notes.items()},
+                'postings': {tag: sorted(ids) for tag, ids in self.postings.items()},
+            }
+            directory = os.path.dirname(os.path.abspath(self.index_path))
+            os.makedirs(directory, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(prefix=".tag_index.", suffix='.tmp', dir=directory)
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(data, f, separators=(',', ':'))
+            os.replace(temp_path, self.index_path)
+            self.dirty = False
+            return True
+        except Exception as e:
+            logger.error(f"Error saving tag index: {str(e)}")
+            return False
+
+    def _renumber(self):
+        """Assign dense note IDs, dropping removed notes"""
+        remap = {}
+        paths = []
+        for old_id, path in enumerate(self.paths):
+            if path is not None:
+                remap[old_id] = len(paths)
+                paths.append(path)
+        self.paths = paths
+        self.ids = {path: note_id for note_id, path in enumerate(paths)}
+        self.notes = {remap[note_id]: note for note_id, note in self.notes.items()}
+        self.postings = {tag: {remap[i] for i in ids} for tag, ids in self.postings.items()}
+
+    def _remove(self, rel_path):
+        note_id = self.ids.pop(rel_path, None)
+        if note_id is None:
+            return
+        _, _, tags = self.notes.pop(note_id)
+        for tag in tags:
+            postings = self.postings.get(tag)
+            if postings is not None:
+                postings.discard(note_id)
+                if not postings:
+                    del self.postings[tag]
+        self.paths[note_id] = None
+        self.dirty = True
+
+    def _index(self, rel_path, stat):
+        """Re-read one note's tags and update its postings"""
+        self._remove(rel_path)
+        try:
+            tags = sorted({normalize_tag(tag) for tag in read_note_tags(os.path.join(self.root, rel_path))})
+        except OSError as e:
+            logger.warning(f"Cannot read {rel_path}: {str(e)}")
+            return
+        note_id = len(self.paths)
+        self.paths.append(rel_path)
+        self.ids[rel_path] = note_id
+        self.notes[note_id] = (stat.st_mtime_ns, stat.st_size, tags)
+        for tag in tags:
+            self.postings.setdefault(tag, set()).add(note_id)
+        self.dirty = True
+
+    def refresh(self):
+        """Bring the index up to date with the vault; returns notes re-read"""
+        seen = set()
+        changed = 0
+        for path in iter_notes(self.root):
+            rel_path = os.path.relpath(path, self.root)
+            seen.add(rel_path)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            note_id = self.ids.get(rel_path)
+            if note_id is not None:
+                mtime_ns, size, _ = self.notes[note_id]
+                if mtime_ns == stat.st_mtime_ns and size == stat.st_size:
+                    continue
+            self._index(rel_path, stat)
+            changed += 1
+
+        for rel_path in [p for p in self.ids if p not in seen]:
+            self._remove(rel_path)
+            changed += 1
+
+        if changed:
+            logger.debug(f"Tag index refreshed: {changed} notes changed")
+        return changed
+
+    def update(self, paths):
+        """Re-index specific notes (created, modified or deleted paths)"""
+        for path in paths:
+            path = os.path.abspath(path)
+            rel_path = os.path.relpath(path, self.root)
+            if not path.endswith('.md') or rel_path.startswith('..'):
+                continue
+            try:
+                stat = os.stat(path)
+            except OSError:
+                self._remove(rel_path)
+                continue
+            self._index(rel_path, stat)
+
+    def files_with_tag(self, tag):
+        """Get the absolute paths of notes with a tag"""
+        ids = self.postings.get(normalize_tag(tag), ())
+        return sorted(os.path.join(self.root, self.paths[i]) for i in ids)
+
+    def files_with_all(self, tags):
+        """Get the absolute paths of notes that have every given tag"""
+        sets = sorted((self.postings.get(normalize_tag(t), set()) for t in tags), key=len)
+        ids = set.intersection(*sets) if sets else set()
+        return sorted(os.path.join(self.root, self.paths[i]) for i in ids)
+
+    def tag_counts(self):
+        """Get (tag, note count) pairs, most used first"""
+        return sorted(((tag, len(ids)) for tag, ids in self.postings.items()), key=lambda item: (-item[1], item[0]))
+
+    def co_occurring(self, tag, limit=None):
+        """Get (tag, shared note count) for tags used alongside a tag"""
+        tag = normalize_tag(tag)
+        counts = Counter()
+        for note_id in self.postings.get(tag, ()):
+            counts.update(self.notes[note_id][2])
+        counts.pop(tag, None)
+        return counts.most_common(limit)
+
+    def stats(self):
+        """Get summary statistics for reports"""
+        untagged = sum(1 for _, _, tags in self.notes.values() if not tags)
+        return {
+            'notes': len(self.notes),
+            'tags': len(self.postings),
+            'untagged_notes': untagged,
+            'tag_assignments': sum(len(ids) for ids in self.postings.values()),
+        }
+
+    def write_inventory(self, inventory_file):
+        """Write the tag inventory CSV (tag, count, |-joined files)"""
+        os.makedirs(os.path.dirname(os.path.abspath(inventory_file)), exist_ok=True)
+        with open(inventory_file, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f, lineterminator='\n')
+            writer.writerow(['tag', 'count', 'files'])
+            for tag, count in self.tag_counts():
+                writer.writerow([tag, count, '|'.join(self.files_with_tag(tag))])
+
+def main():
+    parser = argparse.ArgumentParser(description="Vault Tag Index")
+    parser.add_argument('--root', default=VAULT_PATH, help='Vault root to index')
+    parser.add_argument('--index-file', default=INDEX_PATH, help='Index file to load and update')
+    parser.add_argument('--no-refresh', action='store_true',
+                        help='Answer queries from the saved index without checking notes for changes')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    subparsers.add_parser('refresh', help='Update the index from changed notes; prints the count')
+    list_parser = subparsers.add_parser('list', help='Print "tag count" lines, most used first')
+    list_parser.add_argument('--inventory-file', help='Also write the tag inventory CSV')
+    find_parser = subparsers.add_parser('find', help='Print notes with all of the given tags')
+    find_parser.add_argument('tags', nargs='+')
+    related_parser = subparsers.add_parser('related', help='Print "tag count" for co-occurring tags')
+    related_parser.add_argument('tag')
+    related_parser.add_argument('--limit', type=int, default=20)
+    subparsers.add_parser('stats', help='Print "name value" index statistics')
+
+    args = parser.parse_args()
+
+    # stdout carries only query results (parsed by tags.sh)
+    for engine_logger in (logger, tag_engine.logger):
+        if hasattr(engine_logger, 'set_console_stream'):
+            engine_logger.set_console_stream(sys.stderr)
+
+    # Queries first re-read notes whose stat changed (the index is only written
+    # when something did), unless --no-refresh trusts the saved index
+    index = TagIndex(args.root, args.index_file)
+    if args.command == 'refresh' or not args.no_refresh or not index.loaded:
+        changed = index.refresh()
+        if not index.save():
+            return 1
+        if args.command == 'refresh':
+            print(changed)
+
+    if args.command == 'list':
+        if args.inventory_file:
+            index.write_inventory(args.inventory_file)
+        for tag, count in index.tag_counts():
+            print(f"{tag} {count}")
+    elif args.command == 'find':
+        for path in index.files_with_all(args.tags):
+            print(path)
+    elif args.command == 'related':
+        for tag, count in index.co_occurring(args.tag, args.limit):
+            print(f"{tag} {count}")
+    elif args.command == 'stats':
+        for name, value in index.stats().items():
+            print(f"{name} {value}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
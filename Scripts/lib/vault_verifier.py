@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+# vault_verifier.py
+# One-pass vault integrity verification with pluggable checks (backend for maintenance/verify.sh)
+
+import os
+import re
+import sys
+import csv
+import argparse
+from datetime import date
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+# Try to import logger, but provide fallback if not available
+try:
+    from logger import VaultLogger
+    logger = VaultLogger("vault_verifier")
+except ImportError:
+    import logging
+    logger = logging.getLogger("vault_verifier")
+    logger.setLevel(logging.INFO)
+    handler = logging.StreamHandler()
+    logger.addHandler(handler)
+
+from file_utils import split_frontmatter
+from tag_engine import TagEngine, iter_notes, tags_from_frontmatter
+
+# Vault path configuration
+VAULT_PATH = os.environ.get("VAULT_PATH", os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+# Expected top-level directories
+EXPECTED_DIRECTORIES = ("atlas", "content", "resources", "docs", "scripts", "_utilities")
+
+REQUIRED_FIELDS = ('title', 'date_created', 'date_modified', 'status', 'tags')
+
+Issue = namedtuple('Issue', ['check', 'path', 'kind', 'detail'])
+
+# Checks by name, in report order; see register_check
+CHECKS = {}
+
+_WIKI_LINK = re.compile(r'\[\[([^\]]*)\]\]')
+_LINK_TARGET_END = re.compile(r'[|#]')
+_FIELD_LINE = re.compile(r'^(' + '|'.join(REQUIRED_FIELDS) + r'):', re.MULTILINE)
+
+def link_targets(content):
+    """Yield (link, target) for every wiki link in note content"""
+    if '[[' not in content:
+        return
+    for match in _WIKI_LINK.finditer(content):
+        yield match.group(0), _LINK_TARGET_END.split(match.group(1), 1)[0]
+
+class Note:
+    """A note read once and shared by every check"""
+
+    __slots__ = ('path', 'rel_path', 'content', 'frontmatter_text', 'frontmatter_state')
+
+    def __init__(self, path, root):
+        self.path = path
+        self.rel_path = os.path.relpath(path, root)
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            self.content = f.read()
+        self.frontmatter_text, _ = split_frontmatter(self.content)
+        if self.frontmatter_text is not None:
+            self.frontmatter_state = 'ok'
+        elif self.content.startswith('---'):
+            self.frontmatter_state = 'invalid'
+        else:
+            self.frontmatter_state = 'missing'
+
+class VaultCheck:
+    """Base class for verification checks
+
+    check_note is called once per note (possibly in a worker process) and
+    check_vault once per run for vault-level rules. Both return Issues.
+    Subclasses are registered with @register_check; checks defined in other
+    modules must be registered before verify_vault starts its workers.
+    """
+
+    name = None
+    title = None
+
+    def __init__(self, root, files):
+        self.root = root
+        self.files = files  # Vault-relative paths of every file
+
+    def check_note(self, note):
+        return []
+
+    def check_vault(self):
+        return []
+
+    def issue(self, path, kind, detail=''):
+        return Issue(self.name, path, kind, detail)
+
+def register_check(cls):
+    """Class decorator that makes a check available to verify_vault"""
+    CHECKS[cls.name] = cls
+    return cls
+
+@register_check
+class StructureCheck(VaultCheck):
+    """Expected top-level directories, index.md and README files"""
+
+    name = 'structure'
+    title = 'Structure'
+
+    def check_vault(self):
+        issues = []
+        for directory in EXPECTED_DIRECTORIES:
+            if not os.path.isdir(os.path.join(self.root, directory)):
+                issues.append(self.issue(directory, 'missing_directory', f"Missing expected directory: {directory}"))
+            elif f"{directory}/README.md" not in self.files:
+                issues.append(self.issue(directory, 'missing_readme', f"Missing README.md file in {directory} directory"))
+        if 'index.md' not in self.files:
+            issues.append(self.issue('index.md', 'missing_index', "Missing index.md file at vault root"))
+        return issues
+
+@register_check
+class LinkCheck(VaultCheck):
+    """Wiki links whose target file does not exist"""
+
+    name = 'links'
+    title = 'Link'
+
+    def check_note(self, note):
+        issues = []
+        for link, target in link_targets(note.content):
+            if not target or target in self.files or f"{target}.md" in self.files:
+                continue
+            issues.append(self.issue(note.rel_path, 'file_not_found',
+                                     f"Broken link in {note.rel_path}: {link} (target file not found)"))
+        return issues
+
+@register_check
+class FrontmatterCheck(VaultCheck):
+    """Missing or unclosed frontmatter and missing standard fields"""
+
+    name = 'frontmatter'
+    title = 'Frontmatter'
+
+    def check_note(self, note):
+        if note.frontmatter_state == 'missing':
+            return [self.issue(note.rel_path, 'missing_frontmatter', f"Missing frontmatter in {note.rel_path}")]
+        if note.frontmatter_state == 'invalid':
+            return [self.issue(note.rel_path, 'invalid_frontmatter',
+                               f"Invalid frontmatter in {note.rel_path} (missing closing ---)")]
+
+        present = set(_FIELD_LINE.findall(note.frontmatter_text))
+        return [
+            self.issue(note.rel_path, f"missing_{field}", f"Missing {field} field in {note.rel_path}")
+            for field in REQUIRED_FIELDS if field not in present
+        ]
+
+@register_check
+class TagCheck(VaultCheck):
+    """Tags that are badly formatted or outside the taxonomy"""
+
+    name = 'tags'
+    title = 'Tag'
+
+    def __init__(self, root, files):
+        super().__init__(root, files)
+        self.engine = TagEngine(root)
+
+    def check_note(self, note):
+        if note.frontmatter_text is None:
+            return []
+        tags = tags_from_frontmatter(note.frontmatter_text)
+        if not tags:
+            return [self.issue(note.rel_path, 'missing_tags', f"Missing tags in {note.rel_path}")]
+
+        issues = []
+        for tag, standardized, issue_type in self.engine.tag_issues(note.rel_path, tags):
+            if issue_type == 'formatting':
+                detail = f"Badly formatted tag in {note.rel_path}: {tag} (should be {standardized})"
+            else:
+                detail = f"Non-standard tag in {note.rel_path}: {tag} (not in the tag taxonomy)"
+            issues.append(self.issue(note.rel_path, 'invalid_tag', detail))
+        return issues
+
+def _list_files(root):
+    """Get vault-relative paths of all non-hidden files"""
+    files = set()
+    for directory, dirs, names in os.walk(root):
+        dirs[:] = [d for d in dirs if not d.startswith('.')]
+        rel_dir = os.path.relpath(directory, root)
+        for name in names:
+            files.add(name if rel_dir == '.' else f"{rel_dir}/{name}")
+    return files
+
+# Per-process checks used by _verify_chunk
+_worker_checks = None
+_worker_root = None
+
+def _init_worker(root, names, files):
+    global _worker_checks, _worker_root
+    _worker_root = root
+    _worker_checks = [CHECKS[name](root, files) for name in names]
+
+def _verify_chunk(paths):
+    """Read each note once and run every note-level check on it"""
+    issues = []
+    unreadable = []
+    for path in paths:
+        try:
+            note = Note(path, _worker_root)
+        except OSError as e:
+            unreadable.append((path, str(e)))
+            continue
+        for check in _worker_checks:
+            issues.extend(check.check_note(note))
+    return len(paths), issues, unreadable
+
+def verify_vault(root=VAULT_PATH, checks=None, workers=None, chunk_size=64):
+    """Run checks over the vault in one read per note; returns (issues by check, notes read)"""
+    names = list(checks or CHECKS)
+    unknown = [name for name in names if name not in CHECKS]
+    if unknown:
+        raise ValueError(f"Unknown checks: {', '.join(unknown)} (available: {', '.join(CHECKS)})")
+
+    files = _list_files(root)
+    paths = list(iter_notes(root))
+    chunks = [paths[i:i + chunk_size] for i in range(0, len(paths), chunk_size)]
+    results = {name: [] for name in names}
+    notes_read = 0
+
+    def _collect(outcome):
+        nonlocal notes_read
+        count, issues, unreadable = outcome
+        notes_read += count - len(unreadable)
+        for issue in issues:
+            results[issue.check].append(issue)
+        for path, error in unreadable:
+            logger.warning(f"Cannot read {path}: {error}")
+
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1 or len(chunks) <= 1:
+        _init_worker(root, names, files)
+        for chunk in chunks:
+            _collect(_verify_chunk(chunk))
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(root, names, files)) as pool:
+            for outcome in pool.map(_verify_chunk, chunks):
+                _collect(outcome)
+
+    for name in names:
+        results[name].extend(CHECKS[name](root, files).check_vault())
+    return results, notes_read
+
+def write_issues(path, results):
+    """Write every issue to a CSV file"""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f, lineterminator='\n')
+        writer.writerow(['check', 'file', 'issue', 'detail'])
+        for issues in results.values():
+            writer.writerows((i.check, i.path, i.kind, i.detail) for i in issues)
+
+def write_report(path, results, notes_read, detailed=False):
+    """Write the combined markdown verification report"""
+    today = date.today().isoformat()
+    lines = [
+        "---",
+        'title: "Vault Verification Report"',
+        f"date_created: {today}",
+        f"date_modified: {today}",
+        "status: active",
+        "tags: [documentation, system, verification, report]",
+        "---",
+        "",
+        "# Vault Verification Report",
+        "",
+        "This report provides an overview of the verification results for the Athlete Financial Empowerment vault.",
+        "",
+        "## Summary",
+        "",
+        f"This report was generated on {today} from a single pass over {notes_read} notes.",
+        "",
+    ]
+    for name, issues in results.items():
+        title = CHECKS[name].title or name.title()
+        lines += [f"## {title} Verification", ""]
+        if not issues:
+            lines += [f"✅ **{title} verification passed**", "", "No issues found.", ""]
+            continue
+        lines += [f"❌ **{title} verification failed**", "", f"Found {len(issues)} {title.lower()} issue(s):", ""]
+        if detailed:
+            lines += [f"- {issue.detail}" for issue in issues]
+        else:
+            lines.append("Run with --detailed for issue details.")
+        lines.append("")
+
+    total = sum(len(issues) for issues in results.values())
+    lines += ["## Overall Results", ""]
+    if total == 0:
+        lines += ["✅ **All verification checks passed**", "", "The vault is in good condition with no detected issues."]
+    else:
+        lines += [f"❌ **Verification checks failed**", "", f"Found a total of {total} issue(s):"]
+        lines += [f"- {CHECKS[name].title or name.title()} Issues: {len(issues)}" for name, issues in results.items()]
+        lines += [
+            "",
+            "## Recommendations",
+            "",
+            "1. Fix frontmatter issues with `./scripts/maintenance.sh standardize-yaml`",
+            "2. Fix broken links with `./scripts/maintenance.sh fix-links`",
+            "3. Standardize tags with `./scripts/maintenance.sh standardize-tags`",
+            "4. Add missing directories and files for proper structure",
+        ]
+    lines += ["", "---", "", f"*Report generated: {today}*", ""]
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(lines))
+
+def main():
+    parser = argparse.ArgumentParser(description="Vault Integrity Verifier")
+    parser.add_argument('--root', default=VAULT_PATH, help='Vault root to verify')
+    parser.add_argument('--checks', help=f"Comma-separated checks (default: {','.join(CHECKS)})")
+    parser.add_argument('--workers', type=int, help='Worker processes (default: CPU count)')
+    parser.add_argument('--issues-file', help='Write all issues to this CSV file')
+    parser.add_argument('--report', help='Write a markdown report to this file')
+    parser.add_argument('--detailed', action='store_true', help='List every issue in the report')
+    args = parser.parse_args()
+
+    checks = [name.strip() for name in args.checks.split(',')] if args.checks else None
+    try:
+        results, notes_read = verify_vault(args.root, checks, args.workers)
+    except ValueError as e:
+        logger.error(str(e))
+        return 2
+
+    if args.issues_file:
+        write_issues(args.issues_file, results)
+    if args.report:
+        write_report(args.report, results, notes_read, args.detailed)
+
+    # Summary lines are read by verify.sh
+    print(f"NOTES {notes_read}")
+    for name, issues in results.items():
+        print(f"SUMMARY {name} {len(issues)}")
+    return 1 if any(results.values()) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
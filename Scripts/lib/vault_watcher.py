@@ -0,0 +1,476 @@
+#!/usr/bin/env python3
+# vault_watcher.py
+# Long-running maintenance watcher: incremental frontmatter, tag and link checks on changed notes
+
+import os
+import sys
+import json
+import time
+import errno
+import ctypes
+import ctypes.util
+import select
+import signal
+import socket
+import struct
+import argparse
+import threading
+import socketserver
+from datetime import datetime
+
+# Try to import logger, but provide fallback if not available
+try:
+    from logger import VaultLogger
+    logger = VaultLogger("vault_watcher")
+except ImportError:
+    import logging
+    logger = logging.getLogger("vault_watcher")
+    logger.setLevel(logging.INFO)
+    handler = logging.StreamHandler()
+    logger.addHandler(handler)
+
+from tag_index import TagIndex, INDEX_PATH
+from vault_verifier import CHECKS, Note, link_targets
+
+# Vault path configuration
+VAULT_PATH = os.environ.get("VAULT_PATH", os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+SOCKET_PATH = os.path.join(VAULT_PATH, "System/Configuration/vault_watcher.sock")
+
+WATCH_CHECKS = ('frontmatter', 'tags', 'links')
+
+# Returned by an event source when it lost events and the vault must be rescanned
+RESCAN = object()
+
+# inotify(7) constants
+_IN_ATTRIB = 0x00000004
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_DELETE_SELF = 0x00000400
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_ISDIR = 0x40000000
+_WATCH_MASK = _IN_ATTRIB | _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE | _IN_DELETE_SELF
+_EVENT_HEADER = struct.Struct('iIII')
+
+def _is_hidden(rel_path):
+    return any(part.startswith('.') for part in rel_path.split(os.sep))
+
+def _link_key(rel_path):
+    """Get the link target that resolves to a vault file (notes without .md)"""
+    return rel_path[:-3] if rel_path.endswith('.md') else rel_path
+
+def _walk_files(root):
+    """Yield absolute paths of all non-hidden files under root"""
+    for directory, dirs, names in os.walk(root):
+        dirs[:] = [d for d in dirs if not d.startswith('.')]
+        for name in names:
+            if not name.startswith('.'):
+                yield os.path.join(directory, name)
+
+class InotifySource:
+    """Change events from Linux inotify, watching every non-hidden directory"""
+
+    mode = 'inotify'
+
+    def __init__(self, root):
+        self._libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self._libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self.root = root
+        self.fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, f"inotify_init1 failed: {os.strerror(error)}")
+        self.directories = {}  # Watch descriptor -> directory
+        self._watch_tree(root)
+
+    def _watch_tree(self, top):
+        """Watch top and its subdirectories; returns files already inside them"""
+        found = []
+        for directory, dirs, names in os.walk(top):
+            dirs[:] = [d for d in dirs if not d.startswith('.')]
+            wd = self._libc.inotify_add_watch(self.fd, os.fsencode(directory), _WATCH_MASK)
+            if wd < 0:
+                error = ctypes.get_errno()
+                if error == errno.ENOSPC:
+                    raise OSError(error, "inotify watch limit reached (fs.inotify.max_user_watches)")
+                logger.warning(f"Cannot watch {directory}: {os.strerror(error)}")
+                continue
+            self.directories[wd] = directory
+            found.extend(os.path.join(directory, name) for name in names if not name.startswith('.'))
+        return found
+
+    def wait(self, timeout):
+        """Get the set of changed paths within timeout seconds, or RESCAN"""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return set()
+
+        changed = set()
+        while True:
+            try:
+                data = os.read(self.fd, 1 << 16)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+                offset += _EVENT_HEADER.size
+                name = os.fsdecode(data[offset:offset + length].rstrip(b'\0'))
+                offset += length
+
+                if mask & _IN_Q_OVERFLOW:
+                    return RESCAN
+                if mask & _IN_IGNORED:
+                    self.directories.pop(wd, None)
+                    continue
+                directory = self.directories.get(wd)
+                if directory is None or not name or name.startswith('.'):
+                    continue
+                path = os.path.join(directory, name)
+                if mask & _IN_ISDIR:
+                    if mask & (_IN_CREATE | _IN_MOVED_TO):
+                        # Files can land in a new directory before its watch exists
+                        changed.update(self._watch_tree(path))
+                    elif mask & _IN_MOVED_FROM:
+                        # Watches follow the moved directory; its notes are gone from here
+                        return RESCAN
+                    continue
+                changed.add(path)
+        return changed
+
+    def close(self):
+        os.close(self.fd)
+
+class PollingSource:
+    """Change events by comparing (mtime, size) snapshots of the vault"""
+
+    mode = 'polling'
+
+    def __init__(self, root, interval=2.0):
+        self.root = root
+        self.interval = interval
+        self.snapshot = self._scan()
+        self.next_scan = time.monotonic() + interval
+
+    def _scan(self):
+        snapshot = {}
+        for path in _walk_files(self.root):
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            snapshot[path] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+
+    def wait(self, timeout):
+        """Get the set of changed paths, scanning at most every interval seconds"""
+        delay = self.next_scan - time.monotonic()
+        if delay > timeout:
+            time.sleep(timeout)
+            return set()
+        time.sleep(max(0.0, delay))
+        self.next_scan = time.monotonic() + self.interval
+        snapshot = self._scan()
+        changed = {path for path, state in snapshot.items() if self.snapshot.get(path) != state}
+        changed.update(path for path in self.snapshot if path not in snapshot)
+        self.snapshot = snapshot
+        return changed
+
+    def close(self):
+        pass
+
+def open_source(root, poll=False, interval=2.0):
+    """Get an inotify event source, or a polling one where inotify is unavailable"""
+    if not poll and sys.platform.startswith('linux'):
+        try:
+            return InotifySource(root)
+        except (OSError, AttributeError) as e:
+            logger.warning(f"inotify unavailable, falling back to polling: {str(e)}")
+    return PollingSource(root, interval)
+
+class VaultWatcher:
+    """Keeps note checks, a backlink map and the tag index warm for a vault
+
+    Changed paths are debounced: a batch is processed once no event has
+    arrived for `debounce` seconds (or `max_delay` after its first event).
+    Each batch re-checks only the changed notes, plus the notes linking to
+    files that were created or deleted, since their links changed validity.
+    """
+
+    def __init__(self, root=VAULT_PATH, checks=WATCH_CHECKS, index_path=INDEX_PATH, debounce=0.5, max_delay=5.0):
+        self.root = os.path.abspath(root)
+        self.check_names = tuple(checks)
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self.lock = threading.Lock()
+        self.stopped = threading.Event()
+        self.rescan_requested = threading.Event()
+        self.index_path = index_path
+        self.mode = None
+        self.started = datetime.now().isoformat(timespec='seconds')
+        self.events = 0
+        self.batches = 0
+        self.last_batch = None
+        self.pending = set()
+        self._full_scan()
+
+    def _full_scan(self):
+        """Build every in-memory index from scratch"""
+        start = time.perf_counter()
+        files = {os.path.relpath(path, self.root) for path in _walk_files(self.root)}
+        with self.lock:
+            self.files = files  # Shared with the checks, so link checks see file changes
+            self.checks = [CHECKS[name](self.root, self.files) for name in self.check_names]
+            self.issues = {}  # Note -> issues
+            self.outgoing = {}  # Note -> link keys it targets
+            self.backlinks = {}  # Link key -> notes that target it
+            for rel_path in files:
+                if rel_path.endswith('.md'):
+                    self._check_note(rel_path)
+        self.tag_index = TagIndex(self.root, self.index_path)
+        self.tag_index.refresh()
+        self.tag_index.save()
+        logger.info(f"Indexed {len(self.outgoing)} notes in {time.perf_counter() - start:.2f}s: "
+                    f"{sum(len(i) for i in self.issues.values())} issues")
+
+    def _unlink_note(self, rel_path):
+        for key in self.outgoing.pop(rel_path, ()):
+            notes = self.backlinks.get(key)
+            if notes is not None:
+                notes.discard(rel_path)
+                if not notes:
+                    del self.backlinks[key]
+        self.issues.pop(rel_path, None)
+
+    def _check_note(self, rel_path):
+        """Re-run every check on one note and update its links (lock held)"""
+        self._unlink_note(rel_path)
+        try:
+            note = Note(os.path.join(self.root, rel_path), self.root)
+        except OSError:
+            return False
+        keys = {_link_key(target) for _, target in link_targets(note.content) if target}
+        self.outgoing[rel_path] = keys
+        for key in keys:
+            self.backlinks.setdefault(key, set()).add(rel_path)
+        issues = [issue for check in self.checks for issue in check.check_note(note)]
+        if issues:
+            self.issues[rel_path] = issues
+        return True
+
+    def process(self, paths):
+        """Apply a debounced batch of changed absolute paths; returns notes checked"""
+        start = time.perf_counter()
+        changed_notes = set()
+        affected = set()
+        with self.lock:
+            for path in paths:
+                rel_path = os.path.relpath(path, self.root)
+                if rel_path.startswith('..') or _is_hidden(rel_path):
+                    continue
+                exists = os.path.isfile(path)
+                if exists != (rel_path in self.files):
+                    # Created or deleted: links to it changed validity
+                    (self.files.add if exists else self.files.discard)(rel_path)
+                    affected.update(self.backlinks.get(_link_key(rel_path), ()))
+                if rel_path.endswith('.md'):
+                    changed_notes.add(rel_path)
+
+            affected |= changed_notes
+            for rel_path in affected:
+                if not self._check_note(rel_path):
+                    self._unlink_note(rel_path)
+            issue_count = sum(len(self.issues.get(rel_path, ())) for rel_path in affected)
+
+        if not affected:
+            return 0
+        self.tag_index.update(os.path.join(self.root, rel_path) for rel_path in changed_notes)
+        self.tag_index.save()
+
+        duration = time.perf_counter() - start
+        self.batches += 1
+        self.last_batch = {
+            'time': datetime.now().isoformat(timespec='seconds'),
+            'changed': len(changed_notes),
+            'checked': len(affected),
+            'issues': issue_count,
+            'duration_s': round(duration, 4),
+        }
+        logger.info(f"Checked {len(affected)} notes ({len(changed_notes)} changed, "
+                    f"{len(affected) - len(changed_notes)} backlinking) in {duration:.3f}s: {issue_count} issues")
+        for rel_path in sorted(affected):
+            for issue in self.issues.get(rel_path, ()):
+                logger.debug(issue.detail)
+        return len(affected)
+
+    def run(self, source):
+        """Consume events from source until stop() is called"""
+        self.mode = source.mode
+        deadline = first_event = None
+        while not self.stopped.is_set():
+            if self.rescan_requested.is_set():
+                self.rescan_requested.clear()
+                self._full_scan()
+                self.pending.clear()
+                deadline = None
+
+            timeout = 1.0 if deadline is None else max(0.0, min(1.0, deadline - time.monotonic()))
+            changed = source.wait(timeout)
+            if changed is RESCAN:
+                logger.warning("Change events were lost, rescanning the vault")
+                self.rescan_requested.set()
+                continue
+            if changed:
+                now = time.monotonic()
+                self.events += len(changed)
+                self.pending |= changed
+                first_event = first_event or now
+                deadline = min(now + self.debounce, first_event + self.max_delay)
+
+            if deadline is not None and time.monotonic() >= deadline:
+                batch, self.pending = self.pending, set()
+                deadline = first_event = None
+                try:
+                    self.process(batch)
+                except Exception as e:
+                    logger.error(f"Error processing changes: {str(e)}")
+
+    def stop(self):
+        self.stopped.set()
+
+    def status(self):
+        """Get the watcher state for the status socket"""
+        with self.lock:
+            counts = {name: 0 for name in self.check_names}
+            for issues in self.issues.values():
+                for issue in issues:
+                    counts[issue.check] += 1
+            return {
+                'root': self.root,
+                'mode': self.mode,
+                'pid': os.getpid(),
+                'started': self.started,
+                'notes': len(self.outgoing),
+                'files': len(self.files),
+                'tags': len(self.tag_index.postings),
+                'issues': counts,
+                'events': self.events,
+                'pending': len(self.pending),
+                'batches': self.batches,
+                'last_batch': self.last_batch,
+            }
+
+    def issue_list(self, path=None):
+        """Get current issues as dicts, for every note or one note"""
+        with self.lock:
+            if path is not None:
+                rel_path = os.path.relpath(os.path.join(self.root, path), self.root)
+                notes = [rel_path] if rel_path in self.issues else []
+            else:
+                notes = sorted(self.issues)
+            return [issue._asdict() for rel_path in notes for issue in self.issues[rel_path]]
+
+class _StatusHandler(socketserver.StreamRequestHandler):
+    """One request per connection: "status", "issues [path]" or "rescan"; replies with JSON"""
+
+    def handle(self):
+        watcher = self.server.watcher
+        command, _, argument = self.rfile.readline(4096).decode('utf-8', 'replace').strip().partition(' ')
+        if command in ('', 'status'):
+            reply = watcher.status()
+        elif command == 'issues':
+            reply = watcher.issue_list(argument or None)
+        elif command == 'rescan':
+            watcher.rescan_requested.set()
+            reply = {'ok': True}
+        else:
+            reply = {'error': f"Unknown command: {command}"}
+        self.wfile.write(json.dumps(reply).encode('utf-8') + b'\n')
+
+class _StatusServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+def start_status_server(watcher, socket_path):
+    """Serve watcher status on a Unix socket in a background thread"""
+    if os.path.exists(socket_path):
+        try:
+            query(socket_path, 'status')
+            raise RuntimeError(f"A watcher is already serving {socket_path}")
+        except OSError:
+            os.remove(socket_path)  # Left behind by a watcher that did not exit cleanly
+    os.makedirs(os.path.dirname(os.path.abspath(socket_path)), exist_ok=True)
+    server = _StatusServer(socket_path, _StatusHandler)
+    server.watcher = watcher
+    os.chmod(socket_path, 0o600)
+    threading.Thread(target=server.serve_forever, name="vault_watcher_status", daemon=True).start()
+    return server
+
+def query(socket_path, command):
+    """Send one command to a running watcher and get its JSON reply"""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.settimeout(10)
+        client.connect(socket_path)
+        client.sendall(command.encode('utf-8') + b'\n')
+        data = b''
+        while not data.endswith(b'\n'):
+            chunk = client.recv(1 << 16)
+            if not chunk:
+                break
+            data += chunk
+    return json.loads(data)
+
+def main():
+    parser = argparse.ArgumentParser(description="Vault Maintenance Watcher")
+    parser.add_argument('--socket', default=SOCKET_PATH, help='Status socket path')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = subparsers.add_parser('run', help='Watch the vault until interrupted')
+    run_parser.add_argument('--root', default=VAULT_PATH, help='Vault root to watch')
+    run_parser.add_argument('--index-file', default=INDEX_PATH, help='Tag index to keep up to date')
+    run_parser.add_argument('--poll', action='store_true', help='Poll instead of using inotify')
+    run_parser.add_argument('--interval', type=float, default=2.0, help='Polling interval in seconds')
+    run_parser.add_argument('--debounce', type=float, default=0.5, help='Quiet period before a batch is checked')
+    subparsers.add_parser('status', help='Print the running watcher status')
+    issues_parser = subparsers.add_parser('issues', help='Print current issues from the running watcher')
+    issues_parser.add_argument('path', nargs='?', help='Only issues of this vault-relative note')
+    subparsers.add_parser('rescan', help='Ask the running watcher to rebuild its indexes')
+
+    args = parser.parse_args()
+
+    if args.command != 'run':
+        try:
+            reply = query(args.socket, f"{args.command} {getattr(args, 'path', None) or ''}".strip())
+        except OSError as e:
+            logger.error(f"No watcher is running on {args.socket}: {str(e)}")
+            return 1
+        print(json.dumps(reply, indent=2))
+        return 0
+
+    watcher = VaultWatcher(args.root, index_path=args.index_file, debounce=args.debounce)
+    source = open_source(watcher.root, args.poll, args.interval)
+    try:
+        server = start_status_server(watcher, args.socket)
+    except RuntimeError as e:
+        logger.error(str(e))
+        source.close()
+        return 1
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, lambda *_: watcher.stop())
+
+    logger.info(f"Watching {watcher.root} ({source.mode}); status socket: {args.socket}")
+    try:
+        watcher.run(source)
+    finally:
+        server.shutdown()
+        server.server_close()
+        if os.path.exists(args.socket):
+            os.remove(args.socket)
+        source.close()
+        logger.info("Watcher stopped")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+# log_query.py
+# Aggregates durations, counters and error rates from structured (JSON-lines) logs
+# Created: 2026-10-19
+#
+# Logs are streamed line by line (.log and rotated .log.gz files), so memory
+# use depends on the number of spans and runs, not on log size. Write
+# structured logs with VAULT_LOG_FORMAT=json or VaultLogger(structured=True).
+#
+# Usage:
+#   ./log_query.py spans                           - Duration and error rate per span name
+#   ./log_query.py runs --script consolidate_scripts - Duration, records and errors per run
+#   ./log_query.py counters --since 2026-10-01     - Counter totals per span name
+#   ./log_query.py spans --json                    - Machine-readable output
+
+import os
+import sys
+import gzip
+import json
+import argparse
+from datetime import datetime
+
+# Add lib directory to path for imports
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+LIB_DIR = os.path.join(SCRIPT_DIR, "lib")
+sys.path.append(LIB_DIR)
+
+from logger import LOG_DIR, log_file_timestamp
+
+ERROR_LEVELS = frozenset(['ERROR', 'CRITICAL'])
+
+# Only lines containing this are decoded for span and counter queries
+SPAN_END_MARKER = b'"event": "span_end"'
+
+def select_log_files(log_dir=LOG_DIR, script=None, since=None):
+    """Get log file paths for a script, oldest first
+
+    Timestamped files older than since are skipped by name; rotated files
+    have no timestamp in their name and are always read.
+    """
+    selected = []
+    for name in os.listdir(log_dir):
+        if not name.endswith(('.log', '.log.gz')):
+            continue
+        if script and not (name.startswith(f"{script}_") or name.startswith(f"{script}.log")):
+            continue
+        stamp = log_file_timestamp(name)
+        if since and stamp is not None and stamp.date() < since.date():
+            continue
+        selected.append((stamp or datetime.min, name))
+    selected.sort()
+    return [os.path.join(log_dir, name) for _, name in selected]
+
+def iter_records(paths, marker=None, since=None):
+    """Yield decoded JSON records from log files one line at a time
+
+    Text-format lines are skipped; with a marker, lines without it are
+    skipped before decoding.
+    """
+    since_text = since.isoformat() if since else None
+    for path in paths:
+        opener = gzip.open if path.endswith('.gz') else open
+        try:
+            with opener(path, 'rb') as f:
+                for line in f:
+                    if not line.startswith(b'{'):
+                        continue
+                    if marker is not None and marker not in line:
+                        continue
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue
+                    if since_text and record.get('ts', '') < since_text:
+                        continue
+                    yield record
+        except (OSError, EOFError) as e:
+            print(f"Skipping unreadable log {path}: {str(e)}", file=sys.stderr)
+
+def _percentile(sorted_values, fraction):
+    """Get a nearest-rank percentile of sorted values"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+def aggregate_spans(records):
+    """Get duration statistics and error rate per span name"""
+    spans = {}
+    for record in records:
+        if record.get('event') != 'span_end':
+            continue
+        stats = spans.setdefault(record.get('span', '?'), {'durations': [], 'errors': 0})
+        stats['durations'].append(float(record.get('duration_s', 0.0)))
+        if record.get('status') != 'ok':
+            stats['errors'] += 1
+
+    results = {}
+    for name, stats in spans.items():
+        durations = sorted(stats['durations'])
+        count = len(durations)
+        results[name] = {
+            'count': count,
+            'total_s': round(sum(durations), 6),
+            'mean_s': round(sum(durations) / count, 6),
+            'p50_s': _percentile(durations, 0.50),
+            'p95_s': _percentile(durations, 0.95),
+            'max_s': durations[-1],
+            'errors': stats['errors'],
+            'error_rate': round(stats['errors'] / count, 4),
+        }
+    return results
+
+def aggregate_runs(records):
+    """Get first/last timestamps, record and error counts per run_id"""
+    runs = {}
+    for record in records:
+        run_id = record.get('run_id') or '?'
+        ts = record.get('ts', '')
+        run = runs.get(run_id)
+        if run is None:
+            run = runs[run_id] = {'loggers': set(), 'start': ts, 'end': ts,
+                                  'records': 0, 'errors': 0, 'spans': 0, 'failed_spans': 0}
+        run['loggers'].add(record.get('logger') or '?')
+        run['start'] = min(run['start'], ts)
+        run['end'] = max(run['end'], ts)
+        run['records'] += 1
+        if record.get('level') in ERROR_LEVELS:
+            run['errors'] += 1
+        if record.get('event') == 'span_end':
+            run['spans'] += 1
+            if record.get('status') != 'ok':
+                run['failed_spans'] += 1
+
+    for run in runs.values():
+        run['loggers'] = sorted(run['loggers'])
+        try:
+            elapsed = datetime.fromisoformat(run['end']) - datetime.fromisoformat(run['start'])
+            run['duration_s'] = round(elapsed.total_seconds(), 3)
+        except ValueError:
+            run['duration_s'] = None
+        run['error_rate'] = round(run['errors'] / run['records'], 4) if run['records'] else 0.0
+    return runs
+
+def aggregate_counters(records):
+    """Get counter totals per span name"""
+    totals = {}
+    for record in records:
+        counters = record.get('counters')
+        if record.get('event') != 'span_end' or not counters:
+            continue
+        span_totals = totals.setdefault(record.get('span', '?'), {})
+        for name, value in counters.items():
+            span_totals[name] = span_totals.get(name, 0) + value
+    return totals
+
+def print_spans(results):
+    """Print span statistics as a table"""
+    print(f"{'span':<32} {'count':>7} {'total s':>10} {'mean s':>9} {'p50 s':>9} {'p95 s':>9} {'max s':>9} {'err %':>6}")
+    for name, stats in sorted(results.items(), key=lambda item: -item[1]['total_s']):
+        print(f"{name:<32} {stats['count']:>7} {stats['total_s']:>10.3f} {stats['mean_s']:>9.4f} "
+              f"{stats['p50_s']:>9.4f} {stats['p95_s']:>9.4f} {stats['max_s']:>9.4f} "
+              f"{stats['error_rate'] * 100:>6.1f}")
+
+def print_runs(runs):
+    """Print per-run statistics as a table, oldest first"""
+    print(f"{'run_id':<14} {'start':<24} {'duration s':>10} {'records':>8} {'errors':>7} {'spans':>6} {'failed':>6}  loggers")
+    for run_id, run in sorted(runs.items(), key=lambda item: item[1]['start']):
+        duration = f"{run['duration_s']:.3f}" if run['duration_s'] is not None else '-'
+        print(f"{run_id:<14} {run['start']:<24} {duration:>10} {run['records']:>8} {run['errors']:>7} "
+              f"{run['spans']:>6} {run['failed_spans']:>6}  {', '.join(run['loggers'])}")
+
+def print_counters(totals):
+    """Print counter totals grouped by span"""
+    for span in sorted(totals):
+        print(span)
+        for name, value in sorted(totals[span].items()):
+            print(f"  {name:<30} {value:>12}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Structured Log Query")
+    parser.add_argument('query', choices=['spans', 'runs', 'counters'], help='Aggregation to run')
+    parser.add_argument('--script', help='Only read logs for this script name')
+    parser.add_argument('--since', help='Only include records from this date or time (ISO format)')
+    parser.add_argument('--log-dir', default=LOG_DIR, help='Log directory to read')
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+    args = parser.parse_args()
+
+    try:
+        since = datetime.fromisoformat(args.since) if args.since else None
+    except ValueError:
+        print(f"Invalid --since value: {args.since}", file=sys.stderr)
+        return 1
+
+    paths = select_log_files(args.log_dir, args.script, since)
+    if args.query == 'runs':
+        results = aggregate_runs(iter_records(paths, since=since))
+        printer = print_runs
+    elif args.query == 'spans':
+        results = aggregate_spans(iter_records(paths, SPAN_END_MARKER, since))
+        printer = print_spans
+    else:
+        results = aggregate_counters(iter_records(paths, SPAN_END_MARKER, since))
+        printer = print_counters
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        printer(results)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -10,6 +10,7 @@
 #   fix-links            - Fix broken links in files
 #   verify               - Verify vault integrity
 #   audit-tags           - Audit tags used in the vault
+#   watch                - Watch the vault and check changed notes as they change
 #   clean                - Clean up temporary files
 #   backup               - Create backup of vault
 #   help                 - Show this help message
@@ -72,6 +73,8 @@ Commands:
   create-interview     - Create a new interview file
   sync                 - Sync vault changes with GitHub
   sync-status          - Check GitHub sync status
+  watch [--poll]       - Watch the vault and check changed notes incrementally
+  watch-status         - Query the running watcher (status, issues [note], rescan)
   clean                - Clean up temporary files
   backup               - Create backup of vault
   help                 - Show this help message
@@ -89,6 +92,8 @@ Examples:
   ./maintenance.sh create-interview player John Smith Vikings Quarterback
   ./maintenance.sh sync --message "Updated player interviews"
   ./maintenance.sh sync-status
+  ./maintenance.sh watch
+  ./maintenance.sh watch-status issues content/interviews/new-interview.md
   ./maintenance.sh clean
   ./maintenance.sh backup
 
@@ -323,6 +328,14 @@ case "$COMMAND" in
     "$VAULT_ROOT/scripts/content/create_interview.sh" "$@"
     log_success "Interview creation completed successfully"
     ;;
+  watch)
+    log_info "Starting vault watcher (Ctrl-C to stop)"
+    python3 "$VAULT_ROOT/scripts/lib/vault_watcher.py" run --root "$VAULT_ROOT" "$@"
+    log_success "Vault watcher stopped"
+    ;;
+  watch-status)
+    python3 "$VAULT_ROOT/scripts/lib/vault_watcher.py" "${1:-status}" "${@:2}"
+    ;;
   clean)
     cmd_clean
     ;;
@@ -18,6 +18,7 @@ set -e  # Exit on error
 # ============================================================================
 SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
 VAULT_ROOT="$(cd "$SCRIPT_DIR/../.." && pwd)"
+LIB_DIR="$(cd "$SCRIPT_DIR/../lib" && pwd)"
 LOGS_DIR="$VAULT_ROOT/_utilities/logs"
 TIMESTAMP=$(date +"%Y%m%d_%H%M%S")
 LOG_FILE="$LOGS_DIR/frontmatter_${TIMESTAMP}.log"
@@ -75,6 +76,29 @@ EOF
 # Core Functions
 # ============================================================================
 
+# Run lib/frontmatter_standardizer.py on files or directories and log its summary
+run_standardizer() {
+  local output
+  local status=0
+  output=$(python3 "$LIB_DIR/frontmatter_standardizer.py" "$@") || status=$?
+  
+  # Per-file messages go to stderr; stdout is "processed added changed unchanged failed"
+  local summary=$(tail -n 1 <<< "$output")
+  
+  local processed added changed unchanged failed
+  read -r processed added changed unchanged failed <<< "$summary"
+  if ! [[ "$failed" =~ ^[0-9]+$ ]]; then
+    log_error "Frontmatter standardizer failed"
+    return 1
+  fi
+  
+  log_success "Processed $processed files: $added added frontmatter, $changed standardized, $unchanged already standard"
+  if [ "$failed" -gt 0 ]; then
+    log_warning "$failed files could not be standardized (see System/Logs/Errors)"
+  fi
+  return $status
+}
+
 # Standardize frontmatter in a single file
 standardize_frontmatter() {
   local file="$1"
@@ -85,127 +109,10 @@ standardize_frontmatter() {
   fi
   
   log_info "Processing file: $file"
-  
-  # Check if file has YAML frontmatter
-  if ! grep -q "^---" "$file"; then
-    log_warning "No YAML frontmatter found in $file"
-    
-    # Add basic frontmatter if missing
-    local filename=$(basename "$file" .md)
-    local today=$(date +"%Y-%m-%d")
-    
-    local tmp_file=$(mktemp)
-    cat > "$tmp_file" << EOF
----
-title: "${filename}"
-date_created: ${today}
-date_modified: ${today}
-status: active
-tags: []
----
-
-EOF
-    
-    # Append original content
-    cat "$file" >> "$tmp_file"
-    
-    # Replace original file
-    mv "$tmp_file" "$file"
-    
-    log_success "Added basic frontmatter to $file"
-    return 0
-  fi
-  
-  # Create temporary file
-  local tmp_file=$(mktemp)
-  
-  # Extract frontmatter and content
-  local frontmatter_start=$(grep -n "^---" "$file" | head -1 | cut -d: -f1)
-  local frontmatter_end=$(grep -n "^---" "$file" | head -2 | tail -1 | cut -d: -f1)
-  
-  if [ -z "$frontmatter_end" ] || [ "$frontmatter_start" = "$frontmatter_end" ]; then
-    log_error "Invalid frontmatter in $file (missing closing ---)"
-    return 1
-  fi
-  
-  # Extract frontmatter
-  local frontmatter=$(sed -n "${frontmatter_start},${frontmatter_end}p" "$file")
-  
-  # Standardize date fields
-  frontmatter=$(echo "$frontmatter" | sed "s/^date: /date_created: /")
-  frontmatter=$(echo "$frontmatter" | sed "s/^updated: /date_modified: /")
-  frontmatter=$(echo "$frontmatter" | sed "s/^modified: /date_modified: /")
-  frontmatter=$(echo "$frontmatter" | sed "s/^created: /date_created: /")
-  
-  # Fix malformed dates (convert YYYY-MM-DD to proper format)
-  frontmatter=$(echo "$frontmatter" | sed -E "s/^(date_[^:]+: )([0-9]{4})-([0-9]{2})-([0-9]{2})/\1\2-\3-\4/g")
-  
-  # Add missing fields if needed
-  
-  # Date created
-  if ! echo "$frontmatter" | grep -q "date_created:"; then
-    today=$(date +"%Y-%m-%d")
-    frontmatter=$(echo "$frontmatter" | sed "/^---$/a\\
-date_created: $today")
-  fi
-  
-  # Date modified
-  if ! echo "$frontmatter" | grep -q "date_modified:"; then
-    today=$(date +"%Y-%m-%d")
-    frontmatter=$(echo "$frontmatter" | sed "/^---$/a\\
-date_modified: $today")
-  fi
-  
-  # Status field
-  if ! echo "$frontmatter" | grep -q "^status:"; then
-    frontmatter=$(echo "$frontmatter" | sed "/^---$/a\\
-status: active")
-  fi
-  
-  # Title field
-  if ! echo "$frontmatter" | grep -q "^title:"; then
-    filename=$(basename "$file" .md)
-    title=$(echo "$filename" | sed -E 's/[-_]/ /g' | sed -E 's/\b\w/\U&/g')
-    frontmatter=$(echo "$frontmatter" | sed "/^---$/a\\
-title: \"$title\"")
-  fi
-  
-  # Tags field
-  if ! echo "$frontmatter" | grep -q "^tags:"; then
-    frontmatter=$(echo "$frontmatter" | sed "/^---$/a\\
-tags: []")
-  fi
-  
-  # Format tags consistently (list format)
-  if echo "$frontmatter" | grep -q "^tags:.*\["; then
-    # Already in list format, leave as is
-    :
-  else
-    # Convert tag string to list format
-    tags_line=$(echo "$frontmatter" | grep "^tags:")
-    if [ -n "$tags_line" ]; then
-      tags_value=$(echo "$tags_line" | sed "s/^tags: //")
-      tags_list="tags: [$tags_value]"
-      frontmatter=$(echo "$frontmatter" | sed "s/^tags:.*/$tags_list/")
-    fi
-  fi
-  
-  # Write standardized frontmatter to temporary file
-  echo "$frontmatter" > "$tmp_file"
-  
-  # Append content after frontmatter
-  if [ "$frontmatter_end" -lt "$(wc -l < "$file")" ]; then
-    sed -n "$((frontmatter_end+1)),\$p" "$file" >> "$tmp_file"
-  fi
-  
-  # Replace original file
-  mv "$tmp_file" "$file"
-  
-  log_success "Standardized YAML in $file"
-  return 0
+  run_standardizer --workers 1 "$file"
 }
 
-# Process all markdown files in a directory
+# Process all markdown files in a directory (parallel, skipping files already standardized)
 batch_standardize() {
   local directory="${1:-$VAULT_ROOT}"
   
@@ -215,16 +122,7 @@ batch_standardize() {
   fi
   
   log_info "Batch processing directory: $directory"
-  
-  # Find all markdown files
-  local count=0
-  while IFS= read -r file; do
-    standardize_frontmatter "$file"
-    count=$((count + 1))
-  done < <(find "$directory" -name "*.md" -type f -not -path "*/\.*")
-  
-  log_success "Processed $count files in $directory"
-  return 0
+  run_standardizer "$directory"
 }
 
 # Verify frontmatter in a file
@@ -293,32 +191,8 @@ verify_frontmatter() {
 repair_all() {
   log_info "Finding and fixing all frontmatter issues in vault"
   
-  # First, check for files without frontmatter
-  log_info "Checking for files without frontmatter"
-  local count=0
-  while IFS= read -r file; do
-    if ! grep -q "^---" "$file"; then
-      log_warning "No frontmatter in $file"
-      standardize_frontmatter "$file"
-      count=$((count + 1))
-    fi
-  done < <(find "$VAULT_ROOT" -name "*.md" -type f -not -path "*/\.*")
-  
-  log_info "Added frontmatter to $count files"
-  
-  # Now check for files with incomplete frontmatter
-  log_info "Checking for files with incomplete frontmatter"
-  count=0
-  while IFS= read -r file; do
-    if grep -q "^---" "$file"; then
-      if ! verify_frontmatter "$file" > /dev/null 2>&1; then
-        standardize_frontmatter "$file"
-        count=$((count + 1))
-      fi
-    fi
-  done < <(find "$VAULT_ROOT" -name "*.md" -type f -not -path "*/\.*")
-  
-  log_info "Fixed frontmatter in $count files"
+  # One pass adds missing frontmatter and completes incomplete frontmatter
+  run_standardizer "$VAULT_ROOT"
   
   log_success "Completed frontmatter repair"
   return 0
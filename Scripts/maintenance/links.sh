@@ -6,7 +6,8 @@
 # Purpose: Fixes and verifies internal links in Obsidian markdown files
 # Usage:
 #   ./links.sh fix <file> - Fix links in a single file
-#   ./links.sh fix-all - Fix links in all files
+#   ./links.sh fix-all [directory] - Fix links in all files
+#     (set LINK_RENAMES_FILE to an old,new CSV to also rewrite links to moved notes)
 #   ./links.sh verify <file> - Verify links in a file
 #   ./links.sh verify-all - Verify links in all files
 # ============================================================================
@@ -18,6 +19,7 @@ set -e  # Exit on error
 # ============================================================================
 SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
 VAULT_ROOT="$(cd "$SCRIPT_DIR/../.." && pwd)"
+LIB_DIR="$(cd "$SCRIPT_DIR/../lib" && pwd)"
 LOGS_DIR="$VAULT_ROOT/_utilities/logs"
 TIMESTAMP=$(date +"%Y%m%d_%H%M%S")
 LOG_FILE="$LOGS_DIR/links_${TIMESTAMP}.log"
@@ -58,15 +60,20 @@ Usage: ./links.sh [command] [options]
 
 Commands:
   fix <file>          - Fix links in a single file
-  fix-all             - Fix links in all files
+  fix-all [directory] - Fix links in all files (or a directory)
   fix-templates       - Fix links in template files
   verify <file>       - Verify links in a file
   verify-all          - Verify links in all files
   help                - Show this help message
 
+Links are matched to existing notes ignoring case, spaces and punctuation.
+Set LINK_RENAMES_FILE to a CSV of old,new note paths to rewrite links to
+moved or renamed notes.
+
 Examples:
   ./links.sh fix content/research/file.md
   ./links.sh fix-all
+  LINK_RENAMES_FILE=renames.csv ./links.sh fix-all
   ./links.sh verify content/research/file.md
   ./links.sh verify-all
 EOF
@@ -76,6 +83,29 @@ EOF
 # Core Functions
 # ============================================================================
 
+# Run the link fixer; links resolve against the vault root
+run_link_fixer() {
+  local output
+  local status=0
+  output=$(python3 "$LIB_DIR/link_fixer.py" --root "$VAULT_ROOT" "$@") || status=$?
+  
+  # Per-link messages go to stderr; stdout is "processed changed fixed failed"
+  local summary=$(tail -n 1 <<< "$output")
+  
+  local processed changed fixed failed
+  read -r processed changed fixed failed <<< "$summary"
+  if ! [[ "$failed" =~ ^[0-9]+$ ]]; then
+    log_error "Link fixer failed"
+    return 1
+  fi
+  
+  log_success "Fixed $fixed link(s) in $changed of $processed files"
+  if [ "$failed" -gt 0 ]; then
+    log_warning "$failed files could not be fixed (see System/Logs/Errors)"
+  fi
+  return $status
+}
+
 # Fix links in a single file
 fix_links() {
   local file="$1"
@@ -86,104 +116,32 @@ fix_links() {
   fi
   
   log_info "Fixing links in $file"
-  
-  # Create temporary file
-  local tmp_file=$(mktemp)
-  
-  # Regular expression for Obsidian wiki links
-  local link_regex='\[\[([^|\]]+)(\|[^\]]+)?\]\]'
-  
-  # Process file line by line
-  while IFS= read -r line; do
-    # Check if line contains wiki links
-    if [[ "$line" =~ $link_regex ]]; then
-      # Process each link in the line
-      while [[ "$line" =~ $link_regex ]]; do
-        link="${BASH_REMATCH[1]}"
-        display="${BASH_REMATCH[2]}"
-        
-        # Fix common issues with links
-        fixed_link="${link}"
-        
-        # Fix spaces in links (should be dashes or underscores)
-        fixed_link="${fixed_link// /-}"
-        
-        # Fix uppercase in links (should be lowercase)
-        fixed_link="${fixed_link,,}"
-        
-        # Adjust file extension if missing (.md)
-        if [[ "$fixed_link" != *.md && "$fixed_link" != */* && "$fixed_link" != *\\* ]]; then
-          fixed_link="${fixed_link}.md"
-        fi
-        
-        # Replace the original link with the fixed link
-        if [ "$link" != "$fixed_link" ]; then
-          if [ -n "$display" ]; then
-            # Preserve display text
-            line="${line/\[\[$link$display\]\]/\[\[$fixed_link$display\]\]}"
-          else
-            line="${line/\[\[$link\]\]/\[\[$fixed_link\]\]}"
-          fi
-          log_info "  Fixed link: $link -> $fixed_link"
-        fi
-        
-        # Remove the processed link to find the next one
-        remainder="${line/\[\[$link$display\]\]/}"
-        if [ "$remainder" = "$line" ]; then
-          break
-        fi
-        line="$remainder"
-      done
-    fi
-    
-    # Write the processed line to the temporary file
-    echo "$line" >> "$tmp_file"
-  done < "$file"
-  
-  # Replace original file
-  mv "$tmp_file" "$file"
-  
-  log_success "Fixed links in $file"
-  return 0
+  run_link_fixer --workers 1 "$file"
 }
 
-# Fix links in all files
+# Fix links in all files (or a directory), optionally applying a renames CSV (old,new)
 fix_all_links() {
   local include_templates="${1:-false}"
+  local directory="${2:-$VAULT_ROOT}"
+  local args=()
   
   log_info "Fixing links in all markdown files"
   
-  # Find all markdown files
-  local count=0
-  local template_pattern=""
-  
   if [ "$include_templates" = "false" ]; then
-    # Exclude template files
-    template_pattern="-not -path '*template*'"
+    args+=(--templates exclude)
+  fi
+  if [ -n "$LINK_RENAMES_FILE" ]; then
+    log_info "Applying renames from $LINK_RENAMES_FILE"
+    args+=(--renames "$LINK_RENAMES_FILE")
   fi
   
-  while IFS= read -r file; do
-    fix_links "$file"
-    count=$((count + 1))
-  done < <(eval "find \"$VAULT_ROOT\" -name \"*.md\" -type f -not -path \"*/\\.*\" $template_pattern")
-  
-  log_success "Fixed links in $count files"
-  return 0
+  run_link_fixer "${args[@]}" "$directory"
 }
 
 # Fix links in template files
 fix_template_links() {
   log_info "Fixing links in template files"
-  
-  # Find template files
-  local count=0
-  while IFS= read -r file; do
-    fix_links "$file"
-    count=$((count + 1))
-  done < <(find "$VAULT_ROOT" -name "*template*.md" -type f -not -path "*/\.*")
-  
-  log_success "Fixed links in $count template files"
-  return 0
+  run_link_fixer --templates only "$VAULT_ROOT"
 }
 
 # Verify links in a file
@@ -299,7 +257,7 @@ case "$COMMAND" in
     fix_links "$1"
     ;;
   fix-all)
-    fix_all_links "false"
+    fix_all_links "false" "$1"
     ;;
   fix-templates)
     fix_template_links
@@ -9,6 +9,8 @@
 #   ./tags.sh standardize - Standardize tags across the vault
 #   ./tags.sh list - List all tags used in the vault
 #   ./tags.sh find <tag> - Find files with a specific tag
+#   ./tags.sh related <tag> - Show tags used together with a tag
+#   ./tags.sh refresh - Update the tag index from changed notes
 # ============================================================================
 
 set -e  # Exit on error
@@ -18,17 +20,19 @@ set -e  # Exit on error
 # ============================================================================
 SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
 VAULT_ROOT="$(cd "$SCRIPT_DIR/../.." && pwd)"
+LIB_DIR="$(cd "$SCRIPT_DIR/../lib" && pwd)"
 LOGS_DIR="$VAULT_ROOT/_utilities/logs"
 TIMESTAMP=$(date +"%Y%m%d_%H%M%S")
 LOG_FILE="$LOGS_DIR/tags_${TIMESTAMP}.log"
 TAG_INVENTORY_FILE="$VAULT_ROOT/_utilities/inventory/tag_inventory.csv"
 TAG_ISSUES_FILE="$VAULT_ROOT/_utilities/inventory/tag_issues.csv"
+TAG_INDEX_FILE="$VAULT_ROOT/System/Configuration/tag_index.json"
 
 # Create logs and inventory directories if they don't exist
 mkdir -p "$LOGS_DIR"
 mkdir -p "$(dirname "$TAG_INVENTORY_FILE")"
 
-# Known tag categories for standardization
+# Known tag categories for standardization (kept in sync with lib/tag_engine.py)
 declare -a PRIMARY_TAGS=(
   "interview" "research" "strategy" "compliance"
   "active" "draft" "archived" "template" "placeholder"
@@ -78,6 +82,8 @@ Commands:
   standardize          - Standardize tags across the vault
   list                 - List all tags used in the vault
   find <tag>           - Find files with a specific tag
+  related <tag>        - Show tags used together with a tag
+  refresh              - Update the tag index from changed notes
   report [--format=md] - Generate tag usage report
   help                 - Show this help message
 
@@ -86,119 +92,29 @@ Examples:
   ./tags.sh standardize
   ./tags.sh list
   ./tags.sh find interview
+  ./tags.sh related interview
+  ./tags.sh refresh
   ./tags.sh report --format=md
 EOF
 }
 
-# Extract all tags from a file
-extract_tags() {
-  local file="$1"
-  local tags=""
-  
-  # Check if file exists
-  if [ ! -f "$file" ]; then
-    return 1
-  fi
-  
-  # Extract tags from frontmatter
-  if grep -q "^---" "$file"; then
-    # Extract frontmatter
-    local frontmatter_start=$(grep -n "^---" "$file" | head -1 | cut -d: -f1)
-    local frontmatter_end=$(grep -n "^---" "$file" | head -2 | tail -1 | cut -d: -f1)
-    
-    if [ -n "$frontmatter_end" ] && [ "$frontmatter_start" != "$frontmatter_end" ]; then
-      # Look for tags in frontmatter
-      local tag_line=$(sed -n "${frontmatter_start},${frontmatter_end}p" "$file" | grep "^tags:")
-      
-      if [ -n "$tag_line" ]; then
-        # Extract tag values
-        tags=$(echo "$tag_line" | sed -E 's/^tags:\s*(\[|\[\"|\[\[)//g' | sed -E 's/(\]|\"\]|\]\])$//g')
-        
-        # Clean up tag formatting
-        tags=$(echo "$tags" | tr -d '[],\"' | tr -s ' ')
-      fi
-    fi
-  fi
-  
-  echo "$tags"
-}
-
 # ============================================================================
 # Core Functions
 # ============================================================================
 
-# Audit tags across the vault
+# Audit tags across the vault (single pass in lib/tag_engine.py)
 audit_tags() {
   log_info "Auditing tags across the vault"
   
-  # Create CSV headers
-  echo "file_path,tag,standardized,issue_type" > "$TAG_ISSUES_FILE"
+  local output
+  if ! output=$(python3 "$LIB_DIR/tag_engine.py" audit --root "$VAULT_ROOT" --issues-file "$TAG_ISSUES_FILE"); then
+    log_error "Tag audit failed"
+    return 1
+  fi
   
-  # Process all markdown files
-  local files_processed=0
-  local files_with_issues=0
-  local tag_issues=0
-  
-  while IFS= read -r file; do
-    files_processed=$((files_processed + 1))
-    local file_has_issues=0
-    
-    # Extract all tags from the file
-    local raw_tags=$(extract_tags "$file")
-    
-    if [ -z "$raw_tags" ]; then
-      # Missing tags
-      echo "$file,,missing,File has no tags" >> "$TAG_ISSUES_FILE"
-      file_has_issues=1
-      tag_issues=$((tag_issues + 1))
-    else
-      # Process each tag
-      for tag in $raw_tags; do
-        # Check for inconsistent formatting
-        local standardized_tag=$(echo "$tag" | tr '[:upper:]' '[:lower:]' | tr ' ' '-' | tr '_' '-')
-        
-        if [ "$tag" != "$standardized_tag" ]; then
-          # Inconsistent formatting
-          echo "$file,$tag,$standardized_tag,formatting" >> "$TAG_ISSUES_FILE"
-          file_has_issues=1
-          tag_issues=$((tag_issues + 1))
-        fi
-        
-        # Check for non-standard tags
-        local is_standard=0
-        
-        # Check primary tags
-        for std_tag in "${PRIMARY_TAGS[@]}"; do
-          if [ "$standardized_tag" = "$std_tag" ]; then
-            is_standard=1
-            break
-          fi
-        done
-        
-        # Check secondary tags if not found in primary
-        if [ "$is_standard" -eq 0 ]; then
-          for std_tag in "${SECONDARY_TAGS[@]}"; do
-            if [ "$standardized_tag" = "$std_tag" ]; then
-              is_standard=1
-              break
-            fi
-          done
-        fi
-        
-        if [ "$is_standard" -eq 0 ]; then
-          # Non-standard tag
-          echo "$file,$tag,$standardized_tag,non-standard" >> "$TAG_ISSUES_FILE"
-          file_has_issues=1
-          tag_issues=$((tag_issues + 1))
-        fi
-      done
-    fi
-    
-    if [ "$file_has_issues" -eq 1 ]; then
-      files_with_issues=$((files_with_issues + 1))
-    fi
-    
-  done < <(find "$VAULT_ROOT" -name "*.md" -type f -not -path "*/\.*")
+  # The engine prints "files_processed files_with_issues tag_issues" last
+  local files_processed files_with_issues tag_issues
+  read -r files_processed files_with_issues tag_issues <<< "$(tail -n 1 <<< "$output")"
   
   log_info "Audit complete: Processed $files_processed files"
   
@@ -334,49 +250,46 @@ standardize_tags() {
   fi
   
   log_success "Standardized $fixed_issues tag issues in $fixed_files files"
+  
+  if [ "$fixed_files" -gt 0 ]; then
+    refresh_index
+  fi
+}
+
+# Run a lib/tag_index.py command; queries re-read changed notes first unless
+# given --no-refresh
+tag_index() {
+  python3 "$LIB_DIR/tag_index.py" --root "$VAULT_ROOT" --index-file "$TAG_INDEX_FILE" "$@"
+}
+
+# Re-read new and changed notes into the tag index
+refresh_index() {
+  log_info "Refreshing tag index: $TAG_INDEX_FILE"
+  
+  local changed
+  if ! changed=$(tag_index refresh); then
+    log_error "Tag index refresh failed"
+    return 1
+  fi
+  
+  log_success "Tag index updated ($changed notes re-read)"
 }
 
 # List all tags used in the vault
 list_tags() {
   log_info "Listing all tags used in the vault"
   
-  # Create CSV headers
-  echo "tag,count,files" > "$TAG_INVENTORY_FILE"
-  
-  # Temporary file for all tags
-  local all_tags_file=$(mktemp)
-  
-  # Extract tags from all files
-  while IFS= read -r file; do
-    local tags=$(extract_tags "$file")
-    for tag in $tags; do
-      # Standardize tag format for consistency
-      local standardized_tag=$(echo "$tag" | tr '[:upper:]' '[:lower:]' | tr ' ' '-' | tr '_' '-')
-      echo "$standardized_tag,$file" >> "$all_tags_file"
-    done
-  done < <(find "$VAULT_ROOT" -name "*.md" -type f -not -path "*/\.*")
-  
-  # Count occurrences of each tag
-  local tag_count_file=$(mktemp)
-  sort "$all_tags_file" | cut -d, -f1 | uniq -c | sort -nr > "$tag_count_file"
-  
-  # For each tag, list the files that use it
-  while read -r count tag; do
-    # Format count (remove leading spaces)
-    count=$(echo "$count" | tr -d ' ')
-    
-    # Get files using this tag
-    local files=$(grep "^$tag," "$all_tags_file" | cut -d, -f2 | tr '\n' '|' | sed 's/|$//')
-    
-    # Add to inventory
-    echo "$tag,$count,\"$files\"" >> "$TAG_INVENTORY_FILE"
-    
-    # Output to console
-    log_info "Tag: $tag - Used in $count files"
-  done < "$tag_count_file"
+  local output
+  if ! output=$(tag_index list --inventory-file "$TAG_INVENTORY_FILE"); then
+    log_error "Tag index query failed"
+    return 1
+  fi
   
-  # Clean up temporary files
-  rm "$all_tags_file" "$tag_count_file"
+  while read -r tag count; do
+    if [ -n "$tag" ]; then
+      log_info "Tag: $tag - Used in $count files"
+    fi
+  done <<< "$output"
   
   log_success "Tag inventory saved to: $TAG_INVENTORY_FILE"
 }
@@ -392,27 +305,22 @@ find_files_with_tag() {
   
   log_info "Finding files with tag: $tag"
   
-  # Standardize the tag for searching
+  # Standardize the tag for the results file name
   local standardized_tag=$(echo "$tag" | tr '[:upper:]' '[:lower:]' | tr ' ' '-' | tr '_' '-')
   
-  # Find files with the tag
-  local count=0
-  local file_list=""
+  local file_list
+  if ! file_list=$(tag_index find "$tag"); then
+    log_error "Tag index query failed"
+    return 1
+  fi
   
+  local count=0
   while IFS= read -r file; do
-    local tags=$(extract_tags "$file")
-    for file_tag in $tags; do
-      # Standardize tag for comparison
-      local std_file_tag=$(echo "$file_tag" | tr '[:upper:]' '[:lower:]' | tr ' ' '-' | tr '_' '-')
-      
-      if [ "$std_file_tag" = "$standardized_tag" ]; then
-        log_info "  $file"
-        count=$((count + 1))
-        file_list="$file_list$file\n"
-        break
-      fi
-    done
-  done < <(find "$VAULT_ROOT" -name "*.md" -type f -not -path "*/\.*")
+    if [ -n "$file" ]; then
+      log_info "  $file"
+      count=$((count + 1))
+    fi
+  done <<< "$file_list"
   
   if [ "$count" -eq 0 ]; then
     log_warning "No files found with tag: $tag"
@@ -421,21 +329,49 @@ find_files_with_tag() {
     
     # Save the results to a file
     local results_file="$VAULT_ROOT/_utilities/inventory/tag_search_${standardized_tag}_${TIMESTAMP}.txt"
-    echo -e "$file_list" > "$results_file"
+    echo "$file_list" > "$results_file"
     log_info "Results saved to: $results_file"
   fi
 }
 
+# Show tags that appear together with a tag
+related_tags() {
+  local tag="$1"
+  
+  if [ -z "$tag" ]; then
+    log_error "Error: No tag specified"
+    return 1
+  fi
+  
+  log_info "Tags used together with: $tag"
+  
+  local output
+  if ! output=$(tag_index related "$tag"); then
+    log_error "Tag index query failed"
+    return 1
+  fi
+  
+  if [ -z "$output" ]; then
+    log_warning "No tags found alongside: $tag"
+    return 0
+  fi
+  
+  while read -r related count; do
+    log_info "  $related - $count shared files"
+  done <<< "$output"
+}
+
 # Generate a tag usage report
 generate_report() {
   local format="${1:-md}"
   
   log_info "Generating tag usage report in $format format"
   
-  # First ensure we have up-to-date tag inventory
-  if [ ! -f "$TAG_INVENTORY_FILE" ] || [ "$(find "$TAG_INVENTORY_FILE" -mtime +1)" ]; then
-    log_info "Updating tag inventory"
-    list_tags > /dev/null
+  # Counts come from the tag index
+  local tag_counts stats
+  if ! tag_counts=$(tag_index list) || ! stats=$(tag_index --no-refresh stats); then
+    log_error "Tag index query failed"
+    return 1
   fi
   
   local report_file="$VAULT_ROOT/docs/system/tag_usage_report.${format}"
@@ -460,6 +396,10 @@ This report provides an overview of tags used throughout the Athlete Financial E
 
 This report was generated on $today.
 
+- Notes indexed: $(awk '$1 == "notes" {print $2}' <<< "$stats")
+- Distinct tags: $(awk '$1 == "tags" {print $2}' <<< "$stats")
+- Notes without tags: $(awk '$1 == "untagged_notes" {print $2}' <<< "$stats")
+
 ## Tag Frequency
 
 The following table shows the frequency of tag usage across the vault:
@@ -468,10 +408,12 @@ The following table shows the frequency of tag usage across the vault:
 |-----|-------|
 EOF
     
-    # Add tag data (skip header row)
-    tail -n +2 "$TAG_INVENTORY_FILE" | while IFS=, read -r tag count files; do
-      echo "| $tag | $count |" >> "$report_file"
-    done
+    # Add tag data
+    while read -r tag count; do
+      if [ -n "$tag" ]; then
+        echo "| $tag | $count |" >> "$report_file"
+      fi
+    done <<< "$tag_counts"
     
     cat >> "$report_file" << EOF
 
@@ -551,6 +493,17 @@ case "$COMMAND" in
     fi
     find_files_with_tag "$1"
     ;;
+  related)
+    if [ -z "$1" ]; then
+      log_error "Error: No tag specified"
+      show_help
+      exit 1
+    fi
+    related_tags "$1"
+    ;;
+  refresh)
+    refresh_index
+    ;;
   report)
     format="md"
     if [[ "$1" == --format=* ]]; then
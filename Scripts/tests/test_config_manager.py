@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+# test_config_manager.py
+# Tests for shared instances, concurrent saves and write-behind in lib/config_manager.py
+
+import os
+import sys
+import json
+import tempfile
+import unittest
+from unittest import mock
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(os.path.dirname(TESTS_DIR), "lib"))
+
+import config_manager
+from config_manager import ConfigManager, clear_config_registry, flush_all_configs
+
+class TempConfig:
+    """Shared temp config file setup"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.addCleanup(clear_config_registry)
+        self.path = os.path.join(self.temp_dir.name, "test_config.json")
+        self.write_file({'a': {'b': 1}, 'keep': True})
+
+    def write_file(self, data):
+        with open(self.path, 'w') as f:
+            json.dump(data, f)
+
+    def read_file(self):
+        with open(self.path, 'r') as f:
+            return json.load(f)
+
+class SharedInstanceTest(TempConfig, unittest.TestCase):
+    """One instance per config file unless shared=False"""
+
+    def test_same_file_shares_an_instance(self):
+        first = ConfigManager(self.path)
+        self.assertIs(ConfigManager(self.path), first)
+        self.assertIsNot(ConfigManager(self.path, shared=False), first)
+        first.set('a.c', 2)
+        self.assertEqual(ConfigManager(self.path).get('a.c'), 2)
+
+    def test_cleared_registry_rereads_the_file(self):
+        first = ConfigManager(self.path)
+        first.set('a.b', 5)
+        clear_config_registry()
+        second = ConfigManager(self.path)
+        self.assertIsNot(second, first)
+        self.assertEqual(second.get('a.b'), 1)
+
+class ConcurrentWriterTest(TempConfig, unittest.TestCase):
+    """Saves re-apply recorded changes on top of another writer's version"""
+
+    def setUp(self):
+        super().setUp()
+        self.ours = ConfigManager(self.path, shared=False)
+        self.theirs = ConfigManager(self.path, shared=False)
+
+    def test_save_keeps_the_other_writers_changes(self):
+        self.theirs.set('theirs', 1)
+        self.assertTrue(self.theirs.save_config())
+        self.ours.set('a.c', 2)
+        self.ours.delete('keep')
+        self.assertTrue(self.ours.save_config())
+        self.assertEqual(self.read_file(), {'a': {'b': 1, 'c': 2}, 'theirs': 1})
+
+    def test_our_change_wins_on_the_same_key(self):
+        self.theirs.set('a.b', 'theirs')
+        self.theirs.save_config()
+        self.ours.set('a.b', 'ours')
+        self.ours.save_config()
+        self.assertEqual(self.read_file()['a']['b'], 'ours')
+
+    def test_reload_replays_unsaved_changes(self):
+        self.ours.set('a.c', 2)
+        self.theirs.set('theirs', 1)
+        self.theirs.save_config()
+        self.assertTrue(self.ours.check_reload(force=True))
+        self.assertEqual(self.ours.get('theirs'), 1)
+        self.assertEqual(self.ours.get('a.c'), 2)
+
+class PendingOpsTest(TempConfig, unittest.TestCase):
+    """Unsaved changes stay bounded by the keys they touch"""
+
+    def setUp(self):
+        super().setUp()
+        self.config = ConfigManager(self.path, shared=False)
+
+    def test_repeated_sets_are_recorded_once(self):
+        for value in range(1000):
+            self.config.set('counter', value)
+        self.assertEqual(self.config._pending_ops, [('set', 'counter', 999)])
+
+    def test_set_replaces_changes_below_it(self):
+        self.config.set('a.c', 2)
+        self.config.delete('a.b')
+        self.config.set('x', 1)
+        self.config.set('a', {'d': 3})
+        self.assertEqual(self.config._pending_ops, [('set', 'x', 1), ('set', 'a', {'d': 3})])
+
+    def test_set_below_an_earlier_set_is_kept(self):
+        self.config.set('a', {'d': 3})
+        self.config.set('a.e', 4)
+        self.assertEqual(len(self.config._pending_ops), 2)
+
+    def test_reset_replaces_everything(self):
+        self.config.set('x', 1)
+        self.config.merge({'y': 2})
+        self.config.reset()
+        self.assertEqual(self.config._pending_ops, [('reset',)])
+
+    def test_compacted_changes_save_the_same_result(self):
+        self.config.set('a.c', 1)
+        self.config.set('a.c', 2)
+        self.config.delete('keep')
+        self.config.set('keep', 'again')
+        self.config.save_config()
+        self.assertEqual(self.read_file(), {'a': {'b': 1, 'c': 2}, 'keep': 'again'})
+
+class WriteBehindTest(TempConfig, unittest.TestCase):
+    """Deferred saves coalesce into one write"""
+
+    def setUp(self):
+        super().setUp()
+        self.config = ConfigManager(self.path, shared=False)
+        self.config.set_write_behind(True, delay=60)
+        self.addCleanup(self.config.set_write_behind, False)
+
+    def test_saves_coalesce_until_flushed(self):
+        with mock.patch.object(self.config, '_atomic_write', wraps=self.config._atomic_write) as write:
+            for value in range(5):
+                self.config.set('counter', value)
+                self.assertTrue(self.config.save_config())
+            self.assertEqual(write.call_count, 0)
+            self.assertEqual(self.read_file().get('counter'), None)
+            self.assertTrue(self.config.flush())
+            self.assertEqual(write.call_count, 1)
+        self.assertEqual(self.read_file()['counter'], 4)
+        self.assertIsNone(self.config._flush_timer)
+
+    def test_exit_flush_writes_pending_saves(self):
+        self.config.set('counter', 1)
+        self.config.save_config()
+        self.assertIn(self.config, config_manager._write_behind)
+        flush_all_configs()
+        self.assertEqual(self.read_file()['counter'], 1)
+        self.assertFalse(self.config._dirty)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+# test_consolidation_store.py
+# Tests for the consolidation plan/results stores in lib/consolidation_store.py
+
+import os
+import sys
+import sqlite3
+import tempfile
+import unittest
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(os.path.dirname(TESTS_DIR), "lib"))
+
+from consolidation_store import JSONConsolidationStore, SQLiteConsolidationStore
+
+def plan(group_id, group_key):
+    return {'group_id': group_id, 'group_key': group_key, 'scripts': []}
+
+def result(group_id, success=True):
+    return {'group_id': group_id, 'success': success, 'message': ''}
+
+class StoreBehaviour:
+    """Shared checks, run against each backend"""
+
+    def make_store(self, directory):
+        raise NotImplementedError
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.store = self.make_store(self.temp_dir.name)
+
+    def group_ids(self, results):
+        return [r['group_id'] for r in results]
+
+    def test_plans_round_trip_and_filter(self):
+        self.store.save_plans([plan(1, 'a'), plan(2, 'b')])
+        self.assertEqual(self.store.load_plans(), [plan(1, 'a'), plan(2, 'b')])
+        self.assertEqual(self.store.load_plans([2]), [plan(2, 'b')])
+
+    def test_latest_result_per_group_is_kept(self):
+        self.store.save_plans([plan(1, 'a'), plan(2, 'b')])
+        self.store.append_results([result(1, False), result(2)])
+        self.store.append_results([result(1)])
+        self.assertEqual(self.store.load_results(), [result(1), result(2)])
+        self.assertEqual(self.store.load_results([2]), [result(2)])
+
+    def test_new_plan_drops_results_of_replaced_groups(self):
+        self.store.save_plans([plan(1, 'a'), plan(2, 'b'), plan(3, 'c')])
+        self.store.append_results([result(1), result(2), result(3)])
+        # Group 2 now holds other scripts and group 3 is gone
+        self.store.save_plans([plan(1, 'a'), plan(2, 'other')])
+        self.assertEqual(self.group_ids(self.store.load_results()), [1])
+
+    def test_plans_keep_their_order(self):
+        plans = [plan('f0e1', 'f0e1aa'), plan('0a1b', '0a1bbb'), plan('7c2d', '7c2dcc')]
+        self.store.save_plans(plans)
+        self.assertEqual(self.store.load_plans(), plans)
+        self.assertEqual(self.store.load_plans(['7c2d', 'f0e1']), [plans[0], plans[2]])
+
+    def test_more_groups_than_sqlite_variables(self):
+        plans = [plan(f"{i:08x}", f"key{i}") for i in range(2500)]
+        self.store.save_plans(plans)
+        self.store.append_results([result(p['group_id']) for p in plans])
+        wanted = [p['group_id'] for p in plans[::2]]
+        self.assertEqual(self.store.load_plans(wanted), plans[::2])
+        self.assertEqual(self.group_ids(self.store.load_results(wanted)), wanted)
+        self.store.save_plans(plans[:2000])
+        self.assertEqual(len(self.store.load_results()), 2000)
+
+    def test_plans_without_group_keys_drop_all_results(self):
+        self.store.save_plans([{'group_id': 1}])
+        self.store.append_results([result(1)])
+        self.store.save_plans([{'group_id': 1}])
+        self.assertEqual(self.store.load_results(), [])
+
+class JSONConsolidationStoreTest(StoreBehaviour, unittest.TestCase):
+
+    def make_store(self, directory):
+        return JSONConsolidationStore(os.path.join(directory, "plan.json"), os.path.join(directory, "results.json"))
+
+class SQLiteConsolidationStoreTest(StoreBehaviour, unittest.TestCase):
+
+    def make_store(self, directory):
+        store = SQLiteConsolidationStore(os.path.join(directory, "consolidation.db"))
+        self.addCleanup(store.close)
+        if hasattr(store.conn, 'setlimit'):
+            # The variable limit of older SQLite builds
+            store.conn.setlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER, 999)
+        return store
+
+    def test_positional_group_ids_are_cleared(self):
+        db_path = os.path.join(self.temp_dir.name, "old.db")
+        conn = sqlite3.connect(db_path)
+        with conn:
+            conn.execute("CREATE TABLE plans (group_id INTEGER PRIMARY KEY, data TEXT NOT NULL)")
+            conn.execute("CREATE TABLE results (id INTEGER PRIMARY KEY AUTOINCREMENT, group_id INTEGER NOT NULL, "
+                         "recorded_at TEXT NOT NULL, data TEXT NOT NULL)")
+            conn.execute("INSERT INTO plans VALUES (0, '{\"group_id\": 0}')")
+            conn.execute("INSERT INTO results (group_id, recorded_at, data) VALUES (0, '', '{\"group_id\": 0}')")
+        conn.close()
+
+        store = SQLiteConsolidationStore(db_path)
+        self.addCleanup(store.close)
+        self.assertEqual(store.load_plans(), [])
+        self.assertEqual(store.load_results(), [])
+        store.save_plans([plan('a1b2c3d4', 'a1b2c3d4e5f6')])
+        self.assertEqual(store.load_plans(['a1b2c3d4']), [plan('a1b2c3d4', 'a1b2c3d4e5f6')])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+# test_error_handler.py
+# Tests for error aggregation and BatchExecutor in lib/error_handler.py
+
+import os
+import sys
+import json
+import time
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(os.path.dirname(TESTS_DIR), "lib"))
+
+import error_handler
+from error_handler import ErrorHandler, BatchExecutor, error_signature
+from job_journal import JobJournal
+
+class TempDir:
+    """Shared temp directory setup; error summaries are written there too"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        patcher = mock.patch.object(error_handler, 'ERROR_LOG_DIR', self.temp_dir.name)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def path(self, name):
+        return os.path.join(self.temp_dir.name, name)
+
+class ErrorAggregationTest(TempDir, unittest.TestCase):
+    """Signature grouping, console rate limiting and atomic summaries"""
+
+    def setUp(self):
+        super().setUp()
+        patcher = mock.patch.object(error_handler, 'logger')
+        self.logger = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.handler = ErrorHandler("aggregate_test", aggregate=True, console_limit=2, console_interval=30.0)
+        self.addCleanup(self.handler.close)
+
+    def test_signature_ignores_quoted_text_and_numbers(self):
+        self.assertEqual(error_signature(ValueError("bad value 'a' on line 3"), 'E501'),
+                         error_signature(ValueError('bad value "b" on line 40'), 'E501'))
+        self.assertNotEqual(error_signature(ValueError("bad value"), 'E501'),
+                            error_signature(TypeError("bad value"), 'E501'))
+        self.assertNotEqual(error_signature(ValueError("bad value"), 'E501'),
+                            error_signature(ValueError("bad value"), 'E502'))
+
+    def test_recurring_errors_are_grouped(self):
+        for index in range(8):
+            self.handler.handle_error(FileNotFoundError(f"No such file: 'note{index}.md'"), 'E101',
+                                      path=f"note{index}.md")
+        self.handler.handle_error(ValueError("bad frontmatter"), 'E501', path="other.md")
+
+        self.assertEqual(len(self.handler.groups), 2)
+        self.assertEqual(len(self.handler.errors), 2)  # First occurrence of each signature
+        group = self.handler.groups[error_signature(FileNotFoundError("No such file: 'x'"), 'E101')]
+        self.assertEqual(group['count'], 8)
+        self.assertEqual(group['sample_paths'], [f"note{index}.md" for index in range(5)])
+        self.assertEqual(len(group['sample_messages']), ErrorHandler.max_samples)
+        self.assertEqual(self.handler._counts_by_code(), {'E101': 8, 'E501': 1})
+
+    def test_console_output_is_rate_limited(self):
+        clock = [1000.0]
+        with mock.patch.object(error_handler.time, 'monotonic', side_effect=lambda: clock[0]):
+            for index in range(5):
+                self.handler.handle_error(OSError(f"disk error {index}"), 'E106')
+            self.assertEqual(self.logger.error.call_count, 2)
+            self.assertEqual(self.logger.debug.call_count, 3)
+
+            clock[0] += 31
+            self.handler.handle_error(OSError("disk error 5"), 'E106')
+            self.assertEqual(self.logger.error.call_count, 3)
+            self.assertIn("(6 occurrences so far)", self.logger.error.call_args.args[0])
+
+            self.handler.handle_error(OSError("disk error 6"), 'E106')
+            self.assertEqual(self.logger.error.call_count, 3)
+
+    def test_summary_is_replaced_atomically(self):
+        self.handler.handle_error(OSError("disk error 1"), 'E106')
+        summary_file = self.handler.write_summary()
+        self.handler.handle_error(OSError("disk error 2"), 'E106')
+        self.assertEqual(self.handler.write_summary(), summary_file)
+        with open(summary_file) as f:
+            summary = json.load(f)
+        self.assertEqual((summary['total_errors'], summary['by_code']), (2, {'E106': 2}))
+        self.assertNotIn('_last_console', summary['groups'][0])
+
+        self.handler.handle_error(OSError("disk error 3"), 'E106')
+        with mock.patch.object(error_handler.json, 'dump', side_effect=OSError("disk full")):
+            self.assertIsNone(self.handler.write_summary())
+        with open(summary_file) as f:
+            self.assertEqual(json.load(f), summary)  # Previous summary intact
+        self.assertEqual(os.listdir(self.temp_dir.name), [os.path.basename(summary_file)])
+
+class BatchExecutorTest(TempDir, unittest.TestCase):
+    """Bounded in-flight work, E202 retries, checkpoints and journals"""
+
+    def test_in_flight_items_are_bounded(self):
+        pulled = []
+        release = threading.Event()
+
+        def items():
+            for item in range(100):
+                pulled.append(item)
+                yield item
+
+        def work(item):
+            release.wait(5)
+            return item
+
+        executor = BatchExecutor("bounded", workers=2)
+        runner = threading.Thread(target=lambda: setattr(self, 'result', executor.run(work, items())))
+        runner.start()
+        deadline = time.monotonic() + 5
+        while len(pulled) < 8 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        time.sleep(0.05)
+        self.assertEqual(len(pulled), 8)  # workers * 4, while every worker is blocked
+        release.set()
+        runner.join(10)
+        self.assertEqual(len(self.result.results), 100)
+
+    def test_timeouts_are_retried_with_backoff(self):
+        attempts = {}
+
+        def work(item):
+            attempts[item] = attempts.get(item, 0) + 1
+            if item == 'slow' and attempts[item] < 3:
+                raise TimeoutError(f"{item} timed out")
+            if item == 'stuck':
+                raise TimeoutError(f"{item} timed out")
+            if item == 'broken':
+                raise ValueError("bad data")
+            return item
+
+        with mock.patch.object(error_handler.time, 'sleep') as sleep:
+            result = BatchExecutor("retry", workers=1, retries=2, backoff=0.5).run(work, ['slow', 'stuck', 'broken', 'fine'])
+        self.assertEqual(result.results, {'slow': 'slow', 'fine': 'fine'})
+        self.assertEqual(result.failed, {'stuck': 'E202', 'broken': 'E501'})
+        self.assertEqual(attempts, {'slow': 3, 'stuck': 3, 'broken': 1, 'fine': 1})
+        self.assertEqual(result.retried, 4)
+        self.assertEqual([call.args[0] for call in sleep.call_args_list], [0.5, 1.0, 0.5, 1.0])
+
+    def test_checkpoint_resumes_and_is_removed_when_done(self):
+        checkpoint = self.path("job.checkpoint")
+        calls = []
+        failing = {'c'}
+
+        def work(item):
+            calls.append(item)
+            if item in failing:
+                raise OSError(f"cannot process {item}")
+            return item.upper()
+
+        first = BatchExecutor("resume", workers=2, checkpoint=checkpoint).run(work, ['a', 'b', 'c'])
+        self.assertEqual(first.failed, {'c': 'E001'})
+        self.assertTrue(os.path.exists(checkpoint))
+
+        failing.clear()
+        calls.clear()
+        second = BatchExecutor("resume", workers=2, checkpoint=checkpoint).run(work, ['a', 'b', 'c', 'd'])
+        self.assertEqual(sorted(calls), ['c', 'd'])
+        self.assertEqual(second.skipped, 2)
+        self.assertEqual(second.results, {'c': 'C', 'd': 'D'})
+        self.assertFalse(os.path.exists(checkpoint))
+
+    def test_journal_skips_unchanged_files(self):
+        paths = []
+        for name in ("one.md", "two.md", "three.md"):
+            paths.append(self.path(name))
+            with open(paths[-1], 'w') as f:
+                f.write(name)
+        calls = []
+
+        def work(path):
+            calls.append(path)
+            return os.path.getsize(path)
+
+        def run():
+            with JobJournal("journal_test", journal_dir=self.path("jobs")) as journal:
+                return BatchExecutor("journal", workers=2, journal=journal).run(work, paths)
+
+        self.assertEqual(len(run().results), 3)
+        calls.clear()
+        self.assertEqual(run().skipped, 3)
+        self.assertEqual(calls, [])
+
+        with open(paths[1], 'w') as f:
+            f.write("changed content")
+        result = run()
+        self.assertEqual(calls, [paths[1]])
+        self.assertEqual((result.skipped, result.results), (2, {paths[1]: 15}))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+# test_example_script1_script2.py
+# Tests for the shared batch and JSON helpers of the example scripts
+
+import io
+import os
+import sys
+import math
+import tempfile
+import unittest
+from unittest import mock
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(os.path.dirname(TESTS_DIR), "lib"))
+
+import example_script1_script2 as shared
+from example_script1_script2 import BACKENDS, expand_inputs, overwritten_inputs, get_backend, decode_json, encode_json, load_data, save_data
+
+class ExpandInputsTest(unittest.TestCase):
+    """expand_inputs globbing, manifests and stdin"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        for name in ("f1.json", "f2.json", "f1.json.processed.json", "f1.json.analysis.json", "notes.txt"):
+            open(self.path(name), 'w').close()
+
+    def path(self, name):
+        return os.path.join(self.temp_dir.name, name)
+
+    def test_glob_skips_batch_outputs(self):
+        self.assertEqual(expand_inputs([self.path("*.json")]), [self.path("f1.json"), self.path("f2.json")])
+
+    def test_explicit_output_file_is_kept(self):
+        self.assertEqual(expand_inputs([self.path("f1.json.processed.json")]), [self.path("f1.json.processed.json")])
+
+    def test_excluded_paths_are_never_inputs(self):
+        summary = self.path("sum.json")
+        open(summary, 'w').close()
+        self.assertEqual(expand_inputs([self.path("*.json"), summary], exclude_paths=[summary]),
+                         [self.path("f1.json"), self.path("f2.json")])
+
+    def test_glob_skips_summary_files(self):
+        open(self.path("batch.summary.json"), 'w').close()
+        self.assertEqual(expand_inputs([self.path("*.json")]), [self.path("f1.json"), self.path("f2.json")])
+
+    def test_outputs_that_are_inputs(self):
+        files = [self.path("f1.json"), self.path("f2.json")]
+        outputs = [os.path.join(self.temp_dir.name, ".", "f1.json"), self.path("f2.json.processed.json"), None]
+        self.assertEqual(overwritten_inputs(files, outputs), outputs[:1])
+
+    def test_manifest_globs_and_duplicates(self):
+        manifest = self.path("manifest.txt")
+        with open(manifest, 'w') as f:
+            f.write(f"# inputs\n{self.path('f2.json')}\n\n{self.path('f*.json')}\n")
+        self.assertEqual(expand_inputs([], manifest), [self.path("f2.json"), self.path("f1.json")])
+
+    def test_stdin_list(self):
+        with mock.patch('sys.stdin', io.StringIO(f"{self.path('f2.json')}\n")):
+            self.assertEqual(expand_inputs(['-']), [self.path("f2.json")])
+
+    def test_stdin_read_twice_is_rejected(self):
+        with mock.patch('sys.stdin', io.StringIO(f"{self.path('f2.json')}\n")):
+            with self.assertRaises(ValueError):
+                expand_inputs(['-'], '-')
+            with self.assertRaises(ValueError):
+                expand_inputs(['-', '-'])
+
+class JsonBackendTest(unittest.TestCase):
+    """Default backend choice and lossless round trips"""
+
+    def setUp(self):
+        patcher = mock.patch.object(shared, 'JSON_BACKEND', None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_fastest_installed_backend_is_the_default(self):
+        fastest = BACKENDS.get('msgspec') or BACKENDS.get('orjson') or BACKENDS['stdlib']
+        self.assertIs(get_backend(), fastest)
+
+    def test_configured_backend(self):
+        shared.JSON_BACKEND = 'stdlib'
+        self.assertIs(get_backend(), BACKENDS['stdlib'])
+        with self.assertRaises(ValueError):
+            get_backend('no-such-backend')
+
+    def test_every_backend_keeps_big_ints(self):
+        data = {'big': 2 ** 70, 'negative': -(2 ** 65), 'edge': 2 ** 64 - 1, 'items': [10 ** 19, 0.5]}
+        for name in BACKENDS:
+            with self.subTest(backend=name):
+                decoded = decode_json(encode_json(data, backend=name), backend=name)
+                self.assertEqual(decoded, data)
+                self.assertIsInstance(decoded['big'], int)
+                self.assertEqual(decode_json(b'[123456789012345678901234]', backend=name), [123456789012345678901234])
+
+    def test_stdlib_round_trip_keeps_nan(self):
+        shared.JSON_BACKEND = 'stdlib'
+        decoded = decode_json(encode_json({'nan': float('nan'), 'inf': float('inf')}))
+        self.assertTrue(math.isnan(decoded['nan']))
+        self.assertEqual(decoded['inf'], float('inf'))
+
+    def test_nan_literals_decode_with_every_backend(self):
+        for name in BACKENDS:
+            with self.subTest(backend=name):
+                decoded = decode_json(b'{"nan": NaN, "inf": Infinity}', backend=name)
+                self.assertTrue(math.isnan(decoded['nan']))
+                self.assertEqual(decoded['inf'], float('inf'))
+
+    def test_long_digit_runs_are_found_across_chunks(self):
+        self.assertFalse(shared._has_long_digit_run(b'[123456789012345678]', chunk_size=4))
+        self.assertTrue(shared._has_long_digit_run(b'{"a": 1, "b": -9223372036854775809}', chunk_size=4))
+        self.assertFalse(shared._has_long_digit_run('[18446744, 0.123456789012345]', chunk_size=4))
+
+    def test_stdlib_decodes_memoryview_and_bom(self):
+        self.assertEqual(decode_json(memoryview(b'\xef\xbb\xbf{"a": "\xc3\xa9"}'), backend='stdlib'), {'a': "é"})
+
+    def test_every_backend_round_trips_plain_data(self):
+        data = [{'id': i, 'name': f"Item {i}", 'value': i / 4, 'tags': ["a", "é"]} for i in range(10)]
+        for name in BACKENDS:
+            with self.subTest(backend=name):
+                self.assertEqual(decode_json(encode_json(data, backend=name), backend=name), data)
+                self.assertEqual(decode_json(encode_json(data, pretty=True, backend=name), backend=name), data)
+
+    def test_load_and_save_file(self):
+        data = {'big': 2 ** 70, 'items': [1, 2.5, None, True]}
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "data.json")
+            self.assertTrue(save_data(path, data))
+            self.assertEqual(load_data(path), data)
+            self.assertEqual(load_data(path, use_mmap=True), data)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+# test_example_script3.py
+# Tests for the streaming JSON reader in example_script3.py
+
+import os
+import sys
+import json
+import tempfile
+import unittest
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.dirname(TESTS_DIR))
+
+from example_script3 import iter_json_values, convert_json_to_csv
+
+class IterJsonValuesTest(unittest.TestCase):
+    """iter_json_values on arrays, JSON lines and malformed input"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+
+    def write(self, text):
+        path = os.path.join(self.temp_dir.name, "input.json")
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        return path
+
+    def values(self, text, **kwargs):
+        return list(iter_json_values(self.write(text), **kwargs))
+
+    def test_array_elements(self):
+        records = [{'id': i, 'name': f"Item {i}", 'tags': ['a', 'b']} for i in range(50)]
+        self.assertEqual(self.values(json.dumps(records, indent=2), read_size=7), records)
+
+    def test_empty_array(self):
+        self.assertEqual(self.values(" [ ] \n"), [])
+
+    def test_numbers_across_chunk_boundaries(self):
+        numbers = [123456789012345678901234567890, 1.5e300, -42, 0.000125, 7]
+        text = '[' + ','.join(json.dumps(n) for n in numbers) + ']'
+        for read_size in (1, 2, 3, 5, 8):
+            with self.subTest(read_size=read_size):
+                self.assertEqual(self.values(text, read_size=read_size), numbers)
+
+    def test_top_level_number_split_at_end_of_chunk(self):
+        self.assertEqual(self.values("12345\n678", read_size=3), [12345, 678])
+
+    def test_json_lines(self):
+        records = [{'id': i, 'value': i * 1.5} for i in range(20)]
+        text = '\n'.join(json.dumps(record) for record in records) + '\n'
+        self.assertEqual(self.values(text, read_size=4), records)
+
+    def test_concatenated_values(self):
+        self.assertEqual(self.values('{"a": 1}{"b": 2} 3 "four"'), [{'a': 1}, {'b': 2}, 3, "four"])
+
+    def test_single_object(self):
+        self.assertEqual(self.values('{"a": [1, 2]}'), [{'a': [1, 2]}])
+
+    def test_malformed_arrays(self):
+        for text in ('[1 2 3]', '[1,,,2]', '[,1]', '[1,]', '[1, 2', '[', '[1] 2', '[1,\n{"a": 1} {"b": 2}]'):
+            with self.subTest(text=text):
+                with self.assertRaises(json.JSONDecodeError):
+                    self.values(text, read_size=2)
+
+    def test_malformed_record_in_json_lines(self):
+        text = '{"a": 1}\n{"a": oops}\n' + '{"a": 2}\n' * 100
+        with self.assertRaises(json.JSONDecodeError):
+            self.values(text)
+
+    def test_malformed_record_retry_is_capped(self):
+        # Reading stops once max_record_size characters fail to parse, long before the end of the input
+        text = '{"a": oops}\n' + '{"a": 2}\n' * 10000
+        path = self.write(text)
+        values = iter_json_values(path, read_size=16, max_record_size=256)
+        with self.assertRaises(json.JSONDecodeError) as raised:
+            list(values)
+        self.assertLess(len(raised.exception.doc), 1024)
+
+class ConvertJsonToCsvTest(unittest.TestCase):
+    """convert_json_to_csv reports malformed input instead of writing partial output"""
+
+    def test_malformed_array_fails(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            input_file = os.path.join(temp_dir, "input.json")
+            with open(input_file, 'w') as f:
+                f.write('[{"a": 1} {"a": 2}]')
+            self.assertFalse(convert_json_to_csv(input_file, os.path.join(temp_dir, "out.csv")))
+
+if __name__ == "__main__":
+    unittest.main()
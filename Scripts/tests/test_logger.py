@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+# test_logger.py
+# Tests for the log file index and recent-log lookup in lib/logger.py
+
+import os
+import sys
+import json
+import logging
+import tempfile
+import unittest
+from unittest import mock
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(os.path.dirname(TESTS_DIR), "lib"))
+
+import logger as vault_logging
+from logger import VaultLogger, LOG_INDEX_NAME
+
+class LogIndexTest(unittest.TestCase):
+    """Each auto-named log file is indexed once; get_recent_logs also finds unindexed files"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.log_dir = self.temp_dir.name
+        for patcher in (mock.patch.object(vault_logging, 'LOG_DIR', self.log_dir),
+                        mock.patch.object(vault_logging, '_indexed', set())):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        for name in ("test_index", "test_rotating"):
+            for handler in logging.getLogger(name).handlers:
+                handler.close()
+            logging.getLogger(name).handlers = []
+
+    def index_entries(self):
+        path = os.path.join(self.log_dir, LOG_INDEX_NAME)
+        if not os.path.exists(path):
+            return []
+        with open(path) as f:
+            return [json.loads(line) for line in f]
+
+    def touch(self, name):
+        open(os.path.join(self.log_dir, name), 'w').close()
+
+    def test_repeated_loggers_index_a_file_once(self):
+        for _ in range(3):
+            VaultLogger("test_index", console_level=logging.CRITICAL, rotating=False).info("message")
+        entries = self.index_entries()
+        self.assertEqual(len(entries), 1)
+        self.assertEqual(entries[0]['script'], "test_index")
+
+    def test_rotating_file_is_not_reindexed_by_later_runs(self):
+        VaultLogger("test_rotating", console_level=logging.CRITICAL, rotating=True).info("first run")
+        vault_logging._indexed.clear()  # As in a new process
+        VaultLogger("test_rotating", console_level=logging.CRITICAL, rotating=True).info("second run")
+        self.assertEqual([e['file'] for e in self.index_entries()], ["test_rotating.log"])
+
+    def test_recent_logs_without_index(self):
+        for name in ("a_20260101_000000.log", "a_20260102_000000.log.gz", "b_20260103_000000.log"):
+            self.touch(name)
+        self.assertEqual(VaultLogger.get_recent_logs(5, self.log_dir, "a"),
+                         ["a_20260102_000000.log.gz", "a_20260101_000000.log"])
+
+    def test_recent_logs_include_files_older_than_the_index(self):
+        for name in ("a_20250101_000000.log", "a_20260101_000000.log", "a_20260102_000000.log"):
+            self.touch(name)
+        with open(os.path.join(self.log_dir, LOG_INDEX_NAME), 'w') as f:
+            for name in ("a_20260101_000000.log", "a_20260102_000000.log"):
+                f.write(json.dumps({'file': name, 'script': "a"}) + '\n')
+        self.assertEqual(VaultLogger.get_recent_logs(2, self.log_dir, "a"),
+                         ["a_20260102_000000.log", "a_20260101_000000.log"])
+        self.assertEqual(VaultLogger.get_recent_logs(5, self.log_dir, "a"),
+                         ["a_20260102_000000.log", "a_20260101_000000.log", "a_20250101_000000.log"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+# test_schema_validation.py
+# Tests for the compiled declarative schemas in lib/schema_validation.py
+
+import os
+import sys
+import unittest
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(os.path.dirname(TESTS_DIR), "lib"))
+
+import schema_validation
+from schema_validation import compile_schema, format_path
+
+SCHEMA = {
+    'type': 'object',
+    'required': ['id', 'name'],
+    'properties': {
+        'id': {'type': ['string', 'integer']},
+        'name': {'type': 'string', 'pattern': r'^[A-Z]'},
+        'status': {'enum': ['active', 'draft']},
+        'items': {
+            'type': 'array',
+            'items': {
+                'type': 'object',
+                'required': ['value'],
+                'properties': {
+                    'value': {'type': 'number', 'minimum': 0, 'maximum': 2 ** 53},
+                },
+            },
+        },
+    },
+}
+
+def messages(violations):
+    return [(format_path(path), message) for path, message in violations]
+
+class CompiledSchemaTest(unittest.TestCase):
+    """validate (one value) and validate_batch (records) report the same violations"""
+
+    def setUp(self):
+        self.schema = compile_schema(SCHEMA)
+
+    def test_valid_record(self):
+        record = {'id': 1, 'name': "Alpha", 'status': 'active', 'items': [{'value': 0}, {'value': 2.5}]}
+        self.assertEqual(self.schema.validate(record), [])
+        self.assertEqual(self.schema.validate_batch([record, dict(record, id="b")]), [])
+
+    def test_every_violation_is_reported(self):
+        record = {'id': 1.5, 'name': "alpha", 'status': 'gone', 'items': [{'value': -1}, {}, {'value': 'x'}]}
+        self.assertEqual(messages(self.schema.validate(record)), [
+            ('id', "expected string or integer, got float"),
+            ('name', "'alpha' does not match pattern ^[A-Z]"),
+            ('status', "'gone' is not one of ['active', 'draft']"),
+            ('items[0].value', "value -1 is below minimum 0"),
+            ('items[1]', "Missing required field: value"),
+            ('items[2].value', "expected number, got str"),
+        ])
+
+    def test_missing_required_fields(self):
+        self.assertEqual(messages(self.schema.validate({})), [
+            ('', "Missing required field: id"),
+            ('', "Missing required field: name"),
+        ])
+
+    def test_wrong_type_skips_other_constraints(self):
+        self.assertEqual(messages(self.schema.validate([])), [('', "expected object, got list")])
+
+    def test_bool_is_not_a_number(self):
+        violations = self.schema.validate({'id': True, 'name': "A", 'items': [{'value': False}]})
+        self.assertEqual(messages(violations), [
+            ('id', "expected string or integer, got bool"),
+            ('items[0].value', "expected number, got bool"),
+        ])
+
+    def test_range_is_exact_beyond_float_precision(self):
+        violations = self.schema.validate({'id': 1, 'name': "A", 'items': [{'value': 2 ** 53}, {'value': 2 ** 53 + 1}]})
+        self.assertEqual(messages(violations), [('items[1].value', f"value {2 ** 53 + 1} is above maximum {2 ** 53}")])
+
+    def test_batch_paths_start_at_record_index(self):
+        records = [{'id': i, 'name': "A", 'items': [{'value': i - 2}]} for i in range(300)]
+        records[150]['name'] = "b"
+        violations = messages(self.schema.validate_batch(records))
+        self.assertEqual(violations, [
+            ('[0].items[0].value', "value -2 is below minimum 0"),
+            ('[1].items[0].value', "value -1 is below minimum 0"),
+            ('[150].name', "'b' does not match pattern ^[A-Z]"),
+        ])
+
+    def test_batch_matches_single_validation(self):
+        records = [
+            {'id': "a", 'name': "A", 'items': [{'value': 1}, {'value': -3}]},
+            {'name': "lower", 'items': "none"},
+            {'id': 2, 'name': "B", 'status': 'draft'},
+        ]
+        expected = []
+        for index, record in enumerate(records):
+            expected.extend(((index,) + path, message) for path, message in self.schema.validate(record))
+        self.assertEqual([tuple(v) for v in self.schema.validate_batch(records)], expected)
+        self.assertEqual(len(expected), 4)
+
+    def test_range_checks_inside_arrays_are_columns(self):
+        self.assertEqual(self.schema.columns, {'items[].value': (0, 2 ** 53)})
+        inexact = compile_schema({'type': 'array', 'items': {'type': 'integer', 'maximum': 2 ** 60}})
+        self.assertEqual(inexact.columns, {})
+
+    @unittest.skipIf(schema_validation.numpy is not None, "NumPy is installed")
+    def test_columnar_needs_numpy(self):
+        with self.assertRaises(RuntimeError):
+            self.schema.validate_batch([], columnar=True)
+        self.assertEqual(len(self.schema.validate_batch([{}] * 300)), 600)
+
+    @unittest.skipIf(schema_validation.numpy is None, "NumPy is not installed")
+    def test_columnar_matches_scalar(self):
+        records = [{'id': i, 'name': "A", 'items': [{'value': i % 7 - 2}, {'value': 0.5}]} for i in range(300)]
+        records[3]['items'].append({'value': 2 ** 53 + 1})
+        records[4]['items'].append({'value': -2 ** 60})
+        records[5]['items'][1]['value'] = 2.0 ** 60
+        records[6]['name'] = "b"
+        scalar = self.schema.validate_batch(records, columnar=False)
+        columnar = self.schema.validate_batch(records, columnar=True)
+        self.assertEqual(sorted(columnar), sorted(scalar))
+        self.assertEqual([v.path[0] for v in columnar], [v.path[0] for v in scalar])
+        self.assertIn(((3, 'items', 2, 'value'), f"value {2 ** 53 + 1} is above maximum {2 ** 53}"), columnar)
+
+    def test_unknown_type_is_rejected(self):
+        with self.assertRaises(ValueError):
+            compile_schema({'type': 'decimal'})
+
+if __name__ == "__main__":
+    unittest.main()
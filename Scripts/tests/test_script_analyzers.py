@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+# test_script_analyzers.py
+# Tests for the shell and JavaScript analyzers in lib/script_analyzers.py
+
+import os
+import sys
+import unittest
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(os.path.dirname(TESTS_DIR), "lib"))
+
+from script_analyzers import analyze_shell, analyze_javascript
+
+class AnalyzeShellTest(unittest.TestCase):
+    """Function, source and fingerprint detection in shell scripts"""
+
+    def test_definition_forms(self):
+        content = "a() { :; }\nfunction b { :; }\nfunction c() {\n  :\n}\nd () ( : )\n"
+        self.assertEqual(analyze_shell(content)['functions'], ['a', 'b', 'c', 'd'])
+
+    def test_definition_after_keyword(self):
+        content = "if x; then y() { echo hi; }; fi\nfor i in 1; do w() { :; }; done\nz() { :; }\n"
+        self.assertEqual(analyze_shell(content)['functions'], ['y', 'w', 'z'])
+
+    def test_keyword_as_argument_is_not_a_command_start(self):
+        self.assertEqual(analyze_shell("echo then y() { :; }\n")['functions'], [])
+
+    def test_strings_comments_and_heredocs_are_skipped(self):
+        content = (
+            "echo \"fake() { :; }\"\n"
+            "# old() { :; }\n"
+            "cat <<EOF\nheredoc() { :; }\nEOF\n"
+            "value=$(inner() { :; })\n"
+            "real() { :; }\n"
+        )
+        self.assertEqual(analyze_shell(content)['functions'], ['real'])
+
+    def test_sources(self):
+        content = 'source "$DIR/common.sh"\n. ./env.sh\nif x; then source lib.sh; fi\necho source nothing\n'
+        self.assertEqual(analyze_shell(content)['imports'], ['$DIR/common.sh', './env.sh', 'lib.sh'])
+
+    def test_fingerprint_ignores_whitespace_and_comments(self):
+        first = analyze_shell("f() {\n  echo  hi\n}\n")['fingerprints']['f']
+        second = analyze_shell("f() {\n    # say hi\n    echo hi\n}\n")['fingerprints']['f']
+        self.assertEqual(first, second)
+        self.assertNotEqual(first, analyze_shell("f() { echo bye; }\n")['fingerprints']['f'])
+
+class AnalyzeJavascriptTest(unittest.TestCase):
+    """Function and import detection in JavaScript files"""
+
+    def functions(self, content):
+        return sorted(analyze_javascript(content)['functions'])
+
+    def test_declarations(self):
+        content = "function a() {}\nexport async function b(x, y = {}) {}\nfunction* c() {}\n"
+        self.assertEqual(self.functions(content), ['a', 'b', 'c'])
+
+    def test_assigned_functions(self):
+        content = (
+            "const d = (x) => x;\n"
+            "let e = async y => y;\n"
+            "var f = function() {};\n"
+            "obj.g = () => {};\n"
+            "module.exports = { h: function() {}, i: async (z) => z };\n"
+        )
+        self.assertEqual(self.functions(content), ['d', 'e', 'f', 'g', 'h', 'i'])
+
+    def test_object_method_shorthand(self):
+        content = "const o = { q() { return 1 }, async s(a) { }, *t() {} };\n"
+        self.assertEqual(self.functions(content), ['q', 's', 't'])
+
+    def test_class_methods(self):
+        content = "class A {\n  constructor(x) { this.x = x; }\n  get value() { return this.x; }\n}\n"
+        self.assertEqual(self.functions(content), ['A.constructor', 'A.value'])
+
+    def test_class_members_are_qualified_until_the_class_ends(self):
+        content = (
+            "class B extends A {\n"
+            "  handle = (e) => { return e; };\n"
+            "  run() { function inner() { return '}'; } }\n"
+            "}\n"
+            "function after() {}\n"
+        )
+        self.assertEqual(self.functions(content), ['B.handle', 'B.run', 'after', 'inner'])
+
+    def test_control_flow_is_not_a_function(self):
+        content = "if (a >= b) { c(); } else if (d) {}\nfor (;;) {}\nwhile (x) {}\ntry {} catch (e) {}\n"
+        self.assertEqual(self.functions(content), [])
+
+    def test_comments_strings_and_regex_literals_are_skipped(self):
+        content = (
+            "// function commented() {}\n"
+            "/* helper(a) { } */\n"
+            "const s = \"function inString() {}\";\n"
+            "const t = `${ {a: 1}.a } function inTemplate() {}`;\n"
+            "const r = /function inRegex\\(\\) \\{/g, half = a / 2 / b;\n"
+            "function real() { return '{'; }\n"
+        )
+        self.assertEqual(self.functions(content), ['real'])
+
+    def test_fingerprint_ignores_whitespace_and_comments(self):
+        first = analyze_javascript("function f() {\n  return  1;\n}\n")['fingerprints']['f']
+        second = analyze_javascript("const f = () => {\n    // one\n    return 1;\n};\n")['fingerprints']['f']
+        self.assertEqual(first, second)
+        self.assertNotEqual(first, analyze_javascript("function f() { return 2; }\n")['fingerprints']['f'])
+
+    def test_imports(self):
+        content = "import fs from 'fs';\nconst path = require(\"path\");\nimport './side-effect.js';\nconst m = await import('./lazy.js');\n"
+        self.assertEqual(sorted(analyze_javascript(content)['imports']), ['./lazy.js', './side-effect.js', 'fs', 'path'])
+
+if __name__ == "__main__":
+    unittest.main()
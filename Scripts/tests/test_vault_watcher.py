@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+# test_vault_watcher.py
+# Tests for incremental batch processing and polling in lib/vault_watcher.py
+
+import os
+import sys
+import tempfile
+import unittest
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(os.path.dirname(TESTS_DIR), "lib"))
+
+from vault_watcher import VaultWatcher, PollingSource
+
+NOTE = "---\ntitle: {title}\ntags: [{tags}]\n---\n\n{body}\n"
+
+class TempVault:
+    """Shared temp vault setup"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.root = os.path.join(self.temp_dir.name, "vault")
+        os.makedirs(self.root)
+
+    def path(self, rel_path):
+        return os.path.join(self.root, rel_path)
+
+    def write(self, rel_path, body='', tags='note'):
+        path = self.path(rel_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            f.write(NOTE.format(title=os.path.basename(rel_path), tags=tags, body=body))
+        return path
+
+class VaultWatcherProcessTest(TempVault, unittest.TestCase):
+    """process() re-checks changed notes and the notes linking to created or deleted files"""
+
+    def setUp(self):
+        super().setUp()
+        self.write("a.md", "See [[b]].")
+        self.write("b.md")
+        self.write("c.md", "See [[Projects/d]] and [[diagram.png]].")
+        self.index_path = os.path.join(self.temp_dir.name, "tag_index.json")
+        self.watcher = VaultWatcher(self.root, checks=('links',), index_path=self.index_path)
+
+    def broken(self):
+        return sorted((issue['path'], issue['detail'].rsplit(': ', 1)[1]) for issue in self.watcher.issue_list())
+
+    def test_initial_scan(self):
+        self.assertEqual(self.broken(), [
+            ("c.md", "[[Projects/d]] (target file not found)"),
+            ("c.md", "[[diagram.png]] (target file not found)"),
+        ])
+        self.assertEqual(self.watcher.status()['notes'], 3)
+
+    def test_created_note_rechecks_backlinks(self):
+        self.assertEqual(self.watcher.process([self.write("Projects/d.md")]), 2)
+        self.assertEqual(self.broken(), [("c.md", "[[diagram.png]] (target file not found)")])
+
+    def test_created_attachment_rechecks_backlinks(self):
+        open(self.path("diagram.png"), 'w').close()
+        self.assertEqual(self.watcher.process([self.path("diagram.png")]), 1)
+        self.assertEqual(self.broken(), [("c.md", "[[Projects/d]] (target file not found)")])
+
+    def test_deleted_note_rechecks_backlinks(self):
+        os.remove(self.path("b.md"))
+        self.assertEqual(self.watcher.process([self.path("b.md")]), 2)
+        self.assertIn(("a.md", "[[b]] (target file not found)"), self.broken())
+        self.assertEqual(self.watcher.status()['notes'], 2)
+
+    def test_renamed_note_rechecks_backlinks(self):
+        os.rename(self.path("b.md"), self.path("e.md"))
+        self.assertEqual(self.watcher.process([self.path("b.md"), self.path("e.md")]), 3)
+        self.assertIn(("a.md", "[[b]] (target file not found)"), self.broken())
+
+        self.write("a.md", "See [[e]].")
+        self.assertEqual(self.watcher.process([self.path("a.md")]), 1)
+        self.assertNotIn("a.md", {path for path, _ in self.broken()})
+
+    def test_edited_note_only_rechecks_itself(self):
+        self.write("c.md", "No links any more.")
+        self.assertEqual(self.watcher.process([self.path("c.md")]), 1)
+        self.assertEqual(self.broken(), [])
+
+    def test_hidden_and_outside_paths_are_ignored(self):
+        hidden = self.write(".obsidian/workspace.md", "[[missing]]")
+        outside = os.path.join(self.temp_dir.name, "outside.md")
+        open(outside, 'w').close()
+        self.assertEqual(self.watcher.process([hidden, outside]), 0)
+        self.assertEqual(self.watcher.status()['batches'], 0)
+
+    def test_tag_index_follows_changes(self):
+        self.assertEqual(self.watcher.tag_index.files_with_tag("note"), [self.path(n) for n in ("a.md", "b.md", "c.md")])
+        self.write("b.md", tags='project')
+        os.remove(self.path("c.md"))
+        self.watcher.process([self.path("b.md"), self.path("c.md")])
+        self.assertEqual(self.watcher.tag_index.files_with_tag("note"), [self.path("a.md")])
+        self.assertEqual(self.watcher.tag_index.files_with_tag("project"), [self.path("b.md")])
+        self.assertTrue(os.path.exists(self.index_path))
+
+class PollingSourceTest(TempVault, unittest.TestCase):
+    """PollingSource reports created, modified and deleted files between scans"""
+
+    def setUp(self):
+        super().setUp()
+        self.write("a.md")
+        self.write("b.md")
+        self.source = PollingSource(self.root, interval=0)
+
+    def test_no_changes(self):
+        self.assertEqual(self.source.wait(0), set())
+
+    def test_changes_since_last_scan(self):
+        with open(self.path("a.md"), 'a') as f:
+            f.write("More text.\n")
+        os.remove(self.path("b.md"))
+        created = self.write("Projects/c.md")
+        self.write(".obsidian/hidden.md")
+        self.assertEqual(self.source.wait(0), {self.path("a.md"), self.path("b.md"), created})
+        self.assertEqual(self.source.wait(0), set())
+
+    def test_waits_for_the_interval(self):
+        source = PollingSource(self.root, interval=60)
+        self.write("c.md")
+        self.assertEqual(source.wait(0.01), set())
+
+if __name__ == "__main__":
+    unittest.main()